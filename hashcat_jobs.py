@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Hashcat Job Sessions
+
+Every hashcat attack started from P4wnForge runs as a named hashcat session
+(--session) with its restore file (--restore-file-path) and a small JSON job
+record kept under ~/.p4wnforge/hashcat. When an attack is stopped, the GUI is
+closed or the machine reboots, the job can be continued later with --restore
+from the last checkpoint instead of starting over.
+
+Cracked passwords are looked up in PotfileIndex, an in-memory index over the
+hashcat potfile and the attack outfiles, instead of running hashcat --show.
+Credential dumps (pwdump, secretsdump, Responder logs) are split into one
+hash file per attack by write_hash_batch, so a whole dump is cracked by a
+single session.
+
+Usage:
+    python hashcat_jobs.py              # List saved jobs
+    python hashcat_jobs.py --resumable  # Only jobs that can be resumed
+"""
+
+import os
+import re
+import json
+import shutil
+import time
+import argparse
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+STATE_DIR = os.path.join(os.path.expanduser("~"), ".p4wnforge", "hashcat")
+
+# Job states; "running" jobs found on disk belong to a GUI that exited without stopping them
+RESUMABLE_STATES = ("running", "interrupted", "failed")
+
+# Every job reports its progress as one JSON object per line, every STATUS_TIMER seconds
+STATUS_TIMER = 2
+STATUS_ARGUMENTS = ["--status", "--status-json", f"--status-timer={STATUS_TIMER}"]
+
+# hashcat's status codes (status_ctx->devices_status)
+STATUS_NAMES = {
+    0: "Initializing", 1: "Autotuning", 2: "Self-testing", 3: "Running", 4: "Paused",
+    5: "Exhausted", 6: "Cracked", 7: "Aborted", 8: "Quit", 9: "Bypass",
+    10: "Aborted (checkpoint)", 11: "Aborted (runtime)", 12: "Running (checkpoint quit)",
+    13: "Aborted (finish)"
+}
+
+HashcatDevice = namedtuple('HashcatDevice', 'device_id name type speed temp util')
+HashcatStatus = namedtuple('HashcatStatus', [
+    'state', 'name', 'progress', 'total', 'recovered', 'recovered_total',
+    'speed', 'devices', 'time_start', 'estimated_stop', 'guess', 'rejected'
+])
+
+def parse_status_json(line):
+    """Parse one line of --status-json output into a HashcatStatus, or None for any other line"""
+    line = line.strip()
+    if not line.startswith('{'):
+        return None
+    try:
+        data = json.loads(line)
+        progress, total = data['progress']
+        recovered, recovered_total = data.get('recovered_hashes', [0, 0])
+    except (ValueError, KeyError, TypeError):
+        return None
+    # Speeds are hashes per second, averaged by hashcat over recent kernel runs
+    devices = [HashcatDevice(device.get('device_id'), device.get('device_name', ''), device.get('device_type', ''),
+                             device.get('speed', 0), device.get('temp'), device.get('util'))
+               for device in data.get('devices', []) if isinstance(device, dict)]
+    guess = data.get('guess') or {}
+    state = data.get('status')
+    return HashcatStatus(
+        state=state,
+        name=STATUS_NAMES.get(state, f"Status {state}"),
+        progress=progress,
+        total=total,
+        recovered=recovered,
+        recovered_total=recovered_total,
+        speed=sum(device.speed or 0 for device in devices),
+        devices=devices,
+        time_start=data.get('time_start'),
+        estimated_stop=data.get('estimated_stop'),
+        guess=guess.get('guess_base') or guess.get('guess_mask') or '',
+        rejected=data.get('rejected', 0)
+    )
+
+def format_speed(hashes_per_second):
+    """Format a hash rate the way hashcat does (H/s, kH/s, MH/s ...)"""
+    speed = float(hashes_per_second or 0)
+    for unit in ("H/s", "kH/s", "MH/s", "GH/s", "TH/s"):
+        if speed < 1000 or unit == "TH/s":
+            return f"{speed:.1f} {unit}" if unit != "H/s" else f"{speed:.0f} {unit}"
+        speed /= 1000
+
+def normalize_hash(hash_text):
+    """Key under which a hash is indexed: hashcat writes hex digests in lowercase"""
+    return hash_text.strip().lower()
+
+def decode_plain(plain):
+    """Undo hashcat's $HEX[...] encoding of passwords with unprintable or separator characters"""
+    if plain.startswith("$HEX[") and plain.endswith("]"):
+        try:
+            return bytes.fromhex(plain[5:-1]).decode('utf-8', errors='replace')
+        except ValueError:
+            pass
+    return plain
+
+# Credential dump lines, tried in this order:
+# pwdump / secretsdump: [DOMAIN\]user:RID:LM hash:NT hash:::
+PWDUMP_PATTERN = re.compile(r'^([^:\s][^:]*):(\d+):[^:]*:([0-9A-Fa-f]{32}):')
+# NetNTLMv2 (Responder logs and captures): user::domain:server challenge:NTProofStr:blob
+NETNTLMV2_PATTERN = re.compile(r'[^\s:]+::[^\s:]*:[0-9A-Fa-f]{16}:[0-9A-Fa-f]{32}:[0-9A-Fa-f]+')
+# NetNTLMv1: user::domain:LM response:NT response:server challenge
+NETNTLMV1_PATTERN = re.compile(r'[^\s:]+::[^\s:]*:(?:[0-9A-Fa-f]{48})?:[0-9A-Fa-f]{48}:[0-9A-Fa-f]{16}(?![0-9A-Fa-f])')
+# A bare NT hash, or user:NT hash
+NT_PATTERN = re.compile(r'^(?:([^:]+):)?([0-9A-Fa-f]{32})$')
+
+def potfile_locations(hashcat_path="", extra_dirs=()):
+    """Where hashcat may keep its potfile: next to the binary (portable installs), the
+    given directories, and the per-user locations of packaged hashcat builds"""
+    directories = []
+    if hashcat_path:
+        resolved = hashcat_path if os.path.dirname(hashcat_path) else shutil.which(hashcat_path)
+        if resolved:
+            directories.append(os.path.dirname(os.path.realpath(resolved)))
+    directories.extend(extra_dirs)
+    directories.append(os.path.join(os.path.expanduser("~"), ".local", "share", "hashcat"))
+    directories.append(os.path.join(os.path.expanduser("~"), ".hashcat"))
+    paths = []
+    for directory in directories:
+        path = os.path.abspath(os.path.join(directory, "hashcat.potfile"))
+        if path not in paths:
+            paths.append(path)
+    return paths
+
+class PotfileIndex:
+    """In-memory map from normalized hash to plain password over potfiles and outfiles.
+    
+    Reads hash:plain lines from the potfiles in `paths` and every *_cracked.txt
+    outfile under `directories`. Each refresh() only reads what was appended
+    to a file since the previous one (a file that shrank or was replaced is
+    read again from the start), so lookups after a run cost a dictionary hit
+    instead of a hashcat --show process. Safe to use from several threads.
+    """
+    
+    def __init__(self, paths=(), directories=()):
+        self.paths = list(paths)
+        self.directories = list(directories)
+        self.entries = {}
+        self.offsets = {}  # path -> (bytes read, (device, inode))
+        self.lock = threading.Lock()
+    
+    def files(self):
+        files = [path for path in self.paths if os.path.isfile(path)]
+        for directory in self.directories:
+            for root, _, names in os.walk(directory):
+                files.extend(os.path.join(root, name) for name in names if name.endswith("_cracked.txt"))
+        return files
+    
+    def refresh(self):
+        with self.lock:
+            for path in self.files():
+                try:
+                    self._read_new_lines(path)
+                except OSError:
+                    continue  # Being rewritten or removed; picked up next time
+    
+    def _read_new_lines(self, path):
+        info = os.stat(path)
+        identity = (info.st_dev, info.st_ino)
+        offset, known_identity = self.offsets.get(path, (0, None))
+        if known_identity != identity or info.st_size < offset:
+            offset = 0
+        if info.st_size == offset:
+            return
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Still being written; read it completely next time
+                offset += len(line)
+                self._add(line.decode('utf-8', errors='replace').rstrip("\r\n"))
+        self.offsets[path] = (offset, identity)
+    
+    def _add(self, line):
+        # Passwords may contain ':', and so do NetNTLM hashes; the other hashes P4wnForge
+        # cracks (NT, $office$, $pdf$) end at the first ':'
+        match = NETNTLMV2_PATTERN.match(line) or NETNTLMV1_PATTERN.match(line)
+        pos = match.end() if match and line[match.end():match.end() + 1] == ":" else line.find(":")
+        if pos > 0:
+            self.entries[normalize_hash(line[:pos])] = decode_plain(line[pos + 1:])
+    
+    def lookup(self, hash_text):
+        """Plain password of a cracked hash, or None"""
+        with self.lock:
+            return self.entries.get(normalize_hash(hash_text))
+    
+    def __len__(self):
+        return len(self.entries)
+
+HashAccount = namedtuple('HashAccount', 'user hash_mode hash')
+
+def parse_hash_line(line):
+    """The account in one line of a pwdump, secretsdump or Responder file, or None"""
+    line = line.strip()
+    match = PWDUMP_PATTERN.match(line)
+    if match:
+        return HashAccount(match.group(1), "1000", match.group(3).lower())
+    # Responder's session log prefixes captures with "[SMB] NTLMv2-SSP Hash     : "
+    match = NETNTLMV2_PATTERN.search(line)
+    if match:
+        return HashAccount(match.group(0).split("::", 1)[0], "5600", match.group(0))
+    match = NETNTLMV1_PATTERN.search(line)
+    if match:
+        return HashAccount(match.group(0).split("::", 1)[0], "5500", match.group(0))
+    match = NT_PATTERN.match(line)
+    if match:
+        return HashAccount(match.group(1) or "", "1000", match.group(2).lower())
+    return None
+
+def write_hash_batch(dump_file, hash_mode, hash_file, accounts_file, known=None):
+    """Split a credential dump into one hashcat input file and an account map, in one pass.
+    
+    Every account whose hash is of hash_mode goes to accounts_file as a
+    user<TAB>hash line. Each distinct hash is written to hash_file once, unless
+    known(hash) already returns its password. Returns (accounts, distinct hashes,
+    hashes written, {other hash mode: accounts}).
+    """
+    seen = set()
+    accounts = written = 0
+    skipped = {}
+    with open(dump_file, 'r', encoding='utf-8', errors='replace') as dump, \
+         open(hash_file, 'w', encoding='utf-8') as hashes, \
+         open(accounts_file, 'w', encoding='utf-8') as users:
+        for line in dump:
+            account = parse_hash_line(line)
+            if account is None:
+                continue
+            if account.hash_mode != hash_mode:
+                skipped[account.hash_mode] = skipped.get(account.hash_mode, 0) + 1
+                continue
+            accounts += 1
+            users.write(f"{account.user}\t{account.hash}\n")
+            key = normalize_hash(account.hash)
+            if key in seen:
+                continue
+            seen.add(key)
+            if known is None or known(account.hash) is None:
+                hashes.write(account.hash + "\n")
+                written += 1
+    return accounts, len(seen), written, skipped
+
+def read_hash_accounts(accounts_file):
+    """(user, hash) pairs written by write_hash_batch"""
+    with open(accounts_file, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            user, _, hash_text = line.rstrip("\n").partition("\t")
+            if hash_text:
+                yield user, hash_text
+
+class HashcatJob:
+    """One hashcat attack: its session name, inputs and where its state lives.
+
+    arguments are the attack arguments (mode, attack mode, hash file, wordlist
+    or mask, outfile ...) without the session and status options, which
+    command() adds.
+    """
+
+    def __init__(self, session, state_dir, **info):
+        self.session = session
+        self.state_dir = state_dir
+        self.kind = info.get('kind', 'hash')
+        self.target = info.get('target', '')
+        self.hash_mode = str(info.get('hash_mode', ''))
+        self.hash_file = info.get('hash_file', '')
+        self.outfile = info.get('outfile', '')
+        self.arguments = list(info.get('arguments', []))
+        self.description = info.get('description', '')
+        self.status = info.get('status', 'new')
+        self.returncode = info.get('returncode')
+        self.created = info.get('created') or datetime.now().isoformat(timespec='seconds')
+        self.updated = info.get('updated') or self.created
+
+    @property
+    def state_file(self):
+        return os.path.join(self.state_dir, f"{self.session}.json")
+
+    @property
+    def restore_file(self):
+        return os.path.join(self.state_dir, f"{self.session}.restore")
+
+    def can_resume(self):
+        """True when hashcat left a restore file and the job did not run to completion"""
+        return self.status in RESUMABLE_STATES and os.path.exists(self.restore_file)
+
+    def command(self, hashcat, restore=False):
+        """The hashcat command line that starts (or, with restore, continues) this job"""
+        session_args = ["--session", self.session, "--restore-file-path", self.restore_file]
+        if restore:
+            # The restore file holds the original arguments and working directory
+            return [hashcat] + session_args + ["--restore"]
+        return [hashcat] + self.arguments + STATUS_ARGUMENTS + session_args
+
+    def to_dict(self):
+        return {
+            'session': self.session,
+            'kind': self.kind,
+            'target': self.target,
+            'hash_mode': self.hash_mode,
+            'hash_file': self.hash_file,
+            'outfile': self.outfile,
+            'arguments': self.arguments,
+            'description': self.description,
+            'status': self.status,
+            'returncode': self.returncode,
+            'created': self.created,
+            'updated': self.updated
+        }
+
+    def save(self):
+        """Write the job record atomically, so a crash never leaves half a file"""
+        os.makedirs(self.state_dir, exist_ok=True)
+        temp_file = self.state_file + ".tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(temp_file, self.state_file)
+
+    def set_status(self, status, returncode=None):
+        self.status = status
+        self.returncode = returncode
+        self.updated = datetime.now().isoformat(timespec='seconds')
+        self.save()
+
+    def label(self):
+        """One-line summary for job lists"""
+        name = os.path.basename(self.target) if self.target else self.hash_file
+        detail = f" - {self.description}" if self.description else ""
+        return f"{self.updated.replace('T', ' ')}  [{self.kind}] {name} (mode {self.hash_mode}, {self.status}){detail}"
+
+class HashcatSessionManager:
+    """Creates, lists and cleans up hashcat jobs under a state directory"""
+
+    def __init__(self, state_dir=STATE_DIR):
+        self.state_dir = state_dir
+
+    def create(self, kind, target, hash_mode, hash_file, outfile, arguments, description=""):
+        """Register a new job with a unique session name"""
+        stem = re.sub(r'[^A-Za-z0-9_-]+', '_', os.path.splitext(os.path.basename(target or hash_file))[0])[:40]
+        session = f"p4wn_{kind}_{stem}_{time.strftime('%Y%m%d_%H%M%S')}"
+        suffix = 1
+        while os.path.exists(os.path.join(self.state_dir, f"{session}.json")):
+            suffix += 1
+            session = f"p4wn_{kind}_{stem}_{time.strftime('%Y%m%d_%H%M%S')}_{suffix}"
+        job = HashcatJob(session, self.state_dir, kind=kind, target=target, hash_mode=hash_mode,
+                         hash_file=hash_file, outfile=outfile, arguments=arguments, description=description)
+        job.save()
+        return job
+
+    def load(self, session):
+        with open(os.path.join(self.state_dir, f"{session}.json"), 'r', encoding='utf-8') as f:
+            info = json.load(f)
+        info.pop('session', None)
+        return HashcatJob(session, self.state_dir, **info)
+
+    def jobs(self):
+        """All saved jobs, most recently updated first"""
+        jobs = []
+        try:
+            names = os.listdir(self.state_dir)
+        except OSError:
+            return jobs
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            try:
+                jobs.append(self.load(name[:-5]))
+            except (OSError, ValueError, TypeError):
+                continue  # Unreadable record; leave it for the user to inspect
+        return sorted(jobs, key=lambda job: job.updated, reverse=True)
+
+    def resumable(self):
+        return [job for job in self.jobs() if job.can_resume()]
+
+    def delete(self, job):
+        """Forget a job and its restore file"""
+        for path in (job.state_file, job.restore_file):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def main():
+    parser = argparse.ArgumentParser(description="List P4wnForge hashcat jobs")
+    parser.add_argument("--resumable", action="store_true", help="Only list jobs that can be resumed")
+    parser.add_argument("--state-dir", default=STATE_DIR, help=f"Job directory (default: {STATE_DIR})")
+    args = parser.parse_args()
+
+    manager = HashcatSessionManager(args.state_dir)
+    jobs = manager.resumable() if args.resumable else manager.jobs()
+    if not jobs:
+        print("No hashcat jobs found")
+        return
+    for job in jobs:
+        resume = "  (resumable)" if job.can_resume() else ""
+        print(f"{job.session}\n  {job.label()}{resume}")
+        print("  " + " ".join(job.command("hashcat", restore=True)))
+
+if __name__ == "__main__":
+    main()
@@ -5,28 +5,33 @@ import platform
 import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
-import requests
 import zipfile
 import shutil
-from PIL import Image, ImageTk
 import webbrowser
 import json
 import time
-import paramiko
-from paramiko import SSHClient
+import queue
 from stat import S_ISDIR
 import re
 
-# Ensure you have installed PyMuPDF (pip install PyMuPDF)
-import fitz  # PyMuPDF
+# PyMuPDF (fitz), paramiko, requests and PIL are imported where they are used:
+# together they add seconds to startup and most sessions only need some of them
 
 # Import PDFBruteForcer from pdfbrute.py
 try:
-    from pdfbrute import PDFBruteForcer, AVAILABLE_LIBRARIES
+    from pdfbrute import PDFBruteForcer, available_libraries, format_eta, pdf_hashcat_hash
 except ImportError:
     # Define fallback if import fails
-    AVAILABLE_LIBRARIES = []
+    def available_libraries():
+        return []
     PDFBruteForcer = None
+    pdf_hashcat_hash = None
+    def format_eta(seconds):
+        return "unknown" if seconds is None else f"{seconds:.0f} seconds"
+
+# Named hashcat sessions with restore files, so interrupted attacks can be resumed
+from hashcat_jobs import (HashcatSessionManager, PotfileIndex, potfile_locations, decode_plain,
+                          parse_status_json, format_speed, write_hash_batch, read_hash_accounts)
 
 # Custom Combobox class to fix the selection issue
 class FixedCombobox(ttk.Combobox):
@@ -99,6 +104,161 @@ class FixedCombobox(ttk.Combobox):
             self.configure(foreground='black')
         self._fix_dropdown_style()
 
+# Output log: worker threads queue lines; the Tk thread shows them in batches every
+# LOG_DRAIN_INTERVAL ms, keeps the last LOG_VIEW_LINES lines on screen and writes
+# everything to segment files in ~/.p4wnforge/logs, keeping LOG_HISTORY_SESSIONS sessions
+LOG_DRAIN_INTERVAL = 100
+LOG_VIEW_LINES = 5000
+LOG_SEGMENT_BYTES = 10 * 1024 * 1024
+LOG_HISTORY_SESSIONS = 5
+LOG_SEARCH_LIMIT = 1000
+
+class ConsoleHistory:
+    """On-disk history behind the output console.
+    
+    Lines are appended to segment files of up to LOG_SEGMENT_BYTES named
+    console-<session start>-<n>.log, so the full history of a session stays
+    searchable and savable however many lines the on-screen view drops.
+    line_count counts the lines since the last clear(), which keeps history
+    line numbers aligned with the view.
+    """
+    def __init__(self, log_dir):
+        self.log_dir = log_dir
+        os.makedirs(log_dir, exist_ok=True)
+        self.session = time.strftime("%Y%m%d-%H%M%S")
+        self.segments = []
+        self.start = 0  # First segment after the last clear()
+        self.line_count = 0
+        self.current = None
+        self.current_size = 0
+        self._prune_old_sessions()
+        self._open_segment()
+    
+    def _prune_old_sessions(self):
+        """Delete the segments of all but the newest LOG_HISTORY_SESSIONS - 1 earlier sessions"""
+        sessions = {}
+        for name in os.listdir(self.log_dir):
+            match = re.match(r'console-(\d{8}-\d{6})-\d+\.log$', name)
+            if match:
+                sessions.setdefault(match.group(1), []).append(name)
+        for session in sorted(sessions)[:-(LOG_HISTORY_SESSIONS - 1) or None]:
+            for name in sessions[session]:
+                try:
+                    os.remove(os.path.join(self.log_dir, name))
+                except OSError:
+                    pass
+    
+    def _open_segment(self):
+        if self.current:
+            self.current.close()
+        path = os.path.join(self.log_dir, f"console-{self.session}-{len(self.segments) + 1:04d}.log")
+        self.current = open(path, 'a', encoding='utf-8')
+        self.segments.append(path)
+        self.current_size = 0
+    
+    def write(self, text):
+        """Append text (complete lines ending in a newline)"""
+        if self.current_size >= LOG_SEGMENT_BYTES:
+            self._open_segment()
+        self.current.write(text)
+        self.current_size += len(text)
+        self.line_count += text.count("\n")
+    
+    def clear(self):
+        """Start a fresh history; earlier segments stay on disk but are no longer searched or saved"""
+        self._open_segment()
+        self.start = len(self.segments) - 1
+        self.line_count = 0
+    
+    def files(self):
+        """Flush and list the current segments; call from the thread that writes the history"""
+        self.current.flush()
+        return self.segments[self.start:]
+    
+    @staticmethod
+    def search(text, paths, limit=LOG_SEARCH_LIMIT):
+        """Return up to limit (line number, line) pairs containing text, ignoring case, by streaming
+        the segment files in paths (from files()). Only reads files, so it can run in any thread."""
+        needle = text.lower()
+        matches = []
+        line_number = 0
+        for path in paths:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    line_number += 1
+                    if needle in line.lower():
+                        matches.append((line_number, line.rstrip("\n")))
+                        if len(matches) >= limit:
+                            return matches
+        return matches
+    
+    def save_to(self, filepath):
+        """Copy the history to filepath segment by segment, never holding it in memory"""
+        with open(filepath, 'w', encoding='utf-8') as out:
+            for path in self.files():
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    shutil.copyfileobj(f, out)
+    
+    def close(self):
+        if self.current:
+            self.current.close()
+            self.current = None
+
+class HashcatDashboard(ttk.Frame):
+    """Live hashcat progress (state, progress, speed per device, recovered, ETA, temperatures).
+    
+    Fed with HashcatStatus updates parsed from --status-json output; it only
+    reconfigures a few labels per update instead of appending to the log.
+    """
+    def __init__(self, master=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.state_var = tk.StringVar(value="Hashcat: idle")
+        self.percent_var = tk.StringVar(value="")
+        self.detail_var = tk.StringVar(value="")
+        self.devices_var = tk.StringVar(value="")
+        
+        ttk.Label(self, textvariable=self.state_var, width=40).grid(row=0, column=0, sticky=tk.W, padx=5)
+        self.progress = ttk.Progressbar(self, mode='determinate', maximum=1000, length=250)
+        self.progress.grid(row=0, column=1, sticky=tk.EW, padx=5)
+        ttk.Label(self, textvariable=self.percent_var, width=8).grid(row=0, column=2, sticky=tk.W, padx=5)
+        ttk.Label(self, textvariable=self.detail_var).grid(row=1, column=0, columnspan=3, sticky=tk.W, padx=5)
+        ttk.Label(self, textvariable=self.devices_var).grid(row=2, column=0, columnspan=3, sticky=tk.W, padx=5)
+        self.columnconfigure(1, weight=1)
+    
+    def start(self, title):
+        """Show a newly started job before its first status arrives"""
+        self.state_var.set(f"Hashcat: starting {title}")
+        self.progress['value'] = 0
+        self.percent_var.set("")
+        self.detail_var.set("")
+        self.devices_var.set("")
+    
+    def finish(self, text):
+        self.state_var.set(f"Hashcat: {text}")
+    
+    def update_status(self, status):
+        fraction = status.progress / status.total if status.total else 0.0
+        self.state_var.set(f"Hashcat: {status.name}" + (f" - {status.guess}" if status.guess else ""))
+        self.progress['value'] = fraction * 1000
+        self.percent_var.set(f"{fraction * 100:.2f}%")
+        
+        if status.estimated_stop and status.state == 3:
+            eta = format_eta(max(0, status.estimated_stop - time.time()))
+        else:
+            eta = "-"
+        self.detail_var.set(f"Speed: {format_speed(status.speed)}   "
+                            f"Recovered: {status.recovered}/{status.recovered_total}   "
+                            f"Progress: {status.progress:,}/{status.total:,}   ETA: {eta}")
+        devices = []
+        for device in status.devices:
+            text = f"#{device.device_id} {device.name.strip()}: {format_speed(device.speed)}"
+            if device.temp is not None and device.temp >= 0:
+                text += f", {device.temp}\u00b0C"
+            if device.util is not None and device.util >= 0:
+                text += f", {device.util}%"
+            devices.append(text)
+        self.devices_var.set("   ".join(devices))
+
 class PasswordCrackerApp:
     def __init__(self, root):
         self.root = root
@@ -116,6 +276,7 @@ class PasswordCrackerApp:
                 # For non-Windows platforms, use webp
                 icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "P4wnForge.webp")
                 if os.path.exists(icon_path):
+                    from PIL import Image, ImageTk
                     icon_img = Image.open(icon_path)
                     icon_photo = ImageTk.PhotoImage(icon_img)
                     self.root.iconphoto(True, icon_photo)
@@ -139,6 +300,7 @@ class PasswordCrackerApp:
         self.is_dark_mode = tk.BooleanVar(value=self.config.get('dark_mode', False))
         self.target_file_path = tk.StringVar()
         self.password_list_path = tk.StringVar()
+        self.pdf_rules_path = tk.StringVar()
         self.bruteforce_length = tk.IntVar(value=8)  # Default bruteforce length is 8
         
         # Bruteforce character set options
@@ -162,9 +324,21 @@ class PasswordCrackerApp:
         self.ssh_client = None
         self.sftp_client = None
         
+        # Output log bus: log_output() may be called from any thread
+        self.log_queue = queue.SimpleQueue()
+        try:
+            self.console_history = ConsoleHistory(os.path.join(os.path.expanduser("~"), ".p4wnforge", "logs"))
+        except Exception as e:
+            print(f"Output history disabled: {e}")
+            self.console_history = None
+        
         # Flags and state
         self.is_cracking = False
         self.cracking_process = None
+        self.hashcat_sessions = HashcatSessionManager()
+        self.hashcat_status = None  # Last --status-json update of the running job
+        # Cracked hashes from the potfile and all *_cracked.txt outfiles under hashes/
+        self.potfile_index = PotfileIndex(directories=[os.path.join(os.path.dirname(os.path.abspath(__file__)), "hashes")])
         
         # Dictionary management
         self.dictionary_files = []
@@ -253,6 +427,22 @@ class PasswordCrackerApp:
         status_button = ttk.Button(output_controls, text="Status", command=self.send_status_command)
         status_button.pack(side=tk.LEFT, padx=5)
         
+        # Continue a stopped or interrupted hashcat session from its restore file
+        resume_button = ttk.Button(output_controls, text="Resume", command=self.prompt_resume_hashcat_job)
+        resume_button.pack(side=tk.LEFT, padx=5)
+        
+        # Search the whole output history, including lines no longer shown
+        self.output_search_var = tk.StringVar()
+        search_button = ttk.Button(output_controls, text="Search", command=self.search_output)
+        search_button.pack(side=tk.RIGHT, padx=5)
+        search_entry = ttk.Entry(output_controls, textvariable=self.output_search_var, width=25)
+        search_entry.pack(side=tk.RIGHT, padx=5)
+        search_entry.bind("<Return>", lambda event: self.search_output())
+        
+        # Live hashcat progress from --status-json, above the log
+        self.hashcat_dashboard = HashcatDashboard(self.output_frame, padding="5")
+        self.hashcat_dashboard.pack(fill=tk.X, side=tk.TOP)
+        
         # Text widget inside a frame with scrollbar
         text_frame = ttk.Frame(self.output_frame, padding="5")
         text_frame.pack(fill=tk.BOTH, expand=True)
@@ -261,8 +451,11 @@ class PasswordCrackerApp:
         self.output_text.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
         self.output_text.tag_configure("password_found", foreground="green", font=("Helvetica", 10, "bold"))
         
+        self.output_text.tag_configure("search_hit", background="#FFD54F", foreground="black")
+        
         # Add initial text to show the output is working
-        self.output_text.insert(tk.END, "P4wnForge initialized - ready to recover passwords\n")
+        self.log_output("P4wnForge initialized - ready to recover passwords")
+        self.root.after(LOG_DRAIN_INTERVAL, self._drain_log_queue)
         
         scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=self.output_text.yview)
         scrollbar.pack(fill=tk.Y, side=tk.RIGHT)
@@ -300,6 +493,10 @@ class PasswordCrackerApp:
         self.check_hashcat()
         self.check_john_tools()
         
+        resumable = self.hashcat_sessions.resumable()
+        if resumable:
+            self.log_output(f"{len(resumable)} interrupted hashcat job(s) can be continued with the Resume button.")
+        
         # Set a much larger output area by default - this runs after all initialization
         self.root.after(1000, self.ensure_large_output_area)
 
@@ -515,6 +712,13 @@ class PasswordCrackerApp:
         self.save_window_config()
         # Save dictionaries before closing
         self.save_dictionaries()
+        # Write out log lines still waiting in the queue
+        try:
+            self._drain_log_queue(reschedule=False)
+            if self.console_history:
+                self.console_history.close()
+        except Exception:
+            pass
         # Destroy the window
         self.root.destroy()
 
@@ -843,16 +1047,28 @@ class PasswordCrackerApp:
         self.pdf_attack_type.grid(column=1, row=1, sticky=tk.W, padx=5, pady=3)
         self.pdf_attack_type.current(0)  # Default to Dictionary Attack
         
-        # PDF version selection remains for interface consistency
-        ttk.Label(frame, text="PDF Version:").grid(column=0, row=2, sticky=tk.W, padx=5, pady=5)
-        self.pdf_version_combobox = FixedCombobox(frame, is_dark_mode_var=self.is_dark_mode, values=[
-            "Acrobat 5.0 and later (PDF 1.4)",
-            "Acrobat 6.0 and later (PDF 1.5)",
-            "Acrobat 7.0 and later (PDF 1.6)",
-            "Acrobat 9.0 and later (PDF 1.7)"
+        # Cracking engine: pdfbrute on the CPU, or hashcat's OpenCL kernels on the
+        # extracted $pdf$ hash (the hashcat mode follows the document's encryption)
+        ttk.Label(frame, text="Engine:").grid(column=0, row=2, sticky=tk.W, padx=5, pady=5)
+        self.pdf_engine = FixedCombobox(frame, is_dark_mode_var=self.is_dark_mode, values=[
+            "Built-in (CPU)",
+            "Hashcat (OpenCL)"
         ])
-        self.pdf_version_combobox.grid(column=1, row=2, sticky=tk.W, padx=5, pady=5)
-        self.pdf_version_combobox.current(3)
+        self.pdf_engine.grid(column=1, row=2, sticky=tk.W, padx=5, pady=5)
+        self.pdf_engine.current(0)
+        
+        # Optional hashcat .rule file applied to every dictionary word (both engines)
+        ttk.Label(frame, text="Rules (optional):").grid(column=0, row=3, sticky=tk.W, padx=5, pady=5)
+        ttk.Entry(frame, textvariable=self.pdf_rules_path, width=50).grid(column=1, row=3, sticky=tk.W, padx=5, pady=5)
+        def browse_rules_file():
+            filename = filedialog.askopenfilename(
+                title="Select Rule File",
+                initialdir=os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules"),
+                filetypes=[("Hashcat Rules", "*.rule"), ("All Files", "*.*")]
+            )
+            if filename:
+                self.pdf_rules_path.set(filename)
+        ttk.Button(frame, text="Browse", command=browse_rules_file).grid(column=2, row=3, sticky=tk.W, padx=5, pady=5)
         
         # Custom function for PDF toggle that prevents options dialog during active cracking
         def pdf_toggle_cracking():
@@ -864,7 +1080,7 @@ class PasswordCrackerApp:
                 self.toggle_cracking("pdf")
         
         self.pdf_crack_button = ttk.Button(frame, text="Start Cracking", command=pdf_toggle_cracking)
-        self.pdf_crack_button.grid(column=1, row=3, sticky=tk.E, padx=5, pady=20)
+        self.pdf_crack_button.grid(column=1, row=4, sticky=tk.E, padx=5, pady=20)
     
     def setup_hash_tab(self):
         frame = ttk.LabelFrame(self.hash_tab, text="NTLM Hash Cracking", padding="10")
@@ -909,6 +1125,7 @@ class PasswordCrackerApp:
             logo_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "P4wnForge.webp")
             if os.path.exists(logo_path):
                 try:
+                    from PIL import Image, ImageTk
                     img = Image.open(logo_path)
                     # Resize image if needed
                     img = img.resize((200, 200), Image.LANCZOS)
@@ -940,6 +1157,7 @@ class PasswordCrackerApp:
         try:
             hightech_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hightech.png")
             if os.path.exists(hightech_path):
+                from PIL import Image, ImageTk
                 hightech_img = Image.open(hightech_path)
                 # Resize image for appropriate display
                 hightech_img = hightech_img.resize((94, 94), Image.LANCZOS)
@@ -1382,6 +1600,8 @@ class PasswordCrackerApp:
     def _download_file_with_progress(self, url, output_path, total_size_mb):
         """Download a file from URL to the given path with progress updates"""
         try:
+            import requests
+            
             # First check if we have write permission to the output directory
             output_dir = os.path.dirname(output_path)
             if not os.access(output_dir, os.W_OK):
@@ -1724,7 +1944,9 @@ class PasswordCrackerApp:
         """Stop the currently running cracking process"""
         if self.cracking_process and hasattr(self.cracking_process, 'poll') and self.cracking_process.poll() is None:
             self.log_output("Stopping cracking process...")
-            if sys.platform == "win32":
+            if self._quit_hashcat_process(self.cracking_process):
+                pass  # hashcat saved its restore point and exited
+            elif sys.platform == "win32":
                 # On Windows, we need to use taskkill to kill the process and its children
                 subprocess.run(["taskkill", "/F", "/T", "/PID", str(self.cracking_process.pid)], 
                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
@@ -1905,6 +2127,73 @@ class PasswordCrackerApp:
                 self.cracking_process = None
                 self.root.after(0, lambda: self.update_crack_buttons("Start Cracking"))
     
+    def _hashcat_executable(self):
+        return (self.hashcat_path if os.path.dirname(self.hashcat_path)
+                else ("hashcat.exe" if sys.platform=="win32" else "hashcat"))
+    
+    def _quit_hashcat_process(self, process, timeout=5):
+        """Ask hashcat to quit with its 'q' key so it writes the restore file; False if it did not exit"""
+        try:
+            process.stdin.write('q\n')
+            process.stdin.flush()
+            process.wait(timeout=timeout)
+            return True
+        except Exception:
+            return False
+    
+    def _run_hashcat_job(self, job, restore=False):
+        """Run a hashcat job as a named session, streaming its output.
+        
+        --status-json updates drive the dashboard; other lines go to the log.
+        Returns hashcat's exit status once it has finished, or None when the
+        run was stopped or aborted; the job then keeps its restore file and can
+        be continued with the Resume button.
+        """
+        command = job.command(self._hashcat_executable(), restore=restore)
+        self.log_output(f"Executing command: {' '.join(command)}")
+        hashcat_dir = os.path.dirname(self.hashcat_path) if os.path.dirname(self.hashcat_path) else None
+        
+        job.set_status("running")
+        self.hashcat_status = None
+        self.root.after(0, self.hashcat_dashboard.start, job.label())
+        try:
+            # stdin stays open for the status and quit keys
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                       stdin=subprocess.PIPE, text=True, bufsize=1, cwd=hashcat_dir)
+            self.cracking_process = process
+            for line in iter(process.stdout.readline, ''):
+                if not self.is_cracking:  # If process was stopped by user
+                    break
+                # Status updates go to the dashboard, everything else to the log
+                status = parse_status_json(line)
+                if status is not None:
+                    self.hashcat_status = status
+                    self.root.after(0, self.hashcat_dashboard.update_status, status)
+                    continue
+                if line.strip():
+                    self.log_output(line.strip())
+            
+            returncode = process.wait() if self.is_cracking else None
+        except Exception:
+            job.set_status("failed")
+            self.root.after(0, self.hashcat_dashboard.finish, "failed")
+            raise
+        
+        # 0 = cracked, 1 = exhausted; 2-4 = aborted (quit key, checkpoint, runtime limit)
+        if returncode in (0, 1):
+            job.set_status("finished", returncode)
+            self.root.after(0, self.hashcat_dashboard.finish, "cracked" if returncode == 0 else "exhausted")
+            return returncode
+        if returncode is None or returncode in (2, 3, 4):
+            job.set_status("interrupted", returncode)
+            self.root.after(0, self.hashcat_dashboard.finish, "stopped")
+            if job.can_resume():
+                self.log_output(f"Hashcat session {job.session} can be continued with the Resume button.")
+            return None
+        job.set_status("failed", returncode)
+        self.root.after(0, self.hashcat_dashboard.finish, f"failed (exit status {returncode})")
+        return None
+    
     def _crack_office(self):
         target_file = self.target_file_path.get()
         
@@ -1995,58 +2284,26 @@ class PasswordCrackerApp:
         if is_bruteforce:
             command.extend(["--workload-profile", "3"])  # Better performance
             command.extend(["--optimized-kernel-enable"])
-            # For bruteforce, use stdin pipe for possible interactive use
-            use_pipe = True
             self.log_output("Note: This may take a long time for complex passwords!", "warning")
-        else:
-            use_pipe = False
         
         # Redirect output to a file in the same directory as the hash
         outfile_path = os.path.join(office_hashes_dir, f"{os.path.splitext(target_filename)[0]}_cracked.txt").replace('\\', '/')
         command.extend(["--outfile", outfile_path])
         if "--force" not in command:
             command.append("--force")
-        self.log_output(f"Executing command: {' '.join(command)}")
-        hashcat_dir = os.path.dirname(self.hashcat_path) if os.path.dirname(self.hashcat_path) else None
+        # Look the password up against the same input afterwards
+        if os.path.exists(hash_file) and os.path.getsize(hash_file) > 0:
+            show_target = hash_file
+        else:
+            show_target = target_file
+        if show_target == hash_file and self._report_if_already_cracked(target_file, hash_file, "--username" in command):
+            return
+        job = self.hashcat_sessions.create("office", target_file, office_hash_mode, show_target, outfile_path, command[1:],
+                                           "bruteforce" if is_bruteforce else "dictionary")
         
         try:
-            if use_pipe:
-                self.cracking_process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.PIPE, text=True, bufsize=1, cwd=hashcat_dir)
-            else:
-                self.cracking_process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, cwd=hashcat_dir)
-                
-            for line in iter(self.cracking_process.stdout.readline, ''):
-                if not self.is_cracking:  # If process was stopped by user
-                    break
-                self.log_output(line.strip())
-            
-            if self.is_cracking:  # Only process output if we haven't been manually stopped
-                self.cracking_process.wait()
-                # Run --show command to retrieve the password
-                if os.path.exists(hash_file) and os.path.getsize(hash_file) > 0:
-                    show_target = hash_file
-                else:
-                    show_target = target_file
-                show_cmd = [self.hashcat_path, "-m", office_hash_mode, "--show", show_target]
-                self.log_output(f"Executing show command: {' '.join(show_cmd)}")
-                show_result = subprocess.run(show_cmd, capture_output=True, text=True, cwd=hashcat_dir)
-                self.log_output("Show command output:")
-                self.log_output(show_result.stdout)
-                recovered_password = None
-                for line in show_result.stdout.splitlines():
-                    if ":" in line:
-                        parts = line.split(":", 1)
-                        if len(parts) > 1 and parts[1].strip():
-                            recovered_password = parts[1].strip()
-                            break
-                if recovered_password:
-                    self.log_output("Password cracking completed successfully!", is_password=True)
-                    self.log_output(f"PASSWORD FOUND: {recovered_password}", is_password=True)
-                    self._save_cracked_password(target_file, recovered_password)
-                    # Show success message box
-                    messagebox.showinfo("Success!", f"Password found: {recovered_password}")
-                else:
-                    self.log_output("Password not found or could not parse output.", is_password=True)
+            if self._run_hashcat_job(job) is not None:  # Only process output if the run was not stopped
+                self._report_hashcat_job(job)
         except Exception as e:
             self.log_output(f"Error executing hashcat command: {str(e)}")
             self.log_output("Command that failed: " + " ".join(command))
@@ -2076,19 +2333,22 @@ class PasswordCrackerApp:
         
         # Check if using bruteforce mode
         is_bruteforce = self.pdf_attack_type.get() == "Bruteforce" if hasattr(self, 'pdf_attack_type') else False
+        use_hashcat = hasattr(self, 'pdf_engine') and self.pdf_engine.get().startswith("Hashcat")
+        rules_path = self.pdf_rules_path.get().strip()
+        
+        # pdfbrute provides both the built-in engine and the hash extraction for hashcat
+        if PDFBruteForcer is None:
+            self.log_output("Error: PDF cracking module (pdfbrute.py) not available.")
+            messagebox.showerror("Error", "PDF cracking module (pdfbrute.py) not available")
+            if self.is_cracking:
+                self.is_cracking = False
+                self.update_crack_buttons("Start Cracking")
+            return
         
         # We'll only open this path during direct button clicks, not from _run_cracking_process 
         # since we're handling that separately now
         if is_bruteforce:
             self.log_output("Using bruteforce attack mode for PDF", "info")
-            
-            # Check if PDFBruteForcer is available
-            if PDFBruteForcer is None:
-                self.log_output("Error: PDFBruteForcer not available. Using fallback method.")
-                messagebox.showerror("Error", "PDF bruteforce module not available. Using fallback method.")
-                # Fall back to the existing bruteforce method
-                self._crack_pdf_hashcat_bruteforce(pdf_path, hash_file)
-                return
                 
             # Prompt for PDF-specific bruteforce options
             options = self.prompt_pdf_bruteforce_options()
@@ -2097,11 +2357,37 @@ class PasswordCrackerApp:
                 # The on_cancel method in the options dialog will reset the button state
                 return
             
+            if use_hashcat:
+                if not self.hashcat_path and not self.check_hashcat():
+                    messagebox.showerror("Error", "Hashcat is required but not installed")
+                    self.is_cracking = False
+                    self.update_crack_buttons("Start Cracking")
+                    return
+                if options.get('target', 'user') != 'user':
+                    self.log_output("Note: hashcat recovers the user password only")
+                mask_args = self._pdf_hashcat_mask_args(options)
+                
+                def run_hashcat_bruteforce():
+                    self._crack_pdf_hashcat(pdf_path, hash_file, "3", mask_args)
+                    if self.is_cracking:
+                        self.is_cracking = False
+                        self.cracking_process = None
+                        self.root.after(0, lambda: self.update_crack_buttons("Start Cracking"))
+                
+                thread = threading.Thread(target=run_hashcat_bruteforce)
+                thread.daemon = True
+                thread.start()
+                return
+            
             # Set up PDFBruteForcer
             options['progress_file'] = os.path.join(pdf_hashes_dir, f"{os.path.splitext(target_filename)[0]}_progress.json")
             
             # Configure PDFBruteForcer to use our logging function
             options['log_function'] = lambda msg: self.root.after(10, lambda: self.log_output(msg))
+            # Live progress summary in the output frame title
+            options['stats_function'] = lambda stats: self.root.after(0, lambda: self.output_frame.config(
+                text=f"Output - PDF bruteforce: {stats.percent_done:.2f}% | {stats.ewma_rate:,.0f}/sec | " +
+                     f"ETA {format_eta(stats.eta_seconds)}"))
             
             # Variable to store the brute forcer instance
             self.pdf_brute_forcer = None
@@ -2110,8 +2396,11 @@ class PasswordCrackerApp:
             def run_pdf_bruteforce():
                 try:
                     self.log_output(f"Starting PDF bruteforce with {options['library']} library...")
-                    self.log_output(f"Password length: {options['min_length']} to {options['max_length']} characters")
-                    self.log_output(f"Character set: {options['charset']}")
+                    if options.get('mask'):
+                        self.log_output(f"Mask: {options['mask']}")
+                    else:
+                        self.log_output(f"Password length: {options['min_length']} to {options['max_length']} characters")
+                        self.log_output(f"Character set: {options['charset']}")
                     
                     # Initialize PDFBruteForcer with our logging function
                     self.pdf_brute_forcer = PDFBruteForcer(pdf_path, options)
@@ -2124,12 +2413,25 @@ class PasswordCrackerApp:
                             self.log_output("PDF bruteforce stopped by user.")
                             return
                         
-                        if success and self.pdf_brute_forcer.found_password:
+                        found_password = self.pdf_brute_forcer.found_password
+                        found_owner_password = self.pdf_brute_forcer.found_owner_password
+                        if success and options.get('target', 'user') == 'user' and found_password:
                             self.log_output(f"PDF password cracking completed successfully!", is_password=True)
-                            self.log_output(f"PASSWORD FOUND: {self.pdf_brute_forcer.found_password}", is_password=True)
-                            self._save_cracked_password(pdf_path, self.pdf_brute_forcer.found_password)
+                            self.log_output(f"PASSWORD FOUND: {found_password}", is_password=True)
+                            self._save_cracked_password(pdf_path, found_password)
                             # Show success message box
-                            messagebox.showinfo("Success!", f"Password found: {self.pdf_brute_forcer.found_password}")
+                            messagebox.showinfo("Success!", f"Password found: {found_password}")
+                        elif found_password is not None or found_owner_password is not None:
+                            found = []
+                            if found_password is not None:
+                                self.log_output(f"USER PASSWORD FOUND: {found_password}", is_password=True)
+                                found.append(f"User password: {found_password or '(empty)'}")
+                            if found_owner_password is not None:
+                                self.log_output(f"OWNER PASSWORD FOUND: {found_owner_password}", is_password=True)
+                                found.append(f"Owner password: {found_owner_password}")
+                            # The owner password also opens the document, with full permissions
+                            self._save_cracked_password(pdf_path, found_owner_password if found_owner_password is not None else found_password)
+                            messagebox.showinfo("Success!" if success else "Partial result", "\n".join(found))
                         else:
                             self.log_output("Password not found. Exhausted all combinations.", is_password=True)
                     except KeyboardInterrupt:
@@ -2139,6 +2441,8 @@ class PasswordCrackerApp:
                 except Exception as e:
                     self.log_output(f"Error initializing PDF bruteforce: {str(e)}")
                 
+                self.root.after(0, lambda: self.output_frame.config(text="Output"))
+                
                 # Reset the cracking state after completion (only if not already done by user stopping)
                 if self.is_cracking:
                     self.is_cracking = False
@@ -2161,117 +2465,218 @@ class PasswordCrackerApp:
                 self.update_crack_buttons("Start Cracking")
             return
         
-        # If not bruteforce, use dictionary attack with PyMuPDF
+        if use_hashcat:
+            if rules_path:
+                rules_path = self._find_rules_file(rules_path)
+            self._crack_pdf_hashcat(pdf_path, hash_file, "0",
+                                    [os.path.abspath(wordlist_path)] + (["-r", rules_path] if rules_path else []))
+            return
+        
+        # Stream the wordlist through pdfbrute's dictionary mode: chunks of words are
+        # checked by a pool of worker processes and the list is never read into memory.
+        # This runs on the cracking thread; output reaches Tk only through the queue.
+        self.log_output(f"Starting PDF dictionary attack with {os.path.basename(wordlist_path)} " +
+                        f"({os.path.getsize(wordlist_path):,} bytes)...")
+        progress_queue = queue.Queue()
+        options = {
+            'wordlist': wordlist_path,
+            'rules': [rules_path] if rules_path else [],
+            'library': 'auto',
+            'workers': os.cpu_count() or 1,
+            'chunk_words': 2048,
+            'show_progress_every': 100000,
+            'progress_file': os.path.join(pdf_hashes_dir, f"{os.path.splitext(target_filename)[0]}_dictionary_progress.json"),
+            'log_function': lambda msg: progress_queue.put(('log', msg)),
+            'stats_function': lambda stats: progress_queue.put(('stats', stats))
+        }
+        self.root.after(0, lambda: self._drain_pdf_queue(progress_queue))
+        self.pdf_brute_forcer = None
+        self.cracking_process = threading.current_thread()
+        success, error = False, None
         try:
-            with open(wordlist_path, "r", encoding="latin-1", errors='ignore') as f:
-                passwords = f.readlines()
-            
-            pdf_doc = fitz.open(pdf_path)
-            found = False
-            for password in passwords:
-                if not self.is_cracking:  # Check if process was stopped
-                    break
-                
-                password = password.strip()
-                self.log_output(f"Trying password: {password}")
-                self.root.update()  # Allow GUI to update
-                
-                if pdf_doc.authenticate(password):
-                    messagebox.showinfo("Success!", f"Password found: {password}")
-                    self.log_output(f"PDF password cracking completed successfully! PASSWORD FOUND: {password}", is_password=True)
-                    self._save_cracked_password(pdf_path, password)
-                    found = True
-                    break
-            
-            if self.is_cracking and not found:  # Only show message if we weren't manually stopped
-                messagebox.showerror("Failed", "No password in dictionary matched!")
-                self.log_output("No password in dictionary matched!")
+            self.pdf_brute_forcer = PDFBruteForcer(pdf_path, options)
+            # Stop may have been pressed while the backends were being calibrated
+            if self.is_cracking:
+                success = self.pdf_brute_forcer.run()
         except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {e}")
-            self.log_output(f"Error in PDF cracking: {e}")
+            error = e
+        stopped = not self.is_cracking
+        progress_queue.put(('done', (pdf_path, self.pdf_brute_forcer, success, error, stopped)))
     
-    def _crack_pdf_hashcat_bruteforce(self, pdf_path, hash_file):
-        """Fallback method using hashcat for PDF bruteforce if PDFBruteForcer is not available"""
+    def _drain_pdf_queue(self, progress_queue, interval=250):
+        """Show the queued output of a background PDF dictionary attack on the Tk thread.
+        
+        Runs every `interval` ms: log lines are inserted in one batch and only the
+        newest progress snapshot is shown, however fast the workers report.
+        """
+        lines, stats, done = [], None, None
+        try:
+            while True:
+                kind, value = progress_queue.get_nowait()
+                if kind == 'log':
+                    lines.append(value)
+                elif kind == 'stats':
+                    stats = value
+                else:
+                    done = value
+        except queue.Empty:
+            pass
+        if lines:
+            self.log_output("\n".join(lines))
+        if stats:
+            self.output_frame.config(text=f"Output - PDF dictionary attack: {stats.percent_done:.1f}% | " +
+                                          f"{stats.ewma_rate:,.0f}/sec | ETA {format_eta(stats.eta_seconds)}")
+        if done is None:
+            self.root.after(interval, lambda: self._drain_pdf_queue(progress_queue, interval))
+            return
+        
+        self.output_frame.config(text="Output")
+        pdf_path, forcer, success, error, stopped = done
+        if error is not None:
+            messagebox.showerror("Error", f"An error occurred: {error}")
+            self.log_output(f"Error in PDF cracking: {error}")
+        elif success and forcer.found_password is not None:
+            password = forcer.found_password
+            self.log_output(f"PDF password cracking completed successfully! PASSWORD FOUND: {password}", is_password=True)
+            self._save_cracked_password(pdf_path, password)
+            messagebox.showinfo("Success!", f"Password found: {password}")
+        elif stopped:
+            self.log_output("PDF dictionary attack stopped by user.")
+        else:
+            messagebox.showerror("Failed", "No password in dictionary matched!")
+            self.log_output("No password in dictionary matched!")
+    
+    def _find_rules_file(self, rules_path):
+        """Absolute path of a .rule file, looking in rules/ for bare names like best64.rule"""
+        if os.path.isfile(rules_path):
+            return os.path.abspath(rules_path)
+        bundled = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules", rules_path)
+        return bundled if os.path.isfile(bundled) else rules_path
+    
+    def _pdf_hashcat_mask_args(self, options):
+        """Translate the PDF bruteforce dialog settings into hashcat mask attack arguments"""
+        mask = options.get('mask')
+        if mask:
+            # .hcmask files are handed to hashcat whole; look in masks/ for bare names
+            bundled = os.path.join(os.path.dirname(os.path.abspath(__file__)), "masks", mask)
+            if os.path.isfile(mask):
+                return [os.path.abspath(mask)]
+            return [bundled] if os.path.isfile(bundled) else [mask]
+        
+        charsets = {'digits': "?d", 'lowercase': "?l", 'uppercase': "?u", 'letters': "?l?u",
+                    'alphanum': "?l?u?d", 'all': "?a"}
+        charset = options.get('charset', 'digits')
+        if charset in charsets:
+            custom = charsets[charset]
+        else:
+            # Custom combinations like "dlu" from the dialog's checkboxes
+            custom = "".join({'d': "?d", 'l': "?l", 'u': "?u", 's': "?s"}.get(c, "") for c in charset) or "?d"
+        return ["-1", custom, "?1" * options.get('max_length', 8),
+                "--increment", "--increment-min", str(options.get('min_length', 1))]
+    
+    def _crack_pdf_hashcat(self, pdf_path, hash_file, attack_mode, attack_args):
+        """Crack a PDF with hashcat's OpenCL kernels, from the document's extracted $pdf$ hash.
+        
+        attack_mode is hashcat's -a value ("0" dictionary, "3" mask) and attack_args
+        its inputs, e.g. [wordlist, "-r", rules] or [mask, "--increment"]. The hashcat
+        mode (10400, 10500, 10600 or 10700) follows the security handler revision.
+        """
         target_filename = os.path.basename(pdf_path)
         pdf_hashes_dir = os.path.dirname(hash_file)
         
-        # Use direct hashcat PDF cracking approach
         try:
-            self.log_output("Using direct hashcat method for PDF bruteforce...")
-            
-            # Create a simple hash file with the PDF file path
+            hash_mode, pdf_hash = pdf_hashcat_hash(pdf_path)
             with open(hash_file, 'w') as f:
-                f.write(pdf_path)
-            
-            # Use hashcat to crack the PDF directly
-            command = [self.hashcat_path if os.path.dirname(self.hashcat_path)
-                      else ("hashcat.exe" if sys.platform=="win32" else "hashcat")]
-            
-            # PDF hash mode for hashcat is 10500 (PDF 1.1-1.3) or 10600 (PDF 1.4-1.6)
-            # Use 10700 as a more universal option that handles different PDF versions
-            # Create a mask based on the user-specified options
-            mask = self.get_bruteforce_mask()
-            max_length = self.bruteforce_length.get()
-            
-            # Get the character set description for logging
-            char_sets = []
-            if self.use_lowercase.get(): char_sets.append("lowercase")
-            if self.use_uppercase.get(): char_sets.append("uppercase")
-            if self.use_digits.get(): char_sets.append("numbers")
-            if self.use_special.get(): char_sets.append("special chars")
-            
-            command.extend(["-m", "10700", "-a", "3", hash_file, mask, "--increment"])
-            self.log_output(f"Using bruteforce with mask: {mask} (max length: {max_length}, character sets: {', '.join(char_sets)})", "info")
-            
-            # Add optimizations for bruteforce
-            command.extend(["--workload-profile", "3"])  # Better performance
-            command.extend(["--optimized-kernel-enable"])
-            
-            # Redirect output to a file in the same directory as the hash
-            outfile_path = os.path.join(pdf_hashes_dir, f"{os.path.splitext(target_filename)[0]}_cracked.txt").replace('\\', '/')
-            command.extend(["--outfile", outfile_path, "--force"])
-            
-            self.log_output(f"Executing command: {' '.join(command)}")
-            hashcat_dir = os.path.dirname(self.hashcat_path) if os.path.dirname(self.hashcat_path) else None
+                f.write(pdf_hash + "\n")
+            self.log_output(f"Extracted PDF hash for hashcat mode {hash_mode} to {hash_file}")
+            if self._report_if_already_cracked(pdf_path, hash_file):
+                return
             
-            self.cracking_process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, 
-                                                    stdin=subprocess.PIPE, text=True, bufsize=1, cwd=hashcat_dir)
+            # The outfile keeps hashcat's default hash:plain lines, which the potfile index reads
+            outfile_path = os.path.join(pdf_hashes_dir, f"{os.path.splitext(target_filename)[0]}_cracked.txt")
+            arguments = ["-m", str(hash_mode), "-a", attack_mode, hash_file] + attack_args
+            arguments.extend(["--outfile", outfile_path, "--workload-profile", "3", "--force"])
+            job = self.hashcat_sessions.create("pdf", pdf_path, hash_mode, hash_file, outfile_path, arguments,
+                                               "mask" if attack_mode == "3" else "dictionary")
             
-            for line in iter(self.cracking_process.stdout.readline, ''):
-                if not self.is_cracking:  # If process was stopped by user
-                    break
-                self.log_output(line.strip())
-            
-            if self.is_cracking:  # Only process output if we haven't been manually stopped
-                self.cracking_process.wait()
-                # Run --show command to retrieve the password
-                show_cmd = [self.hashcat_path, "-m", "10700", "--show", hash_file]
-                self.log_output(f"Executing show command: {' '.join(show_cmd)}")
-                show_result = subprocess.run(show_cmd, capture_output=True, text=True, cwd=hashcat_dir)
-                
-                self.log_output("Show command output:")
-                self.log_output(show_result.stdout)
-                
-                recovered_password = None
-                for line in show_result.stdout.splitlines():
-                    if ":" in line:
-                        parts = line.split(":", 1)
-                        if len(parts) > 1 and parts[1].strip():
-                            recovered_password = parts[1].strip()
-                            break
-                
-                if recovered_password:
-                    self.log_output("Password cracking completed successfully!", is_password=True)
-                    self.log_output(f"PASSWORD FOUND: {recovered_password}", is_password=True)
-                    self._save_cracked_password(pdf_path, recovered_password)
-                    # Show success message box
-                    messagebox.showinfo("Success!", f"Password found: {recovered_password}")
-                else:
-                    self.log_output("Password not found or could not parse output.", is_password=True)
-            return
+            if self._run_hashcat_job(job) is None:
+                return
+            self._report_hashcat_job(job)
         except Exception as e:
-            self.log_output(f"Error in PDF hash extraction: {str(e)}")
-            messagebox.showerror("Error", f"Error extracting PDF hash: {str(e)}")
+            self.log_output(f"Error in PDF hashcat attack: {str(e)}")
+            messagebox.showerror("Error", f"Error in PDF hashcat attack: {str(e)}")
+    
+    def _refresh_potfile_index(self):
+        """Read what hashcat appended to the potfile and outfiles since the last lookup"""
+        app_dir = os.path.dirname(os.path.abspath(__file__))
+        self.potfile_index.paths = potfile_locations(self.hashcat_path, [app_dir])
+        self.potfile_index.refresh()
+        return self.potfile_index
+    
+    def _lookup_cracked(self, hash_file, username=False):
+        """(hash, password) of the first hash in hash_file that the potfile index knows, or None.
+        
+        With username (hashcat's --username) each line starts with a "name:" prefix,
+        which the potfile does not store.
+        """
+        index = self._refresh_potfile_index()
+        try:
+            with open(hash_file, 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    line = line.strip()
+                    if username and ":" in line:
+                        line = line.split(":", 1)[1]
+                    if line:
+                        password = index.lookup(line)
+                        if password is not None:
+                            return line, password
+        except OSError:
+            pass
+        return None
+    
+    def _report_hashcat_job(self, job):
+        """Report the password a finished hashcat job recovered, from the potfile index"""
+        recovered_password = None
+        found = self._lookup_cracked(job.hash_file, "--username" in job.arguments)
+        if found:
+            recovered_password = found[1]
+        elif job.returncode == 0:
+            # hashcat says everything is cracked but stores the hash in a form the index does not match
+            show_cmd = [self._hashcat_executable(), "-m", job.hash_mode, "--show", "--outfile-format", "2"]
+            if "--username" in job.arguments:
+                show_cmd.append("--username")
+            show_cmd.append(job.hash_file)
+            self.log_output(f"Executing show command: {' '.join(show_cmd)}")
+            hashcat_dir = os.path.dirname(self.hashcat_path) if os.path.dirname(self.hashcat_path) else None
+            show_result = subprocess.run(show_cmd, capture_output=True, text=True, cwd=hashcat_dir)
+            lines = show_result.stdout.splitlines()
+            recovered_password = decode_plain(lines[-1]) if lines else None
+        
+        if recovered_password is not None:
+            self.log_output("Password cracking completed successfully!", is_password=True)
+            self._report_password(job.target or job.hash_file, recovered_password)
+        else:
+            self.log_output("Password not found.", is_password=True)
+        return recovered_password
+    
+    def _report_password(self, target_file, password):
+        self.log_output(f"PASSWORD FOUND: {password}", is_password=True)
+        self._save_cracked_password(target_file, password)
+        messagebox.showinfo("Success!", f"Password found: {password}")
+    
+    def _report_if_already_cracked(self, target_file, hash_file, username=False):
+        """Report the password without launching hashcat if an earlier session already cracked hash_file.
+        
+        Saves the 5-30 seconds hashcat spends initializing its OpenCL devices only to
+        find the hash in its potfile. Returns True when the password was reported, which
+        may be the empty string (the blank NT hash is common in dumps).
+        """
+        found = self._lookup_cracked(hash_file, username)
+        if found is None:
+            return False
+        self.log_output("Hash already cracked in an earlier session (potfile); not launching hashcat.", is_password=True)
+        self._report_password(target_file, found[1])
+        return True
     
     def prompt_pdf_bruteforce_options(self):
         """Display a dialog for PDF-specific bruteforce settings"""
@@ -2283,7 +2688,7 @@ class PasswordCrackerApp:
         dialog.title("PDF Bruteforce Settings")
         
         # Set a fixed size with reasonable dimensions
-        dialog.geometry("450x600")
+        dialog.geometry("450x730")
         dialog.resizable(False, False)
         
         # Apply theme
@@ -2298,7 +2703,11 @@ class PasswordCrackerApp:
         use_lower_var = tk.BooleanVar(value=False)
         use_upper_var = tk.BooleanVar(value=False)
         use_special_var = tk.BooleanVar(value=False)
-        library_var = tk.StringVar(value=AVAILABLE_LIBRARIES[0][0] if AVAILABLE_LIBRARIES else "")
+        libraries = available_libraries()
+        library_var = tk.StringVar(value="auto" if libraries else "")
+        workers_var = tk.IntVar(value=os.cpu_count() or 1)
+        mask_var = tk.StringVar()
+        target_var = tk.StringVar(value="user")
         
         # Main content frame with ttk styling
         main_frame = ttk.Frame(dialog, padding=(15, 10))
@@ -2363,18 +2772,48 @@ class PasswordCrackerApp:
         ttk.Checkbutton(custom_frame, text="Symbols (!@#$...)", 
                        variable=use_special_var).grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
         
+        # Hashcat-style mask or .hcmask file (e.g. masks/rockyou-1-60.hcmask)
+        ttk.Radiobutton(charset_frame, text="Mask (e.g. ?u?l?l?l?d?d or .hcmask file):", 
+                       variable=charset_var, value="mask").pack(anchor=tk.W, padx=10, pady=(8, 2))
+        mask_frame = ttk.Frame(charset_frame, padding=(20, 0, 0, 0))
+        mask_frame.pack(fill=tk.X, pady=2)
+        ttk.Entry(mask_frame, textvariable=mask_var, width=30).pack(side=tk.LEFT, padx=5)
+        
+        def browse_mask_file():
+            filename = filedialog.askopenfilename(
+                title="Select Mask File",
+                initialdir=os.path.join(os.path.dirname(os.path.abspath(__file__)), "masks"),
+                filetypes=[("Hashcat Masks", "*.hcmask"), ("All Files", "*.*")]
+            )
+            if filename:
+                mask_var.set(filename)
+                charset_var.set("mask")
+        
+        ttk.Button(mask_frame, text="Browse", command=browse_mask_file).pack(side=tk.LEFT, padx=5)
+        
         # Library section with ttk styling
         library_frame = ttk.LabelFrame(main_frame, text="PDF Library", padding=(10, 5))
         library_frame.pack(fill=tk.X, pady=8)
         
         # Create combobox for library selection
-        if AVAILABLE_LIBRARIES:
+        if libraries:
             ttk.Label(library_frame, text="Select library:").pack(anchor=tk.W, padx=10, pady=2)
             library_combo = ttk.Combobox(library_frame, textvariable=library_var, 
-                                       values=[lib for lib, _ in AVAILABLE_LIBRARIES],
+                                       values=["auto"] + [lib for lib, _ in libraries],
                                        state="readonly", width=30)
             library_combo.pack(anchor=tk.W, padx=10, pady=2)
             library_combo.current(0)
+            
+            # Worker processes each test a contiguous slice of the keyspace
+            workers_frame = ttk.Frame(library_frame)
+            workers_frame.pack(fill=tk.X, padx=10, pady=3)
+            ttk.Label(workers_frame, text="Worker processes:").grid(row=0, column=0, sticky=tk.W)
+            ttk.Spinbox(workers_frame, from_=1, to=max(64, os.cpu_count() or 1), textvariable=workers_var, width=5).grid(row=0, column=1, sticky=tk.W, padx=5)
+            
+            # Owner password recovery needs the native verifier
+            ttk.Label(workers_frame, text="Recover password:").grid(row=1, column=0, sticky=tk.W, pady=(3, 0))
+            ttk.Combobox(workers_frame, textvariable=target_var, values=["user", "owner", "both"],
+                        state="readonly", width=8).grid(row=1, column=1, sticky=tk.W, padx=5, pady=(3, 0))
         else:
             ttk.Label(library_frame, text="No PDF libraries available", 
                     foreground="red").pack(padx=10, pady=5)
@@ -2422,12 +2861,23 @@ class PasswordCrackerApp:
                     
                 charset = custom_charset
             
+            mask = None
+            if charset == "mask":
+                mask = mask_var.get().strip()
+                if not mask:
+                    messagebox.showerror("Error", "Please enter a mask or select an .hcmask file")
+                    return
+                charset = "digits"
+            
             # Construct options
             options = {
                 'min_length': min_len,
                 'max_length': max_len,
                 'charset': charset,
+                'mask': mask,
                 'library': library_var.get(),
+                'workers': workers_var.get(),
+                'target': target_var.get(),
                 'save_progress': True,
                 'show_progress_every': 1000
             }
@@ -2500,6 +2950,11 @@ class PasswordCrackerApp:
         
         self.log_output(f"Using hash type: {selected_hash_type} (Hashcat mode: {hash_mode})")
         
+        # Dumps with several accounts (pwdump, secretsdump, Responder logs) are cracked in one session
+        if os.path.isfile(target_file) and self._crack_hash_batch(target_file, hash_mode, selected_hash_type,
+                                                                  is_bruteforce, ntlm_hashes_dir):
+            return
+        
         # Read the hash content
         if os.path.exists(target_file):
             # Read hash content from file
@@ -2625,13 +3080,11 @@ class PasswordCrackerApp:
             f.write(hash_content)
             
         self.log_output(f"Processed hash saved to {hash_file}")
+        if self._report_if_already_cracked(target_file, hash_file):
+            return
         
         # Set up the hashcat command
-        command = [self.hashcat_path if os.path.dirname(self.hashcat_path)
-                   else ("hashcat.exe" if sys.platform=="win32" else "hashcat")]
-        
-        # Define use_pipe variable
-        use_pipe = False
+        command = [self._hashcat_executable()]
         
         if is_bruteforce:
             # Use bruteforce attack (attack mode 3) with a mask
@@ -2650,9 +3103,6 @@ class PasswordCrackerApp:
             command.extend(["-m", hash_mode, "-a", "3", hash_file, mask, "--increment"])
             
             self.log_output(f"Using bruteforce with mask: {mask} (max length: {max_length}, character sets: {', '.join(char_sets)})", "info")
-            
-            # For bruteforce, use stdin pipe for possible interactive use
-            use_pipe = True
         else:
             # Validate wordlist path
             if not self.password_list_path.get():
@@ -2676,108 +3126,132 @@ class PasswordCrackerApp:
         
         if "--force" not in command:
             command.append("--force")
-            
-        self.log_output(f"Executing command: {' '.join(command)}")
-        hashcat_dir = os.path.dirname(self.hashcat_path) if os.path.dirname(self.hashcat_path) else None
-        
-        # Variable to track if a password was found
-        found_password = None
+        job = self.hashcat_sessions.create("hash", target_file, hash_mode, hash_file, outfile_path, command[1:],
+                                           f"{selected_hash_type} {'bruteforce' if is_bruteforce else 'dictionary'}")
         
         try:
-            if use_pipe:
-                self.cracking_process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, 
-                                                       stdin=subprocess.PIPE, text=True, bufsize=1, cwd=hashcat_dir)
-            else:
-                self.cracking_process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, 
-                                                       text=True, bufsize=1, cwd=hashcat_dir)
-            
-            # Process and display hashcat output
-            for line in iter(self.cracking_process.stdout.readline, ''):
-                if not self.is_cracking:  # If process was stopped by user
-                    break
-                    
-                self.log_output(line.strip())
-                
-                # Check for potfile message
-                if "All hashes found as potfile" in line:
-                    self.log_output("Hash already cracked, checking potfile for password...", is_password=True)
-                    # Get the password from the potfile
-                    self._get_password_from_potfile(hash_file, selected_hash_type)
-                    return
-                
-                # Look for password in the output
-                if "Plain.Text." in line and ":" in line:
-                    try:
-                        # Extract the password part which comes after the colon in the Plain.Text section
-                        parts = line.split("Plain.Text.", 1)[1].split(":", 1)
-                        if len(parts) >= 2:
-                            found_password = parts[1].strip()
-                    except Exception:
-                        # Fallback if the splitting fails
-                        if ":" in line:
-                            found_password = line.split(":", 1)[1].strip()
-            
-            # Wait for process to complete if still cracking
-            if self.is_cracking:
-                self.cracking_process.wait()
-                
-                # If we detected a cracked password directly from the output, report it
-                if found_password:
-                    self.log_output("Password cracking completed successfully!", is_password=True)
-                    self.log_output(f"PASSWORD FOUND: {found_password}", is_password=True)
-                    self._save_cracked_password(target_file, found_password)
-                    # Show success message box
-                    messagebox.showinfo("Success!", f"Password found: {found_password}")
-                    return
-                
-                # If no password was detected in real-time, let's check if one was created
-                # Sometimes hashcat finds a password but doesn't show it clearly in the output
-                outfile_path = os.path.join(ntlm_hashes_dir, f"{os.path.splitext(target_filename)[0]}_cracked.txt")
-                self.log_output("Checking for password in output files...")
-                
-                # Check if the outfile contains a password
-                if os.path.exists(outfile_path) and os.path.getsize(outfile_path) > 0:
-                    try:
-                        with open(outfile_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read().strip()
-                            if content and ":" in content:
-                                # For NetNTLMv2, the password is at the end after the last colon
-                                password = content.split(":")[-1].strip()
-                                if password:
-                                    self.log_output("Password cracking completed successfully!", is_password=True)
-                                    self.log_output(f"PASSWORD FOUND: {password}", is_password=True)
-                                    self._save_cracked_password(target_file, password)
-                                    # Show success message box
-                                    messagebox.showinfo("Success!", f"Password found: {password}")
-                                    return
-                    except Exception as e:
-                        self.log_output(f"Error reading output file: {str(e)}")
-                
-                # As a final check, run hashcat with --show to see if it finds anything in the potfile
-                show_cmd = [self.hashcat_path, "-m", hash_mode, "--show", hash_file]
-                self.log_output(f"Running final check with command: {' '.join(show_cmd)}")
-                try:
-                    show_result = subprocess.run(show_cmd, capture_output=True, text=True)
-                    output = show_result.stdout.strip()
-                    if output:
-                        # Process based on hash type
-                        if selected_hash_type in ["NetNTLMv2", "NTLMv2"] and ":" in output:
-                            password = output.split(":")[-1].strip()
-                            self.log_output("Password cracking completed successfully!", is_password=True)
-                            self.log_output(f"PASSWORD FOUND: {password}", is_password=True)
-                            self._save_cracked_password(target_file, password)
-                            # Show success message box
-                            messagebox.showinfo("Success!", f"Password found: {password}")
-                            return
-                except Exception as e:
-                    self.log_output(f"Error running show command: {str(e)}")
-                
-                # If we get here, no password was found
-                self.log_output("Password not found or could not be detected.", is_password=True)
+            # Report results only if the run was not stopped; progress is shown by the dashboard
+            if self._run_hashcat_job(job) is not None:
+                # The outfile and potfile (hashes cracked in earlier sessions) are both indexed
+                self._report_hashcat_job(job)
         except Exception as e:
             self.log_output(f"Error executing hashcat command: {str(e)}")
             self.log_output("Command that failed: " + " ".join(command))
     
+    def _crack_hash_batch(self, target_file, hash_mode, selected_hash_type, is_bruteforce, ntlm_hashes_dir):
+        """Crack every account of a credential dump in one hashcat session.
+        
+        The dump is read once: each distinct hash goes to the hash file (identical NT
+        hashes are cracked once) and each account to a user/hash map that the results
+        are matched against. Returns False, leaving the dump to the single-hash path,
+        when it holds fewer than two accounts of the selected type.
+        """
+        stem = os.path.splitext(os.path.basename(target_file))[0]
+        hash_file = os.path.join(ntlm_hashes_dir, f"{stem}_batch.txt")
+        accounts_file = os.path.join(ntlm_hashes_dir, f"{stem}_accounts.tsv")
+        index = self._refresh_potfile_index()
+        accounts, distinct, remaining, skipped = write_hash_batch(target_file, hash_mode, hash_file, accounts_file,
+                                                                  known=index.lookup)
+        if accounts < 2:
+            for path in (hash_file, accounts_file):
+                os.remove(path)
+            return False
+        
+        self.log_output(f"Parsed {accounts} {selected_hash_type} accounts with {distinct} distinct hashes from {target_file}")
+        for other_mode, count in sorted(skipped.items()):
+            self.log_output(f"Skipped {count} accounts with hashcat mode {other_mode} hashes; "
+                            f"select their hash type to crack them")
+        if remaining < distinct:
+            self.log_output(f"{distinct - remaining} hashes were already cracked in earlier sessions (potfile)")
+        
+        if remaining == 0:
+            self.log_output("All hashes were already cracked; not launching hashcat.", is_password=True)
+            self._report_hash_batch(target_file, hash_file)
+            return True
+        
+        if is_bruteforce:
+            attack_args = ["-a", "3", hash_file, self.get_bruteforce_mask(), "--increment"]
+        elif not self.password_list_path.get() or not os.path.exists(self.password_list_path.get()):
+            self.log_output(f"Error: Selected wordlist not found: {self.password_list_path.get()}")
+            messagebox.showerror("Error", "Please select a wordlist for dictionary attack.")
+            return True
+        else:
+            attack_args = ["-a", "0", hash_file, self.password_list_path.get()]
+        outfile_path = os.path.join(ntlm_hashes_dir, f"{stem}_cracked.txt").replace('\\', '/')
+        job = self.hashcat_sessions.create("hash-batch", target_file, hash_mode, hash_file, outfile_path,
+                                           ["-m", hash_mode] + attack_args + ["--outfile", outfile_path, "--force"],
+                                           f"{selected_hash_type} {accounts} accounts")
+        try:
+            if self._run_hashcat_job(job) is not None:
+                self._report_hash_batch(job.target, job.hash_file)
+        except Exception as e:
+            self.log_output(f"Error executing hashcat command: {str(e)}")
+        return True
+    
+    def _report_hash_batch(self, target_file, hash_file):
+        """Match the cracked hashes of a batch back to its accounts and show them in a results grid"""
+        stem = hash_file[:-len("_batch.txt")]
+        index = self._refresh_potfile_index()
+        accounts = list(read_hash_accounts(stem + "_accounts.tsv"))
+        shared = {}
+        for _, hash_text in accounts:
+            shared[hash_text] = shared.get(hash_text, 0) + 1
+        rows = []
+        results_file = stem + "_passwords.txt"
+        with open(results_file, 'w', encoding='utf-8') as f:
+            for user, hash_text in accounts:
+                password = index.lookup(hash_text)
+                if password is not None:
+                    f.write(f"{user}:{password}\n")
+                    password = password or "(empty)"
+                rows.append((user, hash_text, password or "", shared[hash_text]))
+        cracked = sum(1 for row in rows if row[2])
+        self.log_output(f"Cracked {cracked} of {len(rows)} accounts; user:password list saved to {results_file}",
+                        is_password=True)
+        self.root.after(0, self._show_hash_batch_results, os.path.basename(target_file), rows)
+    
+    def _show_hash_batch_results(self, title, rows):
+        """Sortable grid of user, hash, password and how many accounts share the hash"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title(f"Hash Results - {title}")
+        dialog.geometry("900x500")
+        dialog.configure(bg='#2E2E2E' if self.is_dark_mode.get() else '#F0F0F0')
+        
+        frame = ttk.Frame(dialog, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        cracked = sum(1 for row in rows if row[2])
+        ttk.Label(frame, text=f"{cracked} of {len(rows)} accounts cracked").pack(anchor=tk.W, pady=(0, 5))
+        
+        # Packed before the grid so the expanding grid cannot push it out of the window
+        ttk.Button(frame, text="Close", command=dialog.destroy, width=12).pack(side=tk.BOTTOM, anchor=tk.E, pady=(10, 0))
+        grid_frame = ttk.Frame(frame)
+        grid_frame.pack(fill=tk.BOTH, expand=True)
+        columns = ("user", "hash", "password", "shared")
+        headings = {"user": "User", "hash": "Hash", "password": "Password", "shared": "Accounts with hash"}
+        grid = ttk.Treeview(grid_frame, columns=columns, show="headings")
+        scrollbar = ttk.Scrollbar(grid_frame, orient=tk.VERTICAL, command=grid.yview)
+        grid.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        grid.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        def sort_by(column, descending):
+            position = columns.index(column)
+            ordered = sorted(rows, key=lambda row: row[position], reverse=descending)
+            if column == "password":
+                ordered.sort(key=lambda row: row[2] == "")  # Uncracked accounts last in either order
+            grid.delete(*grid.get_children())
+            for row in ordered:
+                grid.insert("", tk.END, values=row)
+            grid.heading(column, command=lambda: sort_by(column, not descending))
+        
+        for column in columns:
+            grid.heading(column, text=headings[column], command=lambda c=column: sort_by(c, False))
+        grid.column("user", width=200)
+        grid.column("hash", width=360)
+        grid.column("password", width=200)
+        grid.column("shared", width=120, anchor=tk.E)
+        sort_by("password", False)
+    
     def _save_cracked_password(self, target_file, password):
         try:
             save_path = os.path.join(os.path.dirname(target_file), "cracked_password.txt")
@@ -2789,13 +3263,46 @@ class PasswordCrackerApp:
             return password  # Still return the password even if saving fails
     
     def log_output(self, message, is_password=False):
-        if self.output_text:
-            if is_password:
-                self.output_text.insert(tk.END, message + "\n", "password_found")
-            else:
-                self.output_text.insert(tk.END, message + "\n")
-            self.output_text.see(tk.END)
-            self.root.update_idletasks()
+        """Queue a line for the output log; safe to call from any thread"""
+        self.log_queue.put((str(message), is_password))
+
+    def _drain_log_queue(self, reschedule=True):
+        """Move queued log lines into the spool file and the output view (Tk thread only)"""
+        batch = []
+        try:
+            while True:
+                batch.append(self.log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        
+        if batch:
+            if self.console_history:
+                try:
+                    self.console_history.write("".join(message + "\n" for message, _ in batch))
+                except Exception as e:
+                    print(f"Output history disabled: {e}")
+                    self.console_history = None
+            
+            # Lines the view would trim right away are not inserted at all
+            batch = batch[-LOG_VIEW_LINES:]
+            follow = self.output_text.yview()[1] >= 0.999  # Only auto-scroll when at the bottom
+            # One insert per run of lines with the same tag
+            start = 0
+            for end in range(1, len(batch) + 1):
+                if end == len(batch) or batch[end][1] != batch[start][1]:
+                    text = "\n".join(message for message, _ in batch[start:end]) + "\n"
+                    self.output_text.insert(tk.END, text, ("password_found",) if batch[start][1] else ())
+                    start = end
+            
+            # Keep the view a bounded ring buffer
+            lines = int(self.output_text.index('end-1c').split('.')[0]) - 1  # Complete lines
+            if lines > LOG_VIEW_LINES:
+                self.output_text.delete('1.0', f"{lines - LOG_VIEW_LINES + 1}.0")
+            if follow:
+                self.output_text.see(tk.END)
+        
+        if reschedule:
+            self.root.after(LOG_DRAIN_INTERVAL, self._drain_log_queue)
 
     def _on_office_attack_type_changed(self, event=None):
         """Handle when office attack type changes between dictionary and bruteforce"""
@@ -2910,14 +3417,85 @@ class PasswordCrackerApp:
         self.root.update_idletasks()
 
     def clear_output(self):
-        """Clear the output text area"""
+        """Clear the output text area and start a new history"""
         if self.output_text:
+            self._drain_log_queue(reschedule=False)
             self.output_text.delete(1.0, tk.END)
+            if self.console_history:
+                self.console_history.clear()
             self.log_output("Output cleared")
 
+    def search_output(self):
+        """Search the on-disk output history in a background thread and list the matching lines"""
+        text = self.output_search_var.get().strip()
+        if not text:
+            return
+        if self.console_history is None:
+            messagebox.showinfo("Search", "The output history is not available.")
+            return
+        self._drain_log_queue(reschedule=False)
+        # Flushed on the Tk thread, which is the only one writing to the segment files
+        paths = self.console_history.files()
+        
+        def run_search():
+            try:
+                matches = ConsoleHistory.search(text, paths)
+                self.root.after(0, lambda: self._show_search_results(text, matches))
+            except Exception as e:
+                self.log_output(f"Error searching output: {str(e)}")
+        
+        thread = threading.Thread(target=run_search)
+        thread.daemon = True
+        thread.start()
+
+    def _show_search_results(self, text, matches):
+        """List search matches; double-clicking one scrolls to it when it is still on screen"""
+        if not matches:
+            messagebox.showinfo("Search", f"No output lines contain '{text}'.")
+            return
+        
+        dialog = tk.Toplevel(self.root)
+        limited = f" (first {LOG_SEARCH_LIMIT})" if len(matches) >= LOG_SEARCH_LIMIT else ""
+        dialog.title(f"Search: {text} - {len(matches)} match(es){limited}")
+        dialog.transient(self.root)
+        
+        frame = ttk.Frame(dialog, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        results = tk.Listbox(frame, width=110, height=20)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=results.yview)
+        results.config(yscrollcommand=scrollbar.set)
+        results.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        for line_number, line in matches:
+            results.insert(tk.END, f"{line_number:>8}: {line}")
+        
+        def show_match(event=None):
+            selection = results.curselection()
+            if not selection:
+                return
+            line_number = matches[selection[0]][0]
+            # The view holds the last lines of the history
+            view_lines = int(self.output_text.index('end-1c').split('.')[0]) - 1
+            first_shown = self.console_history.line_count - view_lines + 1
+            if line_number < first_shown:
+                messagebox.showinfo("Search", f"Line {line_number} is older than the lines on screen. "
+                                              "Use Save Output to get the full history.", parent=dialog)
+                return
+            index = f"{line_number - first_shown + 1}.0"
+            self.output_text.tag_remove("search_hit", "1.0", tk.END)
+            self.output_text.tag_add("search_hit", index, f"{index} lineend")
+            self.output_text.see(index)
+        
+        results.bind("<Double-Button-1>", show_match)
+
     def save_output(self):
-        """Save the output text to a file"""
-        if not self.output_text or not self.output_text.get(1.0, tk.END).strip():
+        """Save the full output history (not just the visible lines) to a file"""
+        self._drain_log_queue(reschedule=False)
+        if self.console_history is None:
+            has_output = bool(self.output_text.get(1.0, tk.END).strip())
+        else:
+            has_output = self.console_history.line_count > 0
+        if not has_output:
             messagebox.showinfo("Info", "No output to save")
             return
         
@@ -2942,9 +3520,12 @@ class PasswordCrackerApp:
             if not filepath:
                 return  # User cancelled
             
-            # Save the output text
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(self.output_text.get(1.0, tk.END))
+            # Stream the history from disk; without one, only the visible lines can be saved
+            if self.console_history:
+                self.console_history.save_to(filepath)
+            else:
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    f.write(self.output_text.get(1.0, tk.END))
             
             self.log_output(f"Output saved to: {filepath}")
             messagebox.showinfo("Success", f"Output saved to:\n{filepath}")
@@ -3278,6 +3859,7 @@ class PasswordCrackerApp:
         
         try:
             # Create SSH client
+            import paramiko
             client = paramiko.SSHClient()
             client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
             
@@ -3471,6 +4053,90 @@ class PasswordCrackerApp:
         else:
             self.log_output("No active cracking process to send status command to.")
 
+    def prompt_resume_hashcat_job(self):
+        """Let the user pick an interrupted hashcat job and continue it from its restore file"""
+        if self.is_cracking:
+            messagebox.showinfo("Resume", "Stop the current attack before resuming another one.")
+            return
+        jobs = self.hashcat_sessions.resumable()
+        if not jobs:
+            messagebox.showinfo("Resume", "There are no interrupted hashcat jobs to resume.")
+            return
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Resume Hashcat Job")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        if self.is_dark_mode.get():
+            dialog.configure(bg='#2E2E2E')
+        else:
+            dialog.configure(bg='#F0F0F0')
+        
+        frame = ttk.Frame(dialog, padding=15)
+        frame.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(frame, text="Interrupted jobs (most recent first):").pack(anchor=tk.W, pady=(0, 5))
+        job_list = tk.Listbox(frame, width=100, height=min(len(jobs), 12), exportselection=False)
+        job_list.pack(fill=tk.BOTH, expand=True)
+        for job in jobs:
+            job_list.insert(tk.END, job.label())
+        job_list.selection_set(0)
+        
+        def selected_job():
+            selection = job_list.curselection()
+            return jobs[selection[0]] if selection else None
+        
+        def on_resume():
+            job = selected_job()
+            if job is None:
+                return
+            dialog.destroy()
+            if not self.hashcat_path and not self.check_hashcat():
+                messagebox.showerror("Error", "Hashcat is required but not installed")
+                return
+            self.is_cracking = True
+            self.update_crack_buttons("Stop Cracking")
+            thread = threading.Thread(target=self._resume_hashcat_job, args=(job,))
+            thread.daemon = True
+            thread.start()
+        
+        def on_delete():
+            job = selected_job()
+            if job is None or not messagebox.askyesno("Delete Job", f"Delete {job.session} and its restore file?", parent=dialog):
+                return
+            self.hashcat_sessions.delete(job)
+            index = jobs.index(job)
+            jobs.pop(index)
+            job_list.delete(index)
+            if not jobs:
+                dialog.destroy()
+            else:
+                job_list.selection_set(min(index, len(jobs) - 1))
+        
+        button_frame = ttk.Frame(frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(button_frame, text="Resume", command=on_resume, width=12).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Delete", command=on_delete, width=12).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=dialog.destroy, width=12).pack(side=tk.RIGHT, padx=5)
+        job_list.bind("<Double-Button-1>", lambda event: on_resume())
+        self.root.wait_window(dialog)
+
+    def _resume_hashcat_job(self, job):
+        """Continue a hashcat job with --restore and report its result (runs in a worker thread)"""
+        try:
+            self.log_output(f"Resuming hashcat session {job.session} ({job.label()})")
+            if self._run_hashcat_job(job, restore=True) is not None:
+                if job.kind == "hash-batch":
+                    self._report_hash_batch(job.target, job.hash_file)
+                else:
+                    self._report_hashcat_job(job)
+        except Exception as e:
+            self.log_output(f"Error resuming hashcat session: {str(e)}")
+        finally:
+            if self.is_cracking:
+                self.is_cracking = False
+                self.cracking_process = None
+                self.root.after(0, lambda: self.update_crack_buttons("Start Cracking"))
+
     def find_default_dictionaries(self):
         """Find dictionaries in common locations"""
         # Get our standard dictionary directory first
@@ -3509,56 +4175,6 @@ class PasswordCrackerApp:
         # Save the found dictionaries
         self.save_dictionaries()
 
-    def _get_password_from_potfile(self, hash_file, hash_type):
-        """Get the password from the potfile by running hashcat with --show"""
-        try:
-            # First check if there's a cracked_password.txt file
-            outfile_path = hash_file.replace("_processed.txt", "_cracked.txt")
-            if os.path.exists(outfile_path):
-                with open(outfile_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read().strip()
-                    if content:
-                        # For NetNTLMv2, the password is at the end after the last colon
-                        if hash_type in ["NetNTLMv2", "NTLMv2"] and ":" in content:
-                            password = content.split(":")[-1].strip()
-                            self.log_output(f"PASSWORD FOUND: {password}", is_password=True)
-                            self._save_cracked_password(hash_file, password)
-                            # Show success message box
-                            messagebox.showinfo("Success!", f"Password found: {password}")
-                            return True
-            
-            # If no cracked_password.txt or couldn't parse it, try running hashcat --show
-            hash_mode = "5600" if hash_type in ["NetNTLMv2", "NTLMv2"] else "1000"
-            command = [self.hashcat_path, "-m", hash_mode, "--show", hash_file]
-            self.log_output(f"Running command to get password: {' '.join(command)}")
-            
-            show_result = subprocess.run(command, capture_output=True, text=True)
-            output = show_result.stdout.strip()
-            
-            if output:
-                # For NetNTLMv2, the password is at the end after the last colon
-                if hash_type in ["NetNTLMv2", "NTLMv2"] and ":" in output:
-                    password = output.split(":")[-1].strip()
-                    self.log_output(f"PASSWORD FOUND: {password}", is_password=True)
-                    self._save_cracked_password(hash_file, password)
-                    # Show success message box
-                    messagebox.showinfo("Success!", f"Password found: {password}")
-                    return True
-                # For regular NTLM, try to extract password
-                elif ":" in output:
-                    password = output.split(":", 1)[1].strip()
-                    self.log_output(f"PASSWORD FOUND: {password}", is_password=True)
-                    self._save_cracked_password(hash_file, password)
-                    # Show success message box
-                    messagebox.showinfo("Success!", f"Password found: {password}")
-                    return True
-            
-            self.log_output("Could not retrieve password from potfile.", is_password=True)
-            return False
-        except Exception as e:
-            self.log_output(f"Error getting password from potfile: {str(e)}")
-            return False
-
 def create_splash_screen(root):
     """Create and show a splash screen"""
     splash = tk.Toplevel(root)
@@ -3579,6 +4195,7 @@ def create_splash_screen(root):
         # Load the splash image
         splash_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "p4wnForgeSplash.webp")
         if os.path.exists(splash_path):
+            from PIL import Image, ImageTk
             img = Image.open(splash_path)
             img = img.resize((splash_width, splash_height), Image.LANCZOS)
             splash_img = ImageTk.PhotoImage(img)
@@ -6,7 +6,8 @@ This script attempts multiple methods to extract password hashes from PDFs
 for use with password cracking tools like hashcat and John the Ripper.
 
 Usage:
-    python robust_pdf_extract.py <pdf_file>
+    python pdf2hash.py <pdf_file>
+    python pdf2hash.py --batch <dir_or_file> [...] [-o hashes.txt] [--manifest manifest.jsonl] [--workers N]
 """
 
 import sys
@@ -17,6 +18,19 @@ import struct
 import subprocess
 import tempfile
 import base64
+import json
+import time
+import argparse
+import multiprocessing
+import mmap
+from collections import namedtuple
+from functools import lru_cache
+
+# The cross-reference parser from pdfbrute gives exact hashes; the pattern scans below are fallbacks
+try:
+    from pdfbrute import StandardSecurityHandler, format_pdf_hash
+except ImportError:
+    StandardSecurityHandler = format_pdf_hash = None
 
 def run_command(cmd):
     """Run a command and return output"""
@@ -76,33 +90,98 @@ def hex_to_binary(hex_string):
     except:
         return hex_string.encode('latin1')
 
+def extract_with_xref_parser(filename):
+    """Build exact hashcat and John hashes from the trailer's /Encrypt dictionary.
+
+    Reads the file through its cross-reference data (tables, xref streams and
+    object streams, newest incremental update first), so only a few small
+    reads are needed even for very large files. Supports revisions 2-6.
+    """
+    if format_pdf_hash is None:
+        return None
+    try:
+        mode, hash_str = format_pdf_hash(*StandardSecurityHandler.read_encryption(filename))
+    except Exception as e:
+        sys.stderr.write(f"Error in cross-reference parsing: {e}\n")
+        return None
+    return [
+        ("hashcat", hash_str, mode),
+        ("john", f"{os.path.basename(filename)}:{hash_str}", None)
+    ]
+
+# Values the pattern-based fallbacks need, found by one tail-first scan of the file
+PDFScan = namedtuple('PDFScan', 'is_pdf o_value u_value r_value p_value id_value hex_strings')
+
+O_PATTERN = re.compile(rb'/O\s*[<(]([^>)]+)[>)]')
+U_PATTERN = re.compile(rb'/U\s*[<(]([^>)]+)[>)]')
+R_PATTERN = re.compile(rb'/R\s+(\d+)')
+P_PATTERN = re.compile(rb'/P\s+(-?\d+)')
+ID_PATTERN = re.compile(rb'/ID\s*\[\s*<([^>]+)>')
+HEX_PATTERN = re.compile(rb'<([0-9a-fA-F]{32,})>')
+
+def _nearest_match(pattern, data, start, end, anchor):
+    """The match of pattern in data[start:end] closest to anchor (or the last one without an anchor)"""
+    best = None
+    for match in pattern.finditer(data, start, end):
+        if best is None or anchor is None or abs(match.start() - anchor) <= abs(best.start() - anchor):
+            best = match
+    return best.group(1) if best else None
+
+@lru_cache(maxsize=16)
+def scan_pdf_file(filename):
+    """Memory-map a PDF once and search it from the end for the encryption values.
+
+    The trailer and (usually) the /Encrypt dictionary sit at the end of the
+    file, so the search starts with the last 64 KB and only widens the window,
+    eight times at a time, while /O and /U are missing. /R and /P are taken
+    from the matches closest to /U, i.e. from the same dictionary. Returns a
+    PDFScan shared by all pattern-based methods, or None for empty or
+    unreadable files.
+    """
+    try:
+        with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            window = 65536
+            while True:
+                start = max(0, size - window)
+                u_match = None
+                for u_match in U_PATTERN.finditer(data, start, size):
+                    pass
+                if (u_match and O_PATTERN.search(data, start, size)) or start == 0:
+                    break
+                window *= 8
+
+            anchor = u_match.start() if u_match else None
+            hex_strings = []
+            for match in HEX_PATTERN.finditer(data, start, size):
+                hex_strings.append(match.group(1))
+                if len(hex_strings) == 2:
+                    break
+            return PDFScan(
+                is_pdf=data[:5] == b'%PDF-',
+                o_value=_nearest_match(O_PATTERN, data, start, size, anchor),
+                u_value=u_match.group(1) if u_match else None,
+                r_value=_nearest_match(R_PATTERN, data, start, size, anchor),
+                p_value=_nearest_match(P_PATTERN, data, start, size, anchor),
+                id_value=_nearest_match(ID_PATTERN, data, start, size, None),
+                hex_strings=hex_strings
+            )
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"Error scanning {filename}: {e}\n")
+        return None
+
 def scan_for_password_patterns(filename):
     """Scan file for patterns that look like password hashes"""
     try:
-        with open(filename, 'rb') as f:
-            data = f.read()
-        
-        # Look for O and U values across the file
-        o_patterns = re.findall(rb'/O\s*[<(]([^>)]+)[>)]', data)
-        u_patterns = re.findall(rb'/U\s*[<(]([^>)]+)[>)]', data)
-        
-        if not (o_patterns and u_patterns):
+        scan = scan_pdf_file(filename)
+        if not (scan and scan.o_value and scan.u_value):
             return None
         
-        o_value = o_patterns[0]
-        u_value = u_patterns[0]
-        
-        # Look for revision
-        r_patterns = re.findall(rb'/R\s+(\d+)', data)
-        r_value = int(r_patterns[0]) if r_patterns else 4  # Default to 4
-        
-        # Look for permissions
-        p_patterns = re.findall(rb'/P\s+(-?\d+)', data)
-        p_value = int(p_patterns[0]) if p_patterns else -1
-        
-        # Look for ID
-        id_patterns = re.findall(rb'/ID\s*\[\s*<([^>]+)>', data)
-        id_value = id_patterns[0] if id_patterns else None
+        o_value = scan.o_value
+        u_value = scan.u_value
+        r_value = int(scan.r_value) if scan.r_value else 4  # Default to 4
+        p_value = int(scan.p_value) if scan.p_value else -1
+        id_value = scan.id_value
         
         # Convert values to hex
         try:
@@ -164,29 +243,22 @@ def create_test_pdf_hashes():
 def generic_pdf_hash(filename):
     """Generate a generic PDF hash by scanning the file"""
     try:
-        with open(filename, 'rb') as f:
-            data = f.read()
+        scan = scan_pdf_file(filename)
         
         # Simple check if it's a PDF
-        if not data.startswith(b'%PDF-'):
+        if not (scan and scan.is_pdf):
             return None
         
-        # Find all hex strings that could be hashes
-        hex_strings = re.findall(rb'<([0-9a-fA-F]{32,})>', data)
-        if len(hex_strings) < 2:
+        # Hex strings that could be hashes
+        if len(scan.hex_strings) < 2:
             return None
         
-        # Find things that look like /R values
-        r_matches = re.findall(rb'/R\s+(\d+)', data)
-        r_value = int(r_matches[0]) if r_matches else 4
-        
-        # Find things that look like /P values
-        p_matches = re.findall(rb'/P\s+(-?\d+)', data)
-        p_value = int(p_matches[0]) if p_matches else -1
+        r_value = int(scan.r_value) if scan.r_value else 4
+        p_value = int(scan.p_value) if scan.p_value else -1
         
         # Use the first two hex strings as U and O
-        u_hex = binascii.hexlify(hex_to_binary(hex_strings[0])).decode()
-        o_hex = binascii.hexlify(hex_to_binary(hex_strings[1])).decode()
+        u_hex = binascii.hexlify(hex_to_binary(scan.hex_strings[0])).decode()
+        o_hex = binascii.hexlify(hex_to_binary(scan.hex_strings[1])).decode()
         
         # Format for different tools
         if r_value <= 3:
@@ -205,30 +277,25 @@ def generic_pdf_hash(filename):
 def format_as_john_traditional(filename):
     """Format hash in traditional John format"""
     try:
-        with open(filename, 'rb') as f:
-            data = f.read()
+        scan = scan_pdf_file(filename)
         
-        # Find potential O and U values
-        o_match = re.search(rb'/O\s*[<(]([^>)]+)[>)]', data)
-        u_match = re.search(rb'/U\s*[<(]([^>)]+)[>)]', data)
-        
-        if not (o_match and u_match):
+        # Potential O and U values
+        if not (scan and scan.o_value and scan.u_value):
             return None
         
         try:
-            o_value = hex_to_binary(o_match.group(1))
-            u_value = hex_to_binary(u_match.group(1))
+            o_value = hex_to_binary(scan.o_value)
+            u_value = hex_to_binary(scan.u_value)
         except:
-            o_value = o_match.group(1)
-            u_value = u_match.group(1)
+            o_value = scan.o_value
+            u_value = scan.u_value
         
         # Convert to hex
         o_hex = binascii.hexlify(o_value).decode() if isinstance(o_value, bytes) else o_value
         u_hex = binascii.hexlify(u_value).decode() if isinstance(u_value, bytes) else u_value
         
         # Find revision
-        r_match = re.search(rb'/R\s+(\d+)', data)
-        r_value = int(r_match.group(1)) if r_match else 3
+        r_value = int(scan.r_value) if scan.r_value else 3
         
         # Create the hash
         john_hash = f"{os.path.basename(filename)}:$pdf${r_value}*{o_hex}*{u_hex}"
@@ -240,24 +307,131 @@ def format_as_john_traditional(filename):
 def try_all_extraction_methods(filename):
     """Try all extraction methods to get a hash"""
     methods = [
+        extract_with_xref_parser,
         scan_for_password_patterns,
         generic_pdf_hash
     ]
     
-    results = []
+    # Methods are ordered by accuracy; the guesses of later ones only help if earlier ones fail
     for method in methods:
         result = method(filename)
         if result:
-            results.extend(result) if isinstance(result, list) else results.append(result)
+            return result if isinstance(result, list) else [result]
     
-    return results
+    return []
+
+def sniff_encrypted_pdf(filename, head_size=1024, tail_size=65536):
+    """Cheaply decide whether a file is an encrypted PDF without parsing it.
+
+    The %PDF- header must appear in the first KB, and /Encrypt must appear in
+    the last 64 KB (where the trailer or xref stream lives) or near the start
+    (the first-page trailer of a linearized file).
+    """
+    try:
+        with open(filename, 'rb') as f:
+            head = f.read(max(head_size, 4096))
+            if b'%PDF-' not in head[:head_size]:
+                return False
+            if b'/Encrypt' in head:
+                return True
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - tail_size))
+            return b'/Encrypt' in f.read(tail_size)
+    except OSError:
+        return False
+
+def find_pdf_files(paths, all_files=False):
+    """Yield files under the given files and directories, lazily so huge trees start at once"""
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path, onerror=lambda e: sys.stderr.write(f"Skipping {e.filename}: {e.strerror}\n")):
+            dirs.sort()
+            for name in sorted(files):
+                if all_files or name.lower().endswith('.pdf'):
+                    yield os.path.join(root, name)
+
+def extract_batch_entry(filename):
+    """Worker: sniff and extract one file, returning its manifest record"""
+    start = time.perf_counter()
+    record = {'path': filename, 'mode': None, 'size': None, 'parse_time': None}
+    try:
+        record['size'] = os.path.getsize(filename)
+        if not sniff_encrypted_pdf(filename):
+            record['status'] = 'skipped'
+        else:
+            record['mode'], record['hash'] = format_pdf_hash(*StandardSecurityHandler.read_encryption(filename))
+            record['status'] = 'ok'
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = str(e)
+    record['parse_time'] = round(time.perf_counter() - start, 6)
+    return record
+
+def batch_extract(paths, hash_file, manifest_file, workers=None, all_files=False, include_skipped=False):
+    """Extract hashes from every encrypted PDF under paths using a process pool.
+
+    Hashes go to hash_file, one per line. Every file that was examined gets a
+    JSON line in manifest_file with its path, hashcat mode, size and parse time
+    (unencrypted files only with include_skipped). Returns {mode: count}.
+    """
+    if format_pdf_hash is None:
+        sys.stderr.write("Batch mode needs pdfbrute.py next to pdf2hash.py\n")
+        return None
+
+    workers = workers or os.cpu_count() or 1
+    counts = {'ok': 0, 'skipped': 0, 'error': 0}
+    modes = {}
+    start = time.time()
+    with open(hash_file, 'w', encoding='utf-8') as hashes, open(manifest_file, 'w', encoding='utf-8') as manifest:
+        with multiprocessing.Pool(workers) as pool:
+            # Most files take well under a millisecond, so hand them out in chunks
+            for record in pool.imap_unordered(extract_batch_entry, find_pdf_files(paths, all_files), chunksize=16):
+                counts[record['status']] += 1
+                if record['status'] == 'ok':
+                    hashes.write(record['hash'] + '\n')
+                    modes[record['mode']] = modes.get(record['mode'], 0) + 1
+                elif record['status'] == 'error':
+                    sys.stderr.write(f"{record['path']}: {record['error']}\n")
+                if record['status'] != 'skipped' or include_skipped:
+                    manifest.write(json.dumps(record) + '\n')
+                done = sum(counts.values())
+                if done % 1000 == 0:
+                    sys.stderr.write(f"{done} files, {counts['ok']} hashes ({done / max(time.time() - start, 1e-6):.0f} files/s)\n")
+
+    sys.stderr.write(f"Examined {sum(counts.values())} files in {time.time() - start:.1f}s: " +
+                     f"{counts['ok']} hashes, {counts['skipped']} unencrypted or not PDF, {counts['error']} errors\n")
+    # Hashcat skips lines of other modes, so a mixed file is cracked with one run per mode
+    for mode, count in sorted(modes.items()):
+        sys.stderr.write(f"  mode {mode}: {count} hash(es)  ->  hashcat -m {mode} -a 0 {hash_file} wordlist.txt\n")
+    return modes
 
 def main():
-    if len(sys.argv) < 2:
-        sys.stderr.write(f"Usage: {sys.argv[0]} <pdf_file>\n")
+    parser = argparse.ArgumentParser(description="Extract hashcat/John password hashes from encrypted PDFs")
+    parser.add_argument("pdf_file", nargs="?", help="PDF file to extract a hash from")
+    parser.add_argument("--batch", nargs="+", metavar="PATH",
+                       help="Walk these directories (and files) and extract every encrypted PDF")
+    parser.add_argument("-o", "--output", default="pdf_hashes.txt", help="Batch mode hash file (default: pdf_hashes.txt)")
+    parser.add_argument("--manifest", default="pdf_manifest.jsonl",
+                       help="Batch mode JSON Lines manifest (default: pdf_manifest.jsonl)")
+    parser.add_argument("--workers", type=int, help="Batch mode worker processes (default: CPU count)")
+    parser.add_argument("--all-files", action="store_true",
+                       help="Batch mode: sniff every file, not just *.pdf (e.g. carved or renamed evidence)")
+    parser.add_argument("--include-skipped", action="store_true",
+                       help="Batch mode: also list unencrypted and non-PDF files in the manifest")
+    args = parser.parse_args()
+
+    if args.batch:
+        modes = batch_extract(args.batch, args.output, args.manifest, args.workers, args.all_files, args.include_skipped)
+        sys.exit(0 if modes else 1)
+
+    if not args.pdf_file:
+        parser.print_usage(sys.stderr)
         sys.exit(1)
     
-    pdf_path = sys.argv[1]
+    pdf_path = args.pdf_file
     if not os.path.exists(pdf_path):
         sys.stderr.write(f"Error: File not found: {pdf_path}\n")
         sys.exit(1)
@@ -300,9 +474,11 @@ def main():
                 print(f"  {hash_str}")
                 print("  Command: john --format=pdf hash.txt\n")
     
-    # Also try to create a traditional John format hash
+    # Also try to create a traditional John format hash when no exact one was extracted
+    if quiet_mode or any(method == "john" for method, _, _ in results):
+        return
     john_hash = format_as_john_traditional(pdf_path)
-    if john_hash and not quiet_mode:
+    if john_hash:
         print("Alternative John format (save to file):")
         print(f"  {john_hash}")
         print("  Command: john --format=pdf hash.txt\n")
@@ -18,35 +18,60 @@ import os
 import time
 import string
 import argparse
-import itertools
 import json
+import re
+import queue
+import bisect
+import multiprocessing
+import hashlib
+import signal
+import subprocess
+import zlib
+from collections import namedtuple, deque
+from functools import lru_cache
 from datetime import datetime, timedelta
 
-# Try to import various PDF libraries, using the most robust ones first if available
-AVAILABLE_LIBRARIES = []
-
+# AES is only needed to verify R6 (AES-256, PDF 2.0) passwords natively
 try:
-    import pikepdf
-    AVAILABLE_LIBRARIES.append(("pikepdf", "Robust PDF library with good encryption support"))
-except ImportError:
-    pass
+    from Crypto.Cipher import AES as _CryptoAES
 
-try:
-    import PyPDF2
-    AVAILABLE_LIBRARIES.append(("PyPDF2", "Common PDF library"))
+    def _aes128_cbc_encrypt(key, iv, data):
+        return _CryptoAES.new(key, _CryptoAES.MODE_CBC, iv).encrypt(data)
 except ImportError:
-    pass
+    try:
+        from cryptography.hazmat.primitives.ciphers import Cipher as _Cipher, algorithms as _algorithms, modes as _modes
+
+        def _aes128_cbc_encrypt(key, iv, data):
+            encryptor = _Cipher(_algorithms.AES(key), _modes.CBC(iv)).encryptor()
+            return encryptor.update(data) + encryptor.finalize()
+    except ImportError:
+        _aes128_cbc_encrypt = None
 
+# RC4 from pycryptodome is much faster than the pure Python fallback for R2-R4
 try:
-    import pypdf
-    AVAILABLE_LIBRARIES.append(("pypdf", "Newer version of the PyPDF2 library"))
+    from Crypto.Cipher import ARC4 as _CryptoARC4
+
+    def _rc4_encrypt(key, data):
+        return _CryptoARC4.new(key).encrypt(data)
 except ImportError:
-    pass
+    _rc4_encrypt = None
+
+# PDF libraries, most robust first. The built-in verifier only needs the standard
+# library, so it is always available. The others are imported (and qpdf probed for)
+# the first time they are asked for, so importing this module and starting worker
+# processes does not pay for backends that are never used.
+PDF_LIBRARIES = [
+    ("native", "Built-in Standard Security Handler verifier (no file reopen per guess)"),
+    ("pikepdf", "Robust PDF library with good encryption support"),
+    ("PyPDF2", "Common PDF library"),
+    ("pypdf", "Newer version of the PyPDF2 library"),
+    ("qpdf", "Command line tool for PDF files"),
+]
+pikepdf = PyPDF2 = pypdf = None
 
 # Check if qpdf command line tool is available
 def has_qpdf():
     try:
-        import subprocess
         result = subprocess.run(['qpdf', '--version'], 
                               stdout=subprocess.PIPE, 
                               stderr=subprocess.PIPE)
@@ -54,14 +79,1364 @@ def has_qpdf():
     except:
         return False
 
-if has_qpdf():
-    AVAILABLE_LIBRARIES.append(("qpdf", "Command line tool for PDF files"))
+@lru_cache(maxsize=None)
+def library_available(name):
+    """Import (or probe for) one backend on first use; the answer is cached"""
+    global pikepdf, PyPDF2, pypdf
+    try:
+        if name == "native":
+            return True
+        elif name == "pikepdf":
+            import pikepdf
+        elif name == "PyPDF2":
+            import PyPDF2
+        elif name == "pypdf":
+            import pypdf
+        elif name == "qpdf":
+            return has_qpdf()
+        else:
+            return False
+        return True
+    except ImportError:
+        return False
+
+def available_libraries():
+    """(name, description) of every installed backend, discovered once on first use"""
+    return [(lib, desc) for lib, desc in PDF_LIBRARIES if library_available(lib)]
+
+# Padding string from the PDF specification (Algorithm 2, step a)
+PDF_PASSWORD_PADDING = bytes([
+    0x28, 0xBF, 0x4E, 0x5E, 0x4E, 0x75, 0x8A, 0x41, 0x64, 0x00, 0x4E, 0x56, 0xFF, 0xFA, 0x01, 0x08,
+    0x2E, 0x2E, 0x00, 0xB6, 0xD0, 0x68, 0x3E, 0x80, 0x2F, 0x0C, 0xA9, 0xFE, 0x64, 0x53, 0x69, 0x7A
+])
+
+PDFRef = namedtuple('PDFRef', ['num', 'gen'])
+
+_PDF_WHITESPACE = b' \t\r\n\x0c\x00'
+_PDF_DELIMITERS = b'()<>[]{}/%'
+_PDF_REF_TAIL = re.compile(rb'\s+(\d+)\s+R(?![^\s()<>\[\]{}/%])')
+
+def _skip_whitespace(data, pos):
+    """Skip whitespace and comments starting at pos"""
+    length = len(data)
+    while pos < length:
+        if data[pos] in _PDF_WHITESPACE:
+            pos += 1
+        elif data[pos] == 0x25:  # '%' comment runs to end of line
+            while pos < length and data[pos] not in b'\r\n':
+                pos += 1
+        else:
+            break
+    return pos
+
+def _read_token(data, pos):
+    """Read a regular (non-delimiter) token such as a number or keyword"""
+    end = pos
+    while end < len(data) and data[end] not in _PDF_WHITESPACE and data[end] not in _PDF_DELIMITERS:
+        end += 1
+    return data[pos:end], end
+
+def _parse_literal_string(data, pos):
+    """Parse a (literal) string; pos points just after the opening parenthesis"""
+    escapes = {ord('n'): b'\n', ord('r'): b'\r', ord('t'): b'\t', ord('b'): b'\b',
+               ord('f'): b'\f', ord('('): b'(', ord(')'): b')', ord('\\'): b'\\'}
+    out = bytearray()
+    depth = 1
+    while pos < len(data):
+        c = data[pos]
+        if c == 0x5C:  # backslash
+            pos += 1
+            c = data[pos]
+            if c in escapes:
+                out += escapes[c]
+                pos += 1
+            elif 0x30 <= c <= 0x37:
+                digits = data[pos:pos + 3]
+                count = 0
+                while count < len(digits) and 0x30 <= digits[count] <= 0x37:
+                    count += 1
+                out.append(int(digits[:count], 8) & 0xFF)
+                pos += count
+            elif c == 0x0D:  # line continuation
+                pos += 2 if data[pos + 1:pos + 2] == b'\n' else 1
+            elif c == 0x0A:
+                pos += 1
+            else:
+                out.append(c)
+                pos += 1
+            continue
+        if c == 0x28:
+            depth += 1
+        elif c == 0x29:
+            depth -= 1
+            if depth == 0:
+                return bytes(out), pos + 1
+        out.append(c)
+        pos += 1
+    raise ValueError("Unterminated literal string")
+
+def parse_pdf_object(data, pos):
+    """Parse a single PDF object from data at pos.
+
+    Returns (value, new_pos). Dictionaries become dicts keyed by name (without
+    the leading slash), strings become bytes, names become str and indirect
+    references become PDFRef tuples.
+    """
+    pos = _skip_whitespace(data, pos)
+    if pos >= len(data):
+        raise ValueError("Unexpected end of data")
+
+    if data.startswith(b'<<', pos):
+        result = {}
+        pos += 2
+        while True:
+            pos = _skip_whitespace(data, pos)
+            if data.startswith(b'>>', pos):
+                return result, pos + 2
+            key, pos = parse_pdf_object(data, pos)
+            value, pos = parse_pdf_object(data, pos)
+            result[key] = value
+
+    c = data[pos]
+    if c == 0x3C:  # '<' hex string
+        end = data.index(b'>', pos)
+        hex_digits = re.sub(rb'\s', b'', data[pos + 1:end])
+        if len(hex_digits) % 2:
+            hex_digits += b'0'
+        return bytes.fromhex(hex_digits.decode('ascii')), end + 1
+    if c == 0x28:  # '(' literal string
+        return _parse_literal_string(data, pos + 1)
+    if c == 0x5B:  # '[' array
+        result = []
+        pos += 1
+        while True:
+            pos = _skip_whitespace(data, pos)
+            if data[pos] == 0x5D:
+                return result, pos + 1
+            value, pos = parse_pdf_object(data, pos)
+            result.append(value)
+    if c == 0x2F:  # '/' name
+        token, end = _read_token(data, pos + 1)
+        name = re.sub(rb'#([0-9a-fA-F]{2})', lambda m: bytes([int(m.group(1), 16)]), token)
+        return name.decode('latin-1'), end
+
+    token, end = _read_token(data, pos)
+    if not token:
+        raise ValueError(f"Unexpected character at offset {pos}")
+    if token == b'true':
+        return True, end
+    if token == b'false':
+        return False, end
+    if token == b'null':
+        return None, end
+    try:
+        number = int(token)
+    except ValueError:
+        try:
+            return float(token), end
+        except ValueError:
+            raise ValueError(f"Unexpected token {token!r} at offset {pos}")
+
+    # An integer may be the start of an indirect reference: "num gen R"
+    ref = _PDF_REF_TAIL.match(data, end)
+    if ref:
+        return PDFRef(number, int(ref.group(1))), ref.end()
+    return number, end
+
+def _png_unpredict(data, columns):
+    """Undo PNG row predictors (/Predictor 10-15) with one byte per pixel, as xref streams use"""
+    row_size = columns + 1
+    previous = bytearray(columns)
+    out = bytearray()
+    for start in range(0, len(data) - columns, row_size):
+        kind = data[start]
+        row = bytearray(data[start + 1:start + row_size])
+        for i in range(len(row)):
+            left = row[i - 1] if i else 0
+            up = previous[i]
+            if kind == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif kind == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif kind == 3:
+                row[i] = (row[i] + (left + up) // 2) & 0xFF
+            elif kind == 4:
+                up_left = previous[i - 1] if i else 0
+                estimate = left + up - up_left
+                distances = (abs(estimate - left), abs(estimate - up), abs(estimate - up_left))
+                row[i] = (row[i] + (left, up, up_left)[distances.index(min(distances))]) & 0xFF
+        out += row
+        previous = row
+    return bytes(out)
+
+class PDFXrefReader:
+    """Read objects of a PDF through its cross-reference data, touching only the bytes needed.
+
+    Starts from startxref at the end of the file and reads cross-reference
+    sections (classic tables or PDF 1.5 xref streams) newest first, following
+    /XRefStm and /Prev only as far as an object lookup requires. Classic table
+    entries are read by seeking to them, so finding the trailer and /Encrypt in
+    a multi-GB file costs a few small reads. Objects inside compressed object
+    streams are supported. Raises ValueError when the structure is damaged, in
+    which case callers fall back to scanning the whole file.
+    """
+
+    WINDOW = 4096
+
+    def __init__(self, f):
+        self.f = f
+        f.seek(0, os.SEEK_END)
+        self.size = f.tell()
+        # Parsed sections, newest first: (trailer, lookup function)
+        self.sections = []
+        self._pending = [self._find_startxref()]
+        self._seen = set()
+        self._object_streams = {}
+
+    def _read(self, offset, length):
+        self.f.seek(offset)
+        return self.f.read(length)
+
+    def _find_startxref(self):
+        for window in (1024, 65536):
+            start = max(0, self.size - window)
+            tail = self._read(start, self.size - start)
+            pos = tail.rfind(b'startxref')
+            if pos != -1:
+                match = re.match(rb'startxref\s+(\d+)', tail[pos:])
+                if match and int(match.group(1)) < self.size:
+                    return int(match.group(1))
+        raise ValueError("No startxref found")
+
+    def _parse_at(self, offset):
+        """Parse one object at offset, growing the read window until it fits.
+
+        A parse that ends close to the end of the window may have been cut
+        short (a number or reference split by the window), so it is retried.
+        """
+        window = self.WINDOW
+        while True:
+            data = self._read(offset, window)
+            at_eof = offset + len(data) >= self.size
+            try:
+                value, end = parse_pdf_object(data, 0)
+                if at_eof or end < len(data) - 32:
+                    return value, offset + end
+            except (ValueError, IndexError):
+                if at_eof:
+                    raise ValueError(f"Could not parse object at offset {offset}")
+            if window >= 1 << 26:
+                raise ValueError(f"Object at offset {offset} is too large")
+            window *= 4
+
+    def _parse_indirect(self, offset, num=None):
+        """Parse "num gen obj" at offset; return (value, offset just past the value)"""
+        header = re.match(rb'\s*(\d+)\s+(\d+)\s+obj\b', self._read(offset, 64))
+        if not header or (num is not None and int(header.group(1)) != num):
+            raise ValueError(f"No object {num if num is not None else ''} at offset {offset}")
+        return self._parse_at(offset + header.end())
+
+    def _read_stream(self, stream_dict, end):
+        """Read and decode the stream data that follows a stream dictionary ending at end"""
+        head = self._read(end, 64)
+        match = re.match(rb'\s*stream(\r\n|\n|\r)', head)
+        length = self.resolve(stream_dict.get('Length'))
+        if not match or not isinstance(length, int):
+            raise ValueError("Malformed stream")
+        data = self._read(end + match.end(), length)
+        filters = stream_dict.get('Filter', [])
+        params = stream_dict.get('DecodeParms') or {}
+        if not isinstance(filters, list):
+            filters, params = [filters], [params]
+        elif not isinstance(params, list):
+            params = [params]
+        for position, name in enumerate(filters):
+            if name != 'FlateDecode':
+                raise ValueError(f"Unsupported stream filter {name}")
+            data = zlib.decompress(data)
+            parms = params[position] if position < len(params) and isinstance(params[position], dict) else {}
+            if parms.get('Predictor', 1) >= 10:
+                data = _png_unpredict(data, parms.get('Columns', 1))
+        return data
+
+    def _load_section(self, offset):
+        """Parse the cross-reference section at offset and queue the ones it points to"""
+        head = self._read(offset, 32)
+        if head.lstrip().startswith(b'xref'):
+            trailer, lookup = self._load_table(offset + head.index(b'xref') + 4)
+        else:
+            stream_dict, end = self._parse_indirect(offset)
+            if not isinstance(stream_dict, dict) or stream_dict.get('Type') != 'XRef':
+                raise ValueError(f"No cross-reference section at offset {offset}")
+            trailer, lookup = stream_dict, self._load_stream_entries(stream_dict, end)
+        self.sections.append((trailer, lookup))
+        # A hybrid file's /XRefStm holds objects its table does not list
+        following = [trailer.get('XRefStm'), trailer.get('Prev')]
+        self._pending[:0] = [value for value in following if isinstance(value, int)]
+
+    def _load_table(self, pos):
+        """Locate the subsections of a classic xref table; entries are read on lookup"""
+        subsections = []
+        while True:
+            data = self._read(pos, 64)
+            if data.lstrip().startswith(b'trailer'):
+                trailer, _ = self._parse_at(pos + data.index(b'trailer') + 7)
+                break
+            header = re.match(rb'\s*(\d+)\s+(\d+)[ \t]*(\r\n|\r|\n)', data)
+            if not header:
+                raise ValueError(f"Malformed xref table at offset {pos}")
+            first, count = int(header.group(1)), int(header.group(2))
+            entries = pos + header.end()
+            # Entries are 20 bytes, but some writers end them with a single EOL byte
+            sample = self._read(entries, 20)
+            entry_size = 20 if count == 0 or sample[18:19] in (b' ', b'\r') or sample[18:20] == b'\r\n' else 19
+            subsections.append((first, count, entries, entry_size))
+            pos = entries + count * entry_size
+        if not isinstance(trailer, dict):
+            raise ValueError("Malformed trailer")
+
+        def lookup(num):
+            for first, count, entries, entry_size in subsections:
+                if first <= num < first + count:
+                    entry = self._read(entries + (num - first) * entry_size, 18).split()
+                    if len(entry) != 3:
+                        raise ValueError(f"Malformed xref entry for object {num}")
+                    return ('offset', int(entry[0])) if entry[2] == b'n' else ('free',)
+            return None
+        return trailer, lookup
+
+    def _load_stream_entries(self, stream_dict, end):
+        """Decode the entries of an xref stream into {num: entry}"""
+        data = self._read_stream(stream_dict, end)
+        widths = stream_dict.get('W')
+        if not isinstance(widths, list) or len(widths) != 3:
+            raise ValueError("Malformed /W in xref stream")
+        index = stream_dict.get('Index') or [0, stream_dict.get('Size', 0)]
+        entry_size = sum(widths)
+        entries = {}
+        pos = 0
+        for first, count in zip(index[0::2], index[1::2]):
+            for num in range(first, first + count):
+                fields = []
+                for width in widths:
+                    fields.append(int.from_bytes(data[pos:pos + width], 'big'))
+                    pos += width
+                # A zero-width type field defaults to type 1
+                kind = fields[0] if widths[0] else 1
+                if kind == 1:
+                    entries[num] = ('offset', fields[1])
+                elif kind == 2:
+                    entries[num] = ('compressed', fields[1], fields[2])
+                else:
+                    entries[num] = ('free',)
+                if pos > len(data) - entry_size and num < first + count - 1:
+                    raise ValueError("Truncated xref stream")
+        return entries.get
+
+    def _sections(self):
+        """Yield (trailer, lookup) for each section, newest first, loading them lazily"""
+        position = 0
+        while True:
+            while position >= len(self.sections) and self._pending:
+                offset = self._pending.pop(0)
+                if offset not in self._seen:
+                    self._seen.add(offset)
+                    self._load_section(offset)
+            if position >= len(self.sections):
+                return
+            yield self.sections[position]
+            position += 1
+
+    @property
+    def trailer(self):
+        return next(self._sections())[0]
+
+    def get_object(self, num):
+        """The object with this number from the newest section that lists it"""
+        for _, lookup in self._sections():
+            entry = lookup(num)
+            if entry is None:
+                continue
+            if entry[0] == 'offset':
+                return self._parse_indirect(entry[1], num)[0]
+            if entry[0] == 'compressed':
+                return self._compressed_object(entry[1], entry[2])
+            raise ValueError(f"Object {num} is free")
+        raise ValueError(f"Object {num} not found in the cross-reference data")
+
+    def _compressed_object(self, stream_num, index):
+        if stream_num not in self._object_streams:
+            entry = None
+            for _, lookup in self._sections():
+                entry = lookup(stream_num)
+                if entry is not None:
+                    break
+            if not entry or entry[0] != 'offset':
+                raise ValueError(f"Object stream {stream_num} not found")
+            stream_dict, end = self._parse_indirect(entry[1], stream_num)
+            data = self._read_stream(stream_dict, end)
+            numbers = data[:stream_dict['First']].split()
+            offsets = [int(value) for value in numbers[1::2]]
+            self._object_streams[stream_num] = (data, stream_dict['First'], offsets)
+        data, first, offsets = self._object_streams[stream_num]
+        return parse_pdf_object(data, first + offsets[index])[0]
+
+    def resolve(self, value):
+        """Follow indirect references to their objects"""
+        seen = set()
+        while isinstance(value, PDFRef):
+            if value in seen:
+                raise ValueError("Reference loop")
+            seen.add(value)
+            value = self.get_object(value.num)
+        return value
+
+    def encryption(self):
+        """Return (/Encrypt dictionary, first /ID string) from the newest trailer that has one"""
+        for trailer, _ in self._sections():
+            if 'Encrypt' in trailer:
+                encrypt = self.resolve(trailer['Encrypt'])
+                if not isinstance(encrypt, dict):
+                    raise ValueError("Could not parse /Encrypt dictionary")
+                ids = self.resolve(trailer.get('ID'))
+                document_id = ids[0] if isinstance(ids, list) and ids and isinstance(ids[0], bytes) else b''
+                return encrypt, document_id
+        raise ValueError("PDF is not encrypted (no /Encrypt entry in trailer)")
+
+class StandardSecurityHandler:
+    """Verify passwords directly against a PDF's /Encrypt dictionary.
+
+    The encryption dictionary is parsed once, after which each candidate only
+    costs the key-derivation math from the PDF specification (RC4/MD5 for
+    revisions 2-4, SHA-256/AES for revisions 5 and 6) instead of a full file
+    open and xref parse.
+    """
+
+    def __init__(self, encrypt_dict, document_id=b''):
+        if encrypt_dict.get('Filter') != 'Standard':
+            raise ValueError(f"Unsupported security handler: {encrypt_dict.get('Filter')}")
+
+        self.V = encrypt_dict.get('V', 0)
+        self.R = encrypt_dict.get('R')
+        self.O = encrypt_dict.get('O', b'')
+        self.U = encrypt_dict.get('U', b'')
+        self.P = encrypt_dict.get('P', 0)
+        self.OE = encrypt_dict.get('OE', b'')
+        self.UE = encrypt_dict.get('UE', b'')
+        self.Perms = encrypt_dict.get('Perms', b'')
+        self.encrypt_metadata = encrypt_dict.get('EncryptMetadata', True)
+        self.document_id = document_id or b''
+
+        if self.R not in (2, 3, 4, 5, 6):
+            raise ValueError(f"Unsupported Standard security handler revision: {self.R}")
+        if self.R == 6 and _aes128_cbc_encrypt is None:
+            raise ValueError("Revision 6 requires AES support (pip install pycryptodome)")
+        if self.R >= 5 and (len(self.U) < 48 or len(self.O) < 48):
+            raise ValueError("Malformed /U or /O entry for revision 5/6")
+        if self.R <= 4 and (len(self.U) < 16 or len(self.O) < 32):
+            raise ValueError("Malformed /U or /O entry")
+
+        self.key_length = self.file_key_length(encrypt_dict)
+
+        # Everything in the R2-R4 key derivation except the padded password is
+        # fixed per document, so build it once: the bytes hashed after the password
+        # (Algorithm 2, steps c-f), the value Algorithm 5 encrypts, and the XOR
+        # tables for its 19 extra RC4 passes
+        if self.R <= 4:
+            self._key_suffix = (
+                self.O[:32] + (self.P & 0xFFFFFFFF).to_bytes(4, 'little') + self.document_id +
+                (b'\xff\xff\xff\xff' if self.R >= 4 and not self.encrypt_metadata else b'')
+            )
+            self._u_seed = hashlib.md5(PDF_PASSWORD_PADDING + self.document_id).digest()
+            self._u_expected = self.U[:32] if self.R == 2 else self.U[:16]
+            self._xor_tables = [bytes(b ^ i for b in range(256)) for i in range(1, 20)]
+            self._rc4 = _rc4_encrypt or self._rc4
+
+        # Which passwords check_block looks for: 'user', 'owner' or both
+        self.targets = ('user',)
+        # Padded user password once known. Decrypting O with an owner candidate's
+        # key yields the padded user password, so the owner check becomes a compare
+        self.user_password_padded = None
+        if self.R <= 4 and self.check_user_password(b''):
+            self.user_password_padded = PDF_PASSWORD_PADDING
+
+    @staticmethod
+    def file_key_length(encrypt_dict):
+        """Key length in bytes (Algorithm 2, step d)"""
+        V, R = encrypt_dict.get('V', 0), encrypt_dict.get('R')
+        if R == 2 or V == 1:
+            return 5
+        if isinstance(R, int) and R >= 5:
+            return 32
+        if V == 4:
+            crypt_filter = encrypt_dict.get('CF', {}).get(encrypt_dict.get('StmF', 'StdCF'), {})
+            length = crypt_filter.get('Length')
+            if isinstance(length, int) and length > 0:
+                # Some writers store this in bytes, others in bits
+                return length if length <= 32 else length // 8
+            return 16
+        return encrypt_dict.get('Length', 40) // 8
+
+    @classmethod
+    def from_file(cls, pdf_file):
+        """Locate and parse the /Encrypt dictionary of a PDF file"""
+        return cls(*cls.read_encryption(pdf_file))
+
+    @classmethod
+    def read_encryption(cls, pdf_file):
+        """Return the parsed /Encrypt dictionary and the first /ID string of a PDF file"""
+        with open(pdf_file, 'rb') as f:
+            try:
+                return PDFXrefReader(f).encryption()
+            except (ValueError, IndexError, KeyError, TypeError, zlib.error):
+                # Damaged cross-reference data (or a stale startxref): scan the whole file instead
+                pass
+            f.seek(0)
+            data = f.read()
+
+        trailer = cls._find_trailer(data)
+        if trailer is None or 'Encrypt' not in trailer:
+            raise ValueError("PDF is not encrypted (no /Encrypt entry in trailer)")
+
+        encrypt = trailer['Encrypt']
+        if isinstance(encrypt, PDFRef):
+            encrypt = cls._resolve(data, encrypt)
+        if not isinstance(encrypt, dict):
+            raise ValueError("Could not parse /Encrypt dictionary")
+
+        document_id = b''
+        ids = trailer.get('ID')
+        if isinstance(ids, PDFRef):
+            ids = cls._resolve(data, ids)
+        if isinstance(ids, list) and ids and isinstance(ids[0], bytes):
+            document_id = ids[0]
+
+        return encrypt, document_id
+
+    @staticmethod
+    def _find_trailer(data):
+        """Find the most recent trailer (or cross-reference stream) dictionary with /Encrypt"""
+        candidates = []
+        for match in re.finditer(rb'trailer\s*<<', data):
+            candidates.append((match.start(), match.end() - 2))
+        for match in re.finditer(rb'/Type\s*/XRef\b', data):
+            obj = data.rfind(b'obj', 0, match.start())
+            if obj != -1:
+                start = data.find(b'<<', obj)
+                if start != -1:
+                    candidates.append((match.start(), start))
+
+        # Later dictionaries belong to later incremental updates
+        for _, start in sorted(candidates, reverse=True):
+            try:
+                trailer, _ = parse_pdf_object(data, start)
+            except (ValueError, IndexError):
+                continue
+            if isinstance(trailer, dict) and 'Encrypt' in trailer:
+                return trailer
+        return None
+
+    @staticmethod
+    def _resolve(data, ref):
+        """Resolve an indirect object by scanning for its definition"""
+        pattern = re.compile(rb'(?<!\d)%d\s+%d\s+obj\b' % (ref.num, ref.gen))
+        matches = list(pattern.finditer(data))
+        for match in reversed(matches):
+            try:
+                value, _ = parse_pdf_object(data, match.end())
+                return value
+            except (ValueError, IndexError):
+                continue
+        raise ValueError(f"Could not find object {ref.num} {ref.gen}")
+
+    def describe(self):
+        """Short human-readable description of the encryption parameters"""
+        if self.R >= 5:
+            return f"Standard handler V{self.V} R{self.R} (AES-256)"
+        return f"Standard handler V{self.V} R{self.R} ({self.key_length * 8}-bit)"
+
+    def encode_password(self, password):
+        """Encode a str password the way the security handler expects"""
+        if self.R >= 5:
+            return password.encode('utf-8')[:127]
+        return password.encode('latin-1', errors='replace')[:32]
+
+    @staticmethod
+    def _rc4(key, data):
+        """Pure Python RC4, used when pycryptodome is not installed"""
+        state = list(range(256))
+        j = 0
+        for i, k in zip(range(256), key * (256 // len(key) + 1)):
+            si = state[i]
+            j = (j + si + k) & 0xFF
+            state[i] = state[j]
+            state[j] = si
+
+        out = bytearray(len(data))
+        i = j = 0
+        for n, byte in enumerate(data):
+            i = (i + 1) & 0xFF
+            si = state[i]
+            j = (j + si) & 0xFF
+            sj = state[j]
+            state[i] = sj
+            state[j] = si
+            out[n] = byte ^ state[(si + sj) & 0xFF]
+        return bytes(out)
+
+    def _compute_file_key(self, password):
+        """Algorithm 2: compute the file encryption key for R2-R4"""
+        md5 = hashlib.md5
+        digest = md5((password + PDF_PASSWORD_PADDING)[:32] + self._key_suffix).digest()
+        if self.R >= 3:
+            key_length = self.key_length
+            if key_length == 16:
+                for _ in range(50):
+                    digest = md5(digest).digest()
+            else:
+                for _ in range(50):
+                    digest = md5(digest[:key_length]).digest()
+        return digest[:self.key_length]
+
+    def _hash_r6(self, password, salt, udata=b''):
+        """Algorithm 2.B: the iterated hash used by revision 6"""
+        k = hashlib.sha256(password + salt + udata).digest()
+        hashes = (hashlib.sha256, hashlib.sha384, hashlib.sha512)
+        rounds = 0
+        while True:
+            k1 = (password + k + udata) * 64
+            e = _aes128_cbc_encrypt(k[:16], k[16:32], k1)
+            # The first 16 bytes of E taken as a big-endian number, mod 3
+            k = hashes[sum(e[:16]) % 3](e).digest()
+            rounds += 1
+            if rounds >= 64 and e[-1] <= rounds - 32:
+                break
+        return k[:32]
+
+    def check_block(self, block, length, count, start=0):
+        """Check a block of `count` fixed-length candidates; return the first matching offset or -1"""
+        if self.targets == ('user',):
+            check = self.check_user_password
+        elif self.targets == ('owner',):
+            check = self.check_owner_password
+        else:
+            check = self.match_password
+        for offset in range(start, count):
+            if check(bytes(block[offset * length:(offset + 1) * length])):
+                return offset
+        return -1
+    
+    def check_user_password(self, password):
+        """Return True if password (bytes) is the document's user password"""
+        if self.R >= 5:
+            validation_salt = self.U[32:40]
+            if self.R == 5:
+                return hashlib.sha256(password + validation_salt).digest() == self.U[:32]
+            return self._hash_r6(password, validation_salt) == self.U[:32]
+
+        key = self._compute_file_key(password)
+        rc4 = self._rc4
+        if self.R == 2:
+            # Algorithm 4
+            return rc4(key, PDF_PASSWORD_PADDING) == self._u_expected
+
+        # Algorithm 5: only the first 16 bytes of U are significant
+        value = rc4(key, self._u_seed)
+        for table in self._xor_tables:
+            value = rc4(key.translate(table), value)
+        return value == self._u_expected
+
+    def set_user_password(self, password):
+        """Remember the user password so owner checks skip Algorithm 6"""
+        self.user_password_padded = (password + PDF_PASSWORD_PADDING)[:32]
 
-if not AVAILABLE_LIBRARIES:
-    print("Error: No PDF libraries available. Please install at least one of these:")
-    print("  pip install pikepdf PyPDF2 pypdf")
-    print("  or install qpdf command line tool")
-    sys.exit(1)
+    def check_owner_password(self, password):
+        """Return True if password (bytes) is the document's owner password"""
+        if self.R >= 5:
+            # Algorithm 12 (R6) / Algorithm 3.2a (R5): the owner hash also covers U
+            validation_salt = self.O[32:40]
+            if self.R == 5:
+                return hashlib.sha256(password + validation_salt + self.U[:48]).digest() == self.O[:32]
+            return self._hash_r6(password, validation_salt, self.U[:48]) == self.O[:32]
+
+        # Algorithm 7: the owner key decrypts O to the padded user password
+        md5 = hashlib.md5
+        digest = md5((password + PDF_PASSWORD_PADDING)[:32]).digest()
+        if self.R >= 3:
+            for _ in range(50):
+                digest = md5(digest).digest()
+        key = digest[:self.key_length]
+        rc4 = self._rc4
+        if self.R == 2:
+            user_password = rc4(key, self.O[:32])
+        else:
+            user_password = self.O[:32]
+            for table in reversed(self._xor_tables):
+                user_password = rc4(key.translate(table), user_password)
+            user_password = rc4(key, user_password)
+
+        if self.user_password_padded is not None:
+            return user_password == self.user_password_padded
+        return self.check_user_password(user_password)
+
+    def match_password(self, password):
+        """Return the targets ('user', 'owner') that password matches; empty if none.
+        
+        Every target is tested, since the owner password defaults to the user
+        password and one candidate is then both.
+        """
+        return tuple(target for target in self.targets
+                     if (self.check_user_password(password) if target == 'user'
+                         else self.check_owner_password(password)))
+
+# Hashcat modes by Standard security handler revision: PDF 1.1-1.3 (40-bit RC4),
+# PDF 1.4-1.6 (128-bit RC4 or AES-128), PDF 1.7 Level 3 and Level 8 (AES-256)
+HASHCAT_PDF_MODES = {2: 10400, 3: 10500, 4: 10500, 5: 10600, 6: 10700}
+
+def format_pdf_hash(encrypt, document_id):
+    """Return (hashcat mode, $pdf$ hash) for a parsed /Encrypt dictionary and document /ID.
+    
+    The hash is $pdf$V*R*bits*P*EncryptMetadata*len*ID*len*U*len*O, plus
+    len*UE*len*OE for revisions 5 and 6, where hashcat expects /U and /O
+    zero-padded to 127 bytes. John the Ripper reads the same string.
+    """
+    if encrypt.get('Filter') != 'Standard':
+        raise ValueError(f"Unsupported security handler: {encrypt.get('Filter')}")
+    R = encrypt.get('R')
+    if R not in HASHCAT_PDF_MODES:
+        raise ValueError(f"Unsupported Standard security handler revision: {R}")
+    V = encrypt.get('V', 0)
+    bits = StandardSecurityHandler.file_key_length(encrypt) * 8
+    # Hashcat wants P as a signed 32-bit integer; some writers store it unsigned
+    P = encrypt.get('P', 0) & 0xFFFFFFFF
+    P = P - (1 << 32) if P & 0x80000000 else P
+    metadata = 1 if encrypt.get('EncryptMetadata', True) else 0
+    U, O = encrypt.get('U', b''), encrypt.get('O', b'')
+    if R >= 5:
+        # The ID is not part of the R5/R6 check but hashcat still parses one
+        document_id = document_id or bytes(16)
+        fields = [V, R, bits, P, metadata, len(document_id), document_id.hex(),
+                  127, U[:48].ljust(127, b'\0').hex(), 127, O[:48].ljust(127, b'\0').hex(),
+                  32, encrypt.get('UE', b'')[:32].hex(), 32, encrypt.get('OE', b'')[:32].hex()]
+    else:
+        fields = [V, R, bits, P, metadata, len(document_id), document_id.hex(),
+                  32, U[:32].ljust(32, b'\0').hex(), 32, O[:32].hex()]
+    return HASHCAT_PDF_MODES[R], "$pdf$" + "*".join(str(field) for field in fields)
+
+def pdf_hashcat_hash(pdf_file):
+    """Return (hashcat mode, $pdf$ hash) for an encrypted PDF file"""
+    return format_pdf_hash(*StandardSecurityHandler.read_encryption(pdf_file))
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Built-in hashcat mask charsets (?l, ?u, ?d, ?h, ?H, ?s, ?a, ?b)
+MASK_CHARSETS = {
+    'l': string.ascii_lowercase.encode(),
+    'u': string.ascii_uppercase.encode(),
+    'd': string.digits.encode(),
+    'h': b'0123456789abcdef',
+    'H': b'0123456789ABCDEF',
+    's': b' ' + string.punctuation.encode(),
+    'b': bytes(range(256)),
+}
+MASK_CHARSETS['a'] = MASK_CHARSETS['l'] + MASK_CHARSETS['u'] + MASK_CHARSETS['d'] + MASK_CHARSETS['s']
+
+def _find_data_file(path, subdir):
+    """Find a file as given, or in the bundled hashcat directory (charsets/, masks/, rules/)"""
+    if os.path.exists(path):
+        return path
+    bundled = os.path.join(SCRIPT_DIR, subdir, path)
+    if os.path.exists(bundled):
+        return bundled
+    return None
+
+def _unique_bytes(data):
+    """Remove duplicate bytes, keeping the first occurrence"""
+    seen = set()
+    return bytes(b for b in data if not (b in seen or seen.add(b)))
+
+def expand_mask(mask, custom_charsets=()):
+    """Expand a hashcat mask into a list of per-position charsets (bytes)"""
+    positions = []
+    pos = 0
+    while pos < len(mask):
+        char = mask[pos]
+        if char == '?' and pos + 1 < len(mask):
+            key = mask[pos + 1]
+            if key == '?':
+                positions.append(b'?')
+            elif key in MASK_CHARSETS:
+                positions.append(MASK_CHARSETS[key])
+            elif key in '1234':
+                number = int(key)
+                if number > len(custom_charsets) or not custom_charsets[number - 1]:
+                    raise ValueError(f"Mask '{mask}' uses ?{key} but custom charset {key} is not defined")
+                positions.append(custom_charsets[number - 1])
+            else:
+                raise ValueError(f"Unknown mask placeholder '?{key}' in '{mask}'")
+            pos += 2
+        else:
+            positions.append(char.encode('latin-1'))
+            pos += 1
+    return positions
+
+def parse_custom_charset(definition):
+    """Expand a custom charset definition (-1..-4): placeholders, literals or a .hcchr file"""
+    if definition.endswith('.hcchr') or os.path.isfile(definition):
+        path = _find_data_file(definition, 'charsets')
+        if path is None:
+            raise ValueError(f"Charset file not found: {definition}")
+        with open(path, 'rb') as f:
+            return _unique_bytes(f.read().rstrip(b'\r\n'))
+    return _unique_bytes(b''.join(expand_mask(definition)))
+
+def _split_hcmask_line(line):
+    """Split an .hcmask line on unescaped commas"""
+    fields = ['']
+    pos = 0
+    while pos < len(line):
+        if line[pos] == '\\' and pos + 1 < len(line) and line[pos + 1] in ',#':
+            fields[-1] += line[pos + 1]
+            pos += 2
+            continue
+        if line[pos] == ',':
+            fields.append('')
+        else:
+            fields[-1] += line[pos]
+        pos += 1
+    return fields
+
+def load_masks(mask, custom_charsets=()):
+    """Load a single mask or every line of an .hcmask file.
+
+    Returns a list of (mask_text, position_charsets). Custom charsets given on
+    an .hcmask line override the ones passed in for that line only.
+    """
+    defaults = [parse_custom_charset(c) if c else b'' for c in custom_charsets]
+    path = _find_data_file(mask, 'masks') if mask.endswith('.hcmask') else None
+    if path is None:
+        if mask.endswith('.hcmask'):
+            raise ValueError(f"Mask file not found: {mask}")
+        return [(mask, expand_mask(mask, defaults))]
+
+    masks = []
+    with open(path, 'r', encoding='latin-1') as f:
+        for line in f:
+            line = line.rstrip('\r\n')
+            if not line or line.startswith('#'):
+                continue
+            fields = _split_hcmask_line(line)
+            line_charsets = list(defaults)
+            for number, definition in enumerate(fields[:-1][:4]):
+                while len(line_charsets) <= number:
+                    line_charsets.append(b'')
+                line_charsets[number] = parse_custom_charset(definition)
+            masks.append((fields[-1], expand_mask(fields[-1], line_charsets)))
+    if not masks:
+        raise ValueError(f"No masks found in {mask}")
+    return masks
+
+# Hashcat rule engine: argument layout per function, N = position (0-9, A-Z), X = character
+RULE_ARGUMENTS = {
+    ':': '', 'l': '', 'u': '', 'c': '', 'C': '', 't': '', 'r': '', 'd': '', 'f': '',
+    '{': '', '}': '', '[': '', ']': '', 'q': '', 'k': '', 'K': '', 'E': '',
+    'M': '', '4': '', '6': '', 'Q': '',
+    'T': 'N', 'p': 'N', 'D': 'N', "'": 'N', 'z': 'N', 'Z': 'N', 'y': 'N', 'Y': 'N',
+    'L': 'N', 'R': 'N', '+': 'N', '-': 'N', '.': 'N', ',': 'N',
+    '<': 'N', '>': 'N', '_': 'N',
+    '$': 'X', '^': 'X', '@': 'X', 'e': 'X', '!': 'X', '/': 'X', '(': 'X', ')': 'X',
+    's': 'XX', 'i': 'NX', 'o': 'NX', '3': 'NX', '=': 'NX', '%': 'NX',
+    'x': 'NN', 'O': 'NN', '*': 'NN', 'X': 'NNN',
+}
+RULE_POSITIONS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+RULE_MAX_LENGTH = 256
+
+@lru_cache(maxsize=None)
+def compile_rule(rule):
+    """Compile one hashcat rule line into a tuple of (function, args) steps.
+
+    Raises ValueError for unknown functions or missing arguments, so callers
+    can skip rules this engine does not implement.
+    """
+    program = []
+    pos = 0
+    while pos < len(rule):
+        function = rule[pos]
+        pos += 1
+        if function in ' \t':
+            continue
+        if function not in RULE_ARGUMENTS:
+            raise ValueError(f"Unsupported rule function '{function}'")
+        args = []
+        for kind in RULE_ARGUMENTS[function]:
+            if pos >= len(rule):
+                raise ValueError(f"Missing argument for rule function '{function}'")
+            if kind == 'N':
+                if rule[pos] not in RULE_POSITIONS:
+                    raise ValueError(f"Invalid position '{rule[pos]}' for rule function '{function}'")
+                args.append(RULE_POSITIONS.index(rule[pos]))
+            else:
+                args.append(rule[pos].encode('latin-1'))
+            pos += 1
+        if function != ':':
+            program.append((function, tuple(args)))
+    return tuple(program)
+
+def _title_case(word, separator):
+    """Lowercase a word and uppercase the first letter and every letter after separator"""
+    chars = bytearray(word.lower())
+    for pos in range(len(chars)):
+        if pos == 0 or chars[pos - 1] == separator[0]:
+            chars[pos:pos + 1] = bytes(chars[pos:pos + 1]).upper()
+    return bytes(chars)
+
+def apply_rule(program, word):
+    """Apply a compiled rule to a word (bytes); returns None if the rule rejects it"""
+    memory = word
+    for function, args in program:
+        length = len(word)
+        if function == 'l':
+            word = word.lower()
+        elif function == 'u':
+            word = word.upper()
+        elif function == 'c':
+            word = word[:1].upper() + word[1:].lower()
+        elif function == 'C':
+            word = word[:1].lower() + word[1:].upper()
+        elif function == 't':
+            word = word.swapcase()
+        elif function == 'T':
+            if args[0] < length:
+                word = word[:args[0]] + word[args[0]:args[0] + 1].swapcase() + word[args[0] + 1:]
+        elif function == 'r':
+            word = word[::-1]
+        elif function == 'd':
+            word = word + word
+        elif function == 'p':
+            word = word * (args[0] + 1)
+        elif function == 'f':
+            word = word + word[::-1]
+        elif function == '{':
+            word = word[1:] + word[:1]
+        elif function == '}':
+            word = word[-1:] + word[:-1]
+        elif function == '$':
+            word = word + args[0]
+        elif function == '^':
+            word = args[0] + word
+        elif function == '[':
+            word = word[1:]
+        elif function == ']':
+            word = word[:-1]
+        elif function == 'D':
+            if args[0] < length:
+                word = word[:args[0]] + word[args[0] + 1:]
+        elif function == 'x':
+            if args[0] < length and args[0] + args[1] <= length:
+                word = word[args[0]:args[0] + args[1]]
+        elif function == 'O':
+            if args[0] < length and args[0] + args[1] <= length:
+                word = word[:args[0]] + word[args[0] + args[1]:]
+        elif function == 'i':
+            if args[0] <= length:
+                word = word[:args[0]] + args[1] + word[args[0]:]
+        elif function == 'o':
+            if args[0] < length:
+                word = word[:args[0]] + args[1] + word[args[0] + 1:]
+        elif function == "'":
+            if args[0] < length:
+                word = word[:args[0]]
+        elif function == 's':
+            word = word.replace(args[0], args[1])
+        elif function == '@':
+            word = word.replace(args[0], b'')
+        elif function == 'z':
+            word = word[:1] * args[0] + word
+        elif function == 'Z':
+            word = word + word[-1:] * args[0]
+        elif function == 'q':
+            word = bytes(byte for byte in word for _ in range(2))
+        elif function == 'k':
+            if length >= 2:
+                word = word[1:2] + word[:1] + word[2:]
+        elif function == 'K':
+            if length >= 2:
+                word = word[:-2] + word[-1:] + word[-2:-1]
+        elif function == '*':
+            if args[0] < length and args[1] < length:
+                chars = bytearray(word)
+                chars[args[0]], chars[args[1]] = chars[args[1]], chars[args[0]]
+                word = bytes(chars)
+        elif function in 'LR+-.,':
+            position = args[0]
+            if position >= length:
+                continue
+            chars = bytearray(word)
+            if function == 'L':
+                chars[position] = (chars[position] << 1) & 0xFF
+            elif function == 'R':
+                chars[position] >>= 1
+            elif function == '+':
+                chars[position] = (chars[position] + 1) & 0xFF
+            elif function == '-':
+                chars[position] = (chars[position] - 1) & 0xFF
+            elif function == '.':
+                if position + 1 >= length:
+                    continue
+                chars[position] = chars[position + 1]
+            elif function == ',':
+                if position == 0:
+                    continue
+                chars[position] = chars[position - 1]
+            word = bytes(chars)
+        elif function == 'y':
+            if args[0] <= length:
+                word = word[:args[0]] + word
+        elif function == 'Y':
+            if args[0] <= length:
+                word = word + word[length - args[0]:]
+        elif function == 'E':
+            word = _title_case(word, b' ')
+        elif function == 'e':
+            word = _title_case(word, args[0])
+        elif function == '3':
+            # Toggle the case of the character after the Nth occurrence of X
+            start = -1
+            for _ in range(args[0] + 1):
+                start = word.find(args[1], start + 1)
+                if start == -1:
+                    break
+            if start != -1 and start + 1 < length:
+                word = word[:start + 1] + word[start + 1:start + 2].swapcase() + word[start + 2:]
+        elif function == 'M':
+            memory = word
+        elif function == '4':
+            word = word + memory
+        elif function == '6':
+            word = memory + word
+        elif function == 'X':
+            if args[0] + args[1] <= len(memory) and args[2] <= length:
+                word = word[:args[2]] + memory[args[0]:args[0] + args[1]] + word[args[2]:]
+        # Rejection functions
+        elif function == '<':
+            if length > args[0]:
+                return None
+        elif function == '>':
+            if length < args[0]:
+                return None
+        elif function == '_':
+            if length != args[0]:
+                return None
+        elif function == '!':
+            if args[0] in word:
+                return None
+        elif function == '/':
+            if args[0] not in word:
+                return None
+        elif function == '(':
+            if word[:1] != args[0]:
+                return None
+        elif function == ')':
+            if word[-1:] != args[0]:
+                return None
+        elif function == '=':
+            if word[args[0]:args[0] + 1] != args[1]:
+                return None
+        elif function == '%':
+            if word.count(args[1]) < args[0]:
+                return None
+        elif function == 'Q':
+            if word == memory:
+                return None
+        if len(word) > RULE_MAX_LENGTH:
+            return None
+    return word
+
+def load_rules(rule_files):
+    """Load and compile the rules from one or more .rule files (looked up in rules/).
+
+    Returns (rules, skipped) where rules is a list of unique rule lines in file
+    order and skipped counts lines using functions this engine does not support.
+    """
+    rules = []
+    seen = set()
+    skipped = 0
+    for rule_file in rule_files:
+        path = _find_data_file(rule_file, 'rules')
+        if path is None:
+            raise ValueError(f"Rule file not found: {rule_file}")
+        with open(path, 'r', encoding='latin-1') as f:
+            for line in f:
+                line = line.rstrip('\r\n')
+                if not line.strip() or line.startswith('#'):
+                    continue
+                try:
+                    compile_rule(line)
+                except ValueError:
+                    skipped += 1
+                    continue
+                if line not in seen:
+                    seen.add(line)
+                    rules.append(line)
+    if not rules:
+        raise ValueError(f"No usable rules found in {', '.join(rule_files)}")
+    return rules, skipped
+
+def read_wordlist_chunks(wordlist, offset=0, chunk_words=1000):
+    """Stream a wordlist as (end_offset, words) chunks of raw bytes, starting at a byte offset"""
+    with open(wordlist, 'rb') as f:
+        f.seek(offset)
+        words = []
+        for line in f:
+            offset += len(line)
+            words.append(line.rstrip(b'\r\n'))
+            if len(words) >= chunk_words:
+                yield offset, words
+                words = []
+        if words:
+            yield offset, words
+
+def _decode_candidate(candidate):
+    """Decode a raw candidate for display and for the PDF libraries"""
+    try:
+        return candidate.decode('utf-8')
+    except UnicodeDecodeError:
+        return candidate.decode('latin-1')
+
+def format_duration(seconds):
+    """Format a time duration nicely"""
+    if seconds < 60:
+        return f"{seconds:.1f} seconds"
+    elif seconds < 3600:
+        return f"{seconds / 60:.1f} minutes"
+    else:
+        return f"{seconds / 3600:.1f} hours"
+
+def format_eta(seconds):
+    """Format a remaining-time estimate, up to years for very large keyspaces"""
+    if seconds is None:
+        return "unknown"
+    if seconds > 365 * 24 * 3600:
+        return f"~{seconds / (365 * 24 * 3600):.1f} years"
+    elif seconds > 30 * 24 * 3600:
+        return f"~{seconds / (30 * 24 * 3600):.1f} months"
+    elif seconds > 24 * 3600:
+        return f"~{seconds / (24 * 3600):.1f} days"
+    elif seconds > 3600:
+        return f"~{seconds / 3600:.1f} hours"
+    elif seconds > 60:
+        return f"~{seconds / 60:.1f} minutes"
+    else:
+        return f"~{seconds:.1f} seconds"
+
+LengthStats = namedtuple('LengthStats', ['length', 'size', 'done'])
+
+class ProgressStats(namedtuple('ProgressStats', [
+        'tried', 'total_tried', 'current', 'elapsed', 'workers',
+        'average_rate', 'instant_rate', 'window_rate', 'ewma_rate',
+        'keyspace_size', 'remaining', 'percent_done', 'eta_seconds', 'lengths'])):
+    """Snapshot of a run's progress, handed to the log and to stats_function.
+
+    tried counts this session, total_tried includes resumed sessions. Rates
+    are passwords/second: since the session started, since the previous
+    update, over the telemetry window, and exponentially weighted. remaining
+    is exact for keyspace runs and None for wordlist runs, where percent_done
+    follows the wordlist offset. lengths holds a LengthStats per password
+    length.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        rate = f"Rate: {self.ewma_rate:,.1f}/sec"
+        if self.workers > 1:
+            rate += f" ({self.workers} workers)"
+        if self.remaining is not None:
+            progress = f"Progress: {self.percent_done:.2f}% ({self.remaining:,} left)"
+        else:
+            progress = f"Wordlist: {self.percent_done:.1f}%"
+        return (f"Tried: {self.total_tried:,} | Current: {self.current} | {rate} | {progress} | " +
+                f"Elapsed: {format_duration(self.elapsed)} | Est. completion: {format_eta(self.eta_seconds)}")
+
+    def breakdown(self):
+        """Lines describing the rates and the progress of each password length"""
+        lines = [f"  Rate: {self.ewma_rate:,.1f}/sec weighted, {self.window_rate:,.1f}/sec recent, " +
+                 f"{self.instant_rate:,.1f}/sec now, {self.average_rate:,.1f}/sec average"]
+        for length in self.lengths:
+            lines.append(f"  Length {length.length}: {length.done:,} / {length.size:,} " +
+                         f"({length.done * 100 / length.size:.1f}%)")
+        return lines
+
+class RunTelemetry:
+    """Throughput tracking for a run.
+
+    update() is called with the cumulative attempt count. Besides the overall
+    average it keeps the rate since the previous update, the rate over the last
+    `window` seconds and a time-weighted EWMA with a `half_life` in seconds,
+    which follows slowdowns (e.g. longer candidates) without the noise of the
+    instantaneous rate.
+    """
+
+    def __init__(self, window=60.0, half_life=30.0):
+        self.window = window
+        self.half_life = half_life
+        self.start()
+
+    def start(self, now=None):
+        now = time.time() if now is None else now
+        self.start_time = now
+        self.samples = deque([(now, 0)])
+        self.instant_rate = 0.0
+        self.ewma_rate = None
+
+    def update(self, tried, now=None):
+        now = time.time() if now is None else now
+        last_time, last_tried = self.samples[-1]
+        elapsed = now - last_time
+        if elapsed <= 0:
+            return
+        self.instant_rate = (tried - last_tried) / elapsed
+        if self.ewma_rate is None:
+            self.ewma_rate = self.instant_rate
+        else:
+            weight = 1 - 0.5 ** (elapsed / self.half_life)
+            self.ewma_rate += weight * (self.instant_rate - self.ewma_rate)
+        self.samples.append((now, tried))
+        # Keep one sample at or before the window start as its baseline
+        while len(self.samples) > 2 and self.samples[1][0] <= now - self.window:
+            self.samples.popleft()
+
+    @property
+    def average_rate(self):
+        now, tried = self.samples[-1]
+        return tried / (now - self.start_time) if now > self.start_time else 0.0
+
+    @property
+    def window_rate(self):
+        (first_time, first_tried), (now, tried) = self.samples[0], self.samples[-1]
+        return (tried - first_tried) / (now - first_time) if now > first_time else 0.0
+
+    @property
+    def rate(self):
+        """Best current estimate of the rate, for ETAs"""
+        return self.ewma_rate or self.window_rate or self.average_rate
+
+class CheckpointJournal:
+    """Append-only JSON-lines checkpoint journal.
+
+    Every record is flushed and fsync'd as it is written, so after a crash the
+    last complete line is a durable resume point; a torn final line is simply
+    ignored. A 'start' record carries the run settings, and checkpoints only
+    count as resume points under a start record with matching settings. The
+    file is compacted to its latest state once it grows past max_records.
+    """
+
+    def __init__(self, path, max_records=1000):
+        self.path = path
+        self.max_records = max_records
+        self.settings = None
+        self._file = None
+        self._records = 0
+
+    def read(self):
+        """Return every complete record in the journal"""
+        records = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # Torn write from a crash
+                        continue
+        except OSError:
+            pass
+        return records
+
+    def last_checkpoint(self, settings):
+        """Return the newest checkpoint written under these settings, if the run did not finish"""
+        last = None
+        matching = False
+        for record in self.read():
+            kind = record.get('type')
+            if kind == 'start':
+                matching = record.get('settings') == settings
+                if matching:
+                    last = record.get('checkpoint')
+            elif kind == 'checkpoint' and matching:
+                last = record
+            elif kind == 'finished' and matching:
+                last = None
+        return last
+
+    def start(self, settings, checkpoint=None):
+        """Begin a run: record its settings (and the checkpoint it resumes from)"""
+        self.settings = settings
+        self.append({'type': 'start', 'settings': settings, 'checkpoint': checkpoint,
+                     'timestamp': datetime.now().isoformat()})
+
+    def append(self, record):
+        """Durably append one record"""
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._records += 1
+        if self._records >= self.max_records and record.get('type') == 'checkpoint':
+            self._compact(record)
+
+    def _compact(self, checkpoint):
+        """Replace the journal with a start record holding the latest checkpoint"""
+        self.close()
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'type': 'start', 'settings': self.settings, 'checkpoint': checkpoint,
+                                'timestamp': datetime.now().isoformat()}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self._records = 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+# Backend chosen by the startup calibration, per document fingerprint
+BACKEND_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".p4wnforge", "backends.json")
+
+def document_fingerprint(pdf_file):
+    """Cache key for a document's backend choice, from what the calibration depends on.
+    
+    A SHA-256 over the /Encrypt values (V, R, Length, O, U, P, and OE, UE and Perms
+    for R5/R6), the first /ID string, and the file size and modification time.
+    Only the trailer and cross-reference chain are read, not the whole file.
+    """
+    info = os.stat(pdf_file)
+    digest = hashlib.sha256(f"{info.st_size}:{info.st_mtime_ns}".encode())
+    try:
+        encrypt, document_id = StandardSecurityHandler.read_encryption(pdf_file)
+    except ValueError:
+        encrypt, document_id = {}, b''  # Not encrypted; the calibration reports it
+    for key in ('V', 'R', 'Length', 'O', 'U', 'P', 'OE', 'UE', 'Perms'):
+        digest.update(repr((key, encrypt.get(key))).encode())
+    digest.update(repr(('ID', document_id)).encode())
+    return digest.hexdigest()
+
+def load_backend_cache(path=BACKEND_CACHE_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_backend_cache(cache, path=BACKEND_CACHE_FILE):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(temp_path, path)
 
 class PDFBruteForcer:
     def __init__(self, pdf_file, options):
@@ -69,37 +1444,152 @@ class PDFBruteForcer:
         self.min_length = options.get('min_length', 1)
         self.max_length = options.get('max_length', 8)
         self.character_set = self._get_charset(options.get('charset', 'digits'))
-        self.library = options.get('library', AVAILABLE_LIBRARIES[0][0])
+        # 'auto' times every backend on this file and picks the fastest correct one
+        self.library = options.get('library') or 'auto'
         self.save_progress = options.get('save_progress', True)
         self.progress_file = options.get('progress_file', f"{os.path.basename(pdf_file)}.progress")
         self.start_from = options.get('start_from', '')
+        self.start_index = options.get('start_index', 0)
         self.show_progress_every = options.get('show_progress_every', 1000)
+        # Called with a ProgressStats on every progress update (e.g. by the GUI)
+        self.stats_function = options.get('stats_function')
+        self.telemetry = RunTelemetry()
+        self.stats = None
         self.save_progress_every = options.get('save_progress_every', 10000)
+        self.workers = max(1, options.get('workers', 1))
+        # Concurrent qpdf processes per worker when checking with the qpdf tool
+        self.qpdf_processes = max(1, options.get('qpdf_processes', os.cpu_count() or 1))
+        self._qpdf_warned = False
+        self.block_size = max(1, options.get('block_size', 256))
+        self.charset_bytes = self.character_set.encode('latin-1')
+        self.options = options
+        
+        # Mask mode: hashcat-style masks (or a .hcmask file) replace the uniform charset
+        self.mask = options.get('mask')
+        self.custom_charsets = options.get('custom_charsets') or []
+        self.increment = options.get('increment', False)
+        self.masks = load_masks(self.mask, self.custom_charsets) if self.mask else []
+        self.segments = self._build_segments()
+        self._segment_starts = [first_index for _, first_index, _ in self.segments]
+        self.keyspace_size = self._calculate_combinations()
+        
+        # Dictionary mode: stream a wordlist, amplified by hashcat rules
+        self.wordlist = options.get('wordlist')
+        self.rule_files = options.get('rules') or []
+        if isinstance(self.rule_files, str):
+            self.rule_files = [self.rule_files]
+        self.rules, rules_skipped = load_rules(self.rule_files) if self.rule_files else ([':'], 0)
+        self.rule_programs = [compile_rule(rule) for rule in self.rules]
+        self.wordlist_offset = 0
+        # Words per chunk handed to a worker; by default about one block after rule amplification
+        self.chunk_words = options.get('chunk_words') or max(1, self.block_size // len(self.rule_programs))
+        if self.wordlist and not os.path.isfile(self.wordlist):
+            raise ValueError(f"Wordlist not found: {self.wordlist}")
         
         self.passwords_tried = 0
         self.start_time = None
         self.current_password = None
         self.found_password = None
+        self.found_owner_password = None
+        
+        # Which password to recover: the user (open) password, the owner password, or both
+        self.target = options.get('target', 'user')
+        if self.target not in ('user', 'owner', 'both'):
+            raise ValueError(f"Invalid target '{self.target}' (use user, owner or both)")
         
         # Custom logger - by default uses print, but can be replaced
         self.log = options.get('log_function', print)
         
+        # Parse the encryption dictionary once for the native verifier
+        self.verifier = None
+        self.backend_rates = {}
+        if self.library == 'auto':
+            self.library = self._select_library(options)
+        elif not library_available(self.library):
+            raise ValueError(f"Library '{self.library}' is not available " +
+                             f"(use auto, {', '.join(lib for lib, _ in available_libraries())})")
+        if self.library == "native":
+            try:
+                self.verifier = StandardSecurityHandler.from_file(self.pdf_file)
+            except (OSError, ValueError) as e:
+                fallback = next((lib for lib, _ in available_libraries() if lib != "native"), None)
+                if fallback is None:
+                    raise ValueError(f"Native verifier unavailable ({e}) and no PDF library installed")
+                self.log(f"Native verifier unavailable ({e}), falling back to {fallback}")
+                self.library = fallback
+        if self.target != 'user':
+            if not self.verifier:
+                raise ValueError("Recovering the owner password needs the native verifier (--library native)")
+            # Many documents only set an owner password; an empty user password needs no search
+            if self.target == 'both' and self.verifier.check_user_password(b''):
+                self.found_password = ''
+                self.verifier.set_user_password(b'')
+            self.verifier.targets = self._pending_targets()
+        
         # Display initial configuration
         self.log(f"\nPDF Brute Force Configuration:")
         self.log(f"  File: {self.pdf_file}")
-        self.log(f"  Length: {self.min_length} to {self.max_length} characters")
-        self.log(f"  Character set: {self._describe_charset(options.get('charset', 'digits'))}")
+        if self.wordlist:
+            self.log(f"  Wordlist: {self.wordlist} ({os.path.getsize(self.wordlist):,} bytes)")
+            if self.rule_files:
+                self.log(f"  Rules: {len(self.rules):,} from {', '.join(self.rule_files)}" +
+                         (f" ({rules_skipped:,} unsupported skipped)" if rules_skipped else ""))
+        elif self.masks:
+            if len(self.masks) == 1:
+                self.log(f"  Mask: {self.masks[0][0]}" + (" (increment)" if self.increment else ""))
+            else:
+                self.log(f"  Masks: {len(self.masks):,} from {self.mask}" + (" (increment)" if self.increment else ""))
+        else:
+            self.log(f"  Length: {self.min_length} to {self.max_length} characters")
+            self.log(f"  Character set: {self._describe_charset(options.get('charset', 'digits'))}")
         self.log(f"  Library: {self.library}")
-        if self.start_from:
-            self.log(f"  Resuming from: '{self.start_from}'")
-        self.log(f"  Total possible combinations: {self._calculate_combinations():,}")
-        self.log(f"  Progress file: {self.progress_file if self.save_progress else 'Disabled'}")
-        self.log("")
-        
+        if self.target != 'user':
+            self.log(f"  Target: {'user and owner' if self.target == 'both' else self.target} password")
+            if self.found_password == '':
+                self.log("  User password: (empty)")
+        if self.workers > 1:
+            self.log(f"  Worker processes: {self.workers}")
+        if self.verifier:
+            self.log(f"  Encryption: {self.verifier.describe()}")
         self.stopped = False  # Flag to track if process should stop
+        self.current_index = None
+        
+        # Crash-safe checkpoints: the last durable journal record is resumed
+        # automatically unless a start point is given or a restart is requested
+        self.journal_file = options.get('journal_file', f"{self.progress_file}.journal")
+        self.checkpoint_interval = options.get('checkpoint_interval', 5)
+        self.journal = CheckpointJournal(self.journal_file) if self.save_progress else None
+        self.ranges = None
+        self.previous_tried = 0
+        self.previous_elapsed = 0
+        self.resumed_checkpoint = None
+        if self.journal and not self.start_from and not options.get('restart'):
+            self.resumed_checkpoint = self.journal.last_checkpoint(self._run_settings())
         
-        # Load progress from file if available
-        self.load_progress()
+        # Otherwise load progress from file if available, and seek to it when resuming
+        progress = self.load_progress()
+        if self.resumed_checkpoint:
+            self._apply_checkpoint(self.resumed_checkpoint)
+        elif options.get('resume') and progress:
+            self._apply_progress(progress)
+        elif self.start_from and not self.wordlist:
+            # A plain-string resume point is converted to its keyspace index once
+            self.start_index = self._password_to_index(self.start_from)
+        if self.ranges is None:
+            self.ranges = [(self.start_index, self.keyspace_size)]
+        
+        if self.resumed_checkpoint:
+            self.log(f"  Resuming from checkpoint journal: {self.previous_tried:,} passwords tried " +
+                     f"in {self._format_time(self.previous_elapsed)}")
+        if self.wordlist:
+            if self.wordlist_offset:
+                self.log(f"  Resuming from wordlist offset {self.wordlist_offset:,}")
+        else:
+            if self.start_index and self.start_index < self.keyspace_size:
+                self.log(f"  Resuming from: '{self._index_to_password(self.start_index)}' (index {self.start_index:,})")
+            self.log(f"  Total possible combinations: {self.keyspace_size:,}")
+        self.log(f"  Progress file: {self.progress_file if self.save_progress else 'Disabled'}")
+        self.log("")
     
     def _get_charset(self, charset_name):
         """Get the actual character set based on the name"""
@@ -150,13 +1640,130 @@ class PDFBruteForcer:
         combined = " + ".join(parts)
         return f"Custom set ({combined}) - {len(self._get_charset(charset_name))} characters"
     
+    def _build_segments(self):
+        """Build the keyspace as (position_charsets, first_index, size) segments.
+        
+        Each segment is one mixed-radix block of the keyspace: one segment per
+        password length for a plain charset, one per mask (and per prefix length
+        when incrementing) in mask mode.
+        """
+        if self.masks:
+            shapes = []
+            for _, positions in self.masks:
+                if self.increment:
+                    for length in range(max(1, self.min_length), len(positions) + 1):
+                        shapes.append(tuple(positions[:length]))
+                else:
+                    shapes.append(tuple(positions))
+        else:
+            shapes = [(self.charset_bytes,) * length for length in range(self.min_length, self.max_length + 1)]
+        
+        segments = []
+        first_index = 0
+        for positions in shapes:
+            size = 1
+            for charset in positions:
+                size *= len(charset)
+            if size:
+                segments.append((positions, first_index, size))
+                first_index += size
+        return segments
+    
     def _calculate_combinations(self):
         """Calculate the total number of possible combinations"""
-        charset_size = len(self.character_set)
-        total = 0
-        for length in range(self.min_length, self.max_length + 1):
-            total += charset_size ** length
-        return total
+        if not self.segments:
+            return 0
+        positions, first_index, size = self.segments[-1]
+        return first_index + size
+    
+    def _keyspace_segments(self):
+        """Return (position_charsets, first_index, size) for each block of the keyspace"""
+        return self.segments
+    
+    def _find_segment(self, index):
+        """Return the segment containing a keyspace index"""
+        pos = bisect.bisect_right(self._segment_starts, index) - 1
+        if pos < 0 or index >= self.keyspace_size:
+            raise IndexError(f"Keyspace index {index} out of range")
+        return self.segments[pos]
+    
+    def _index_to_password(self, index):
+        """Convert a keyspace index to its password (mixed-radix decode)"""
+        positions, first_index, size = self._find_segment(index)
+        offset = index - first_index
+        chars = bytearray(len(positions))
+        for pos in range(len(positions) - 1, -1, -1):
+            offset, digit = divmod(offset, len(positions[pos]))
+            chars[pos] = positions[pos][digit]
+        return chars.decode('latin-1')
+    
+    def _password_to_index(self, password):
+        """Convert a password to its keyspace index (mixed-radix encode)"""
+        encoded = password.encode('latin-1', errors='replace')
+        for positions, first_index, size in self.segments:
+            if len(encoded) != len(positions):
+                continue
+            if not all(byte in charset for byte, charset in zip(encoded, positions)):
+                continue
+            offset = 0
+            for byte, charset in zip(encoded, positions):
+                offset = offset * len(charset) + charset.index(byte)
+            return first_index + offset
+        if self.masks:
+            raise ValueError(f"'{password}' does not match any of the selected masks")
+        for char in password:
+            if char not in self.character_set:
+                raise ValueError(f"Character '{char}' in '{password}' is not in the selected character set")
+        raise ValueError(f"'{password}' is not between {self.min_length} and {self.max_length} characters long")
+    
+    def _generate_range(self, start, end):
+        """Generate the passwords with keyspace indices in [start, end)"""
+        for first_index, length, count, block in self._generate_blocks(start, end):
+            if self.stopped:
+                return
+            for slot in range(0, count * length, length):
+                yield block[slot:slot + length].decode('latin-1')
+    
+    def _generate_blocks(self, start, end, block_size=None):
+        """Generate the candidates with indices in [start, end) as fixed-size blocks.
+        
+        Yields (first_index, length, count, block) where block is a preallocated
+        bytearray holding `count` passwords of `length` bytes back to back. The
+        buffer is reused for the next block, so consumers must not keep it.
+        """
+        block_size = block_size or self.block_size
+        for positions, first_index, size in self.segments:
+            lo = max(start, first_index)
+            hi = min(end, first_index + size)
+            if lo >= hi:
+                continue
+            
+            length = len(positions)
+            radices = [len(charset) for charset in positions]
+            digits = [0] * length
+            offset = lo - first_index
+            for pos in range(length - 1, -1, -1):
+                offset, digits[pos] = divmod(offset, radices[pos])
+            current = bytearray(positions[pos][d] for pos, d in enumerate(digits))
+            buffer = bytearray(block_size * length)
+            
+            index = lo
+            while index < hi:
+                count = min(block_size, hi - index)
+                for slot in range(0, count * length, length):
+                    buffer[slot:slot + length] = current
+                    # Odometer-style increment of the candidate in place
+                    pos = length - 1
+                    while pos >= 0:
+                        digits[pos] += 1
+                        if digits[pos] < radices[pos]:
+                            current[pos] = positions[pos][digits[pos]]
+                            break
+                        digits[pos] = 0
+                        current[pos] = positions[pos][0]
+                        pos -= 1
+                yield index, length, count, buffer
+                index += count
     
     def _try_password_pikepdf(self, password):
         """Try to decrypt PDF using pikepdf"""
@@ -176,8 +1783,10 @@ class PDFBruteForcer:
         """Try to decrypt PDF using PyPDF2"""
         try:
             with open(self.pdf_file, 'rb') as f:
-                pdf = PyPDF2.PdfFileReader(f)
-                if pdf.isEncrypted:
+                # PyPDF2 3.x removed PdfFileReader and the camelCase properties
+                reader_class = getattr(PyPDF2, 'PdfReader', None) or PyPDF2.PdfFileReader
+                pdf = reader_class(f)
+                if pdf.is_encrypted if hasattr(pdf, 'is_encrypted') else pdf.isEncrypted:
                     result = pdf.decrypt(password)
                     return result > 0
                 else:
@@ -193,9 +1802,9 @@ class PDFBruteForcer:
             with open(self.pdf_file, 'rb') as f:
                 pdf = pypdf.PdfReader(f)
                 if pdf.is_encrypted:
+                    # decrypt() reports a wrong password as NOT_DECRYPTED (0) rather than raising
                     try:
-                        pdf.decrypt(password)
-                        return True
+                        return bool(pdf.decrypt(password))
                     except:
                         return False
                 else:
@@ -205,41 +1814,252 @@ class PDFBruteForcer:
             self.log(f"pypdf error: {e}")
             return False
     
+    def _qpdf_command(self, password):
+        """qpdf command that only checks a password: no decrypted copy is written.
+        
+        With --requires-password qpdf exits with 3 when the password opens the
+        file, 0 when a (different) password is still required and 2 when the
+        file is not encrypted.
+        """
+        return ['qpdf', '--requires-password', '--password=' + password, self.pdf_file]
+    
+    def _qpdf_result(self, returncode):
+        """Interpret a qpdf --requires-password exit code"""
+        if returncode == 3:
+            return True
+        if returncode == 2 and not self._qpdf_warned:
+            self._qpdf_warned = True
+            self.log("Error: PDF is not encrypted according to qpdf")
+        return False
+    
     def _try_password_qpdf(self, password):
-        """Try to decrypt PDF using qpdf command line tool"""
+        """Try a password using the qpdf command line tool"""
         try:
-            import subprocess
-            import tempfile
-            
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp:
-                temp_path = temp.name
-            
-            try:
-                cmd = ['qpdf', '--password=' + password, '--decrypt', self.pdf_file, temp_path]
-                process = subprocess.run(
-                    cmd, 
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE,
-                    universal_newlines=True
-                )
-                
-                # Check if successful
-                if process.returncode == 0:
-                    return True
-                elif "invalid password" in process.stderr.lower():
-                    return False
-                else:
-                    return False
-            finally:
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
+            process = subprocess.run(self._qpdf_command(password),
+                                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return self._qpdf_result(process.returncode)
         except Exception as e:
             self.log(f"qpdf error: {e}")
             return False
     
+    def _try_passwords_qpdf(self, passwords):
+        """Check candidates with a bounded pool of concurrent qpdf processes.
+        
+        Returns the index of the first matching password, or -1.
+        """
+        running = deque()
+        candidates = enumerate(passwords)
+        try:
+            while True:
+                # Keep up to qpdf_processes checks in flight
+                while len(running) < self.qpdf_processes:
+                    item = next(candidates, None)
+                    if item is None:
+                        break
+                    index, password = item
+                    running.append((index, subprocess.Popen(self._qpdf_command(password),
+                                                            stdout=subprocess.DEVNULL,
+                                                            stderr=subprocess.DEVNULL)))
+                if not running:
+                    return -1
+                index, process = running.popleft()
+                if self._qpdf_result(process.wait()):
+                    return index
+        except Exception as e:
+            self.log(f"qpdf error: {e}")
+            return -1
+        finally:
+            for _, process in running:
+                process.kill()
+                process.wait()
+    
+    def _try_password_native(self, password):
+        """Try a password against the parsed /Encrypt dictionary"""
+        return self.verifier.check_user_password(self.verifier.encode_password(password))
+    
+    def confirm_password(self, password):
+        """Confirm a native verifier hit by opening the file with the installed PDF libraries.
+        
+        A hit is rejected only when a library definitely reports a wrong password.
+        A library that fails or cannot handle this security handler (e.g. pypdf
+        without an AES provider on an R4-AES or R6 file) leaves the decision to the
+        next one.
+        """
+        for lib, _ in available_libraries():
+            if lib == "native":
+                continue
+            self.log(f"Confirming password with {lib}...")
+            verdict = self._library_verdict(lib, password)
+            if verdict is not None:
+                return verdict
+        # No library could check the password; trust the specification math
+        return True
+    
+    def _library_verdict(self, lib, password):
+        """True or False if lib can tell whether password opens the file, None if it cannot"""
+        try:
+            if lib == "pikepdf":
+                try:
+                    with pikepdf.open(self.pdf_file, password=password):
+                        return True
+                except pikepdf.PasswordError:
+                    return False
+            elif lib in ("PyPDF2", "pypdf"):
+                module = PyPDF2 if lib == "PyPDF2" else pypdf
+                with open(self.pdf_file, 'rb') as f:
+                    reader_class = getattr(module, 'PdfReader', None) or module.PdfFileReader
+                    pdf = reader_class(f)
+                    if not (pdf.is_encrypted if hasattr(pdf, 'is_encrypted') else pdf.isEncrypted):
+                        return None
+                    # A wrong password is reported as NOT_DECRYPTED (0); missing AES support raises
+                    return bool(pdf.decrypt(password))
+            elif lib == "qpdf":
+                process = subprocess.run(self._qpdf_command(password),
+                                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                # 3: the password opens the file, 0: a password is still required
+                return {3: True, 0: False}.get(process.returncode)
+        except Exception as e:
+            self.log(f"{lib} could not check the password: {e}")
+        return None
+    
+    def try_block(self, block, length, count, start=0):
+        """Try a block of candidates; return the offset of the first match or -1"""
+        if self.verifier:
+            return self.verifier.check_block(block, length, count, start)
+        if self.library == "qpdf":
+            index = self._try_passwords_qpdf([block[offset * length:(offset + 1) * length].decode('latin-1')
+                                              for offset in range(start, count)])
+            return start + index if index != -1 else -1
+        for offset in range(start, count):
+            if self.try_password(block[offset * length:(offset + 1) * length].decode('latin-1')):
+                return offset
+        return -1
+    
+    def match_candidate(self, candidate):
+        """Try a raw (bytes) candidate; return the targets it matches ('user', 'owner'), empty if none"""
+        if self.verifier:
+            return self.verifier.match_password(candidate[:127 if self.verifier.R >= 5 else 32])
+        return ('user',) if self.try_password(_decode_candidate(candidate)) else ()
+    
+    def _pending_targets(self):
+        """Targets ('user', 'owner') whose password has not been found yet"""
+        targets = []
+        if self.target in ('user', 'both') and self.found_password is None:
+            targets.append('user')
+        if self.target in ('owner', 'both') and self.found_owner_password is None:
+            targets.append('owner')
+        return tuple(targets)
+    
+    def _record_hit(self, password, matched):
+        """Record a password hit for the targets in matched ('user' and/or 'owner');
+        returns True once every target is found"""
+        found = [which for which in matched if which in self._pending_targets()]
+        for which in found:
+            if which == 'owner':
+                self.found_owner_password = password
+            else:
+                self.found_password = password
+                if self.verifier:
+                    self.verifier.set_user_password(self.verifier.encode_password(password))
+        
+        pending = self._pending_targets()
+        if found and pending:
+            self.verifier.targets = pending
+            self.log(f"{found[0].capitalize()} password found: '{password}', still searching for the {pending[0]} password")
+        return not pending
+    
+    def _try_words(self, words):
+        """Apply every rule to each word and try the candidates.
+        
+        Returns (candidates_tried, hits) where hits is a list of
+        (password, matched targets). Stops early once every target is found.
+        """
+        if self.library == "qpdf" and not self.verifier:
+            return self._try_words_qpdf(words)
+        tried = 0
+        hits = []
+        for word in words:
+            for program in self.rule_programs:
+                candidate = apply_rule(program, word) if program else word
+                if candidate is None:
+                    continue
+                tried += 1
+                matched = self.match_candidate(candidate)
+                if matched:
+                    password = _decode_candidate(candidate)
+                    if not self.verifier or self.confirm_password(password):
+                        hits.append((password, matched))
+                        if self._record_hit(password, matched):
+                            return tried, hits
+                    else:
+                        self.log(f"Warning: '{password}' matched the native verifier but was rejected by the PDF library")
+        return tried, hits
+    
+    def _try_words_qpdf(self, words):
+        """_try_words for qpdf: check the chunk's candidates through the process pool"""
+        passwords = [_decode_candidate(candidate) for word in words for program in self.rule_programs
+                     for candidate in [apply_rule(program, word) if program else word] if candidate is not None]
+        hits = []
+        start = 0
+        while start < len(passwords):
+            index = self._try_passwords_qpdf(passwords[start:])
+            if index == -1:
+                break
+            password = passwords[start + index]
+            hits.append((password, ('user',)))
+            if self._record_hit(password, ('user',)):
+                return start + index + 1, hits
+            start += index + 1
+        return len(passwords), hits
+    
+    def _select_library(self, options):
+        """Pick the fastest backend that answers correctly on this document.
+        
+        The choice is cached per document fingerprint together with the set of
+        installed backends, so a file is only calibrated again when that changes
+        or when 'recalibrate' is set.
+        """
+        available = [lib for lib, _ in available_libraries()]
+        if self.target != 'user':
+            return "native"
+        cache_file = options.get('backend_cache', BACKEND_CACHE_FILE)
+        try:
+            fingerprint = document_fingerprint(self.pdf_file)
+        except OSError as e:
+            raise ValueError(f"Cannot read {self.pdf_file}: {e}")
+        cache = load_backend_cache(cache_file)
+        entry = cache.get(fingerprint)
+        if (not options.get('recalibrate') and isinstance(entry, dict) and
+                entry.get('library') in available and entry.get('libraries') == available):
+            self.backend_rates = entry.get('rates', {})
+            self.log(f"Using {entry['library']} for this file (calibrated {entry.get('timestamp', 'earlier')}, " +
+                     f"{self.backend_rates.get(entry['library'], 0):,.1f} passwords/second)")
+            return entry['library']
+        
+        self.log("Calibrating password check backends on this file...")
+        self.backend_rates = self.benchmark(seconds=options.get('calibration_seconds', 1.0))
+        if not self.backend_rates:
+            raise ValueError("No backend could check passwords for this file correctly")
+        library = max(self.backend_rates, key=self.backend_rates.get)
+        self.log(f"Selected {library} ({self.backend_rates[library]:,.1f} passwords/second)")
+        cache[fingerprint] = {
+            'library': library,
+            'libraries': available,
+            'rates': self.backend_rates,
+            'file': os.path.abspath(self.pdf_file),
+            'timestamp': datetime.now().isoformat(timespec='seconds')
+        }
+        try:
+            save_backend_cache(cache, cache_file)
+        except OSError as e:
+            self.log(f"Warning: could not save backend choice: {e}")
+        return library
+    
     def try_password(self, password):
         """Try a password using the selected library"""
-        if self.library == "pikepdf":
+        if self.library == "native":
+            return self._try_password_native(password)
+        elif self.library == "pikepdf":
             return self._try_password_pikepdf(password)
         elif self.library == "PyPDF2":
             return self._try_password_pypdf2(password)
@@ -247,18 +2067,140 @@ class PDFBruteForcer:
             return self._try_password_pypdf(password)
         elif self.library == "qpdf":
             return self._try_password_qpdf(password)
+        raise ValueError(f"Unknown library '{self.library}'")
+    
+    def benchmark(self, seconds=2.0):
+        """Measure passwords/second for the native verifier and each installed library.
+        
+        Each backend first has to agree with the native verifier on a couple of
+        probe passwords (a wrong one and the empty one), then gets the same stream
+        of wrong candidates for up to `seconds`. Returns a dict of library name to
+        rate for the backends that answered correctly.
+        """
+        verifier, library, log = self.verifier, self.library, self.log
+        try:
+            reference = verifier or StandardSecurityHandler.from_file(self.pdf_file)
+        except (OSError, ValueError) as e:
+            reference = None
+            self.log(f"  native: unavailable ({e})")
+        probes = [("~probe-wrong~", False)]
+        if reference:
+            probes = [(password, reference.check_user_password(reference.encode_password(password)))
+                      for password, _ in probes] + [("", reference.check_user_password(b''))]
+        rates = {}
+        try:
+            for lib, _ in available_libraries():
+                self.library = lib
+                if lib == "native":
+                    if not reference:
+                        continue
+                    self.verifier = reference
+                else:
+                    self.verifier = None
+                
+                # A backend that logs errors is not really checking passwords
+                errors = []
+                self.log = errors.append
+                wrong = [password for password, expected in probes
+                         if self.try_password(password) != expected and not errors]
+                tried = 0
+                start = time.time()
+                while time.time() - start < seconds and not errors and not wrong:
+                    self.try_password(f"~bench{tried:08d}")
+                    tried += 1
+                elapsed = time.time() - start
+                self.log = log
+                if errors:
+                    self.log(f"  {lib}: failed ({errors[0]})")
+                    continue
+                if wrong:
+                    self.log(f"  {lib}: failed (wrong answer for {wrong[0]!r})")
+                    continue
+                rates[lib] = tried / elapsed
+                self.log(f"  {lib}: {rates[lib]:,.1f} passwords/second")
+        finally:
+            self.verifier, self.library, self.log = verifier, library, log
+        return rates
+    
+    def _run_settings(self):
+        """Settings a checkpoint is only valid for"""
+        return {
+            'pdf_file': os.path.abspath(self.pdf_file),
+            'charset': self.character_set,
+            'mask': self.mask,
+            'custom_charsets': list(self.custom_charsets),
+            'increment': self.increment,
+            'min_length': self.min_length,
+            'max_length': self.max_length,
+            'wordlist': os.path.abspath(self.wordlist) if self.wordlist else None,
+            'rules': list(self.rule_files),
+            'target': self.target
+        }
+    
+    def _apply_checkpoint(self, checkpoint):
+        """Restore the remaining work and counters from a journal checkpoint"""
+        if checkpoint.get('ranges') is not None:
+            self.ranges = [tuple(r) for r in checkpoint['ranges']]
+            self.start_index = self.ranges[0][0] if self.ranges else self.keyspace_size
+        self.wordlist_offset = checkpoint.get('wordlist_offset') or 0
+        self.previous_tried = checkpoint.get('passwords_tried', 0)
+        self.previous_elapsed = checkpoint.get('elapsed', 0)
+        # A 'both' run may already have found one of the two passwords
+        for which, key in (('user', 'found_password'), ('owner', 'found_owner_password')):
+            if checkpoint.get(key) is not None:
+                self._record_hit(checkpoint[key], (which,))
+    
+    def _write_checkpoint(self, force=False):
+        """Append a checkpoint of the remaining work, at most every checkpoint_interval seconds"""
+        if not self.journal or not self.start_time:
+            return
+        now = time.time()
+        if not force and now - self._last_checkpoint < self.checkpoint_interval:
+            return
+        self._last_checkpoint = now
+        elapsed = now - self.start_time
+        record = {
+            'type': 'checkpoint',
+            'passwords_tried': self.previous_tried + self.passwords_tried,
+            'rate': self.passwords_tried / elapsed if elapsed > 0 else 0,
+            'elapsed': self.previous_elapsed + elapsed,
+            'found_password': self.found_password,
+            'found_owner_password': self.found_owner_password,
+            'time': now
+        }
+        if self.wordlist:
+            record['wordlist_offset'] = self.wordlist_offset
         else:
-            # Fallback to trying all available methods
-            for lib, _ in AVAILABLE_LIBRARIES:
-                if lib == "pikepdf" and self._try_password_pikepdf(password):
-                    return True
-                elif lib == "PyPDF2" and self._try_password_pypdf2(password):
-                    return True
-                elif lib == "pypdf" and self._try_password_pypdf(password):
-                    return True
-                elif lib == "qpdf" and self._try_password_qpdf(password):
-                    return True
-            return False
+            record['keyspace_index'] = self.ranges[0][0] if self.ranges else self.keyspace_size
+            record['ranges'] = [list(r) for r in self.ranges]
+        try:
+            self.journal.append(record)
+        except OSError as e:
+            self.log(f"Warning: Could not write checkpoint: {e}")
+    
+    def _start_journal(self):
+        """Open the checkpoint journal for this run"""
+        self._last_checkpoint = time.time()
+        if not self.journal:
+            return
+        try:
+            self.journal.start(self._run_settings(), self.resumed_checkpoint)
+        except OSError as e:
+            self.log(f"Warning: Could not open checkpoint journal: {e}")
+            self.journal = None
+    
+    def _finish_journal(self, finished):
+        """Close the journal; a finished run leaves nothing to resume"""
+        if not self.journal:
+            return
+        try:
+            if finished:
+                self.journal.append({'type': 'finished', 'timestamp': datetime.now().isoformat()})
+            else:
+                self._write_checkpoint(force=True)
+        except OSError as e:
+            self.log(f"Warning: Could not write checkpoint: {e}")
+        self.journal.close()
     
     def save_current_progress(self):
         """Save the current progress to a file"""
@@ -270,11 +2212,19 @@ class PDFBruteForcer:
                 'pdf_file': self.pdf_file,
                 'passwords_tried': self.passwords_tried,
                 'current_password': self.current_password,
+                'keyspace_index': self.current_index if self.current_index is not None else self.start_index,
+                'keyspace_size': self.keyspace_size,
                 'duration': time.time() - self.start_time if self.start_time else 0,
                 'timestamp': datetime.now().isoformat(),
                 'charset': ''.join(self.character_set),
+                'mask': self.mask,
+                'custom_charsets': self.custom_charsets,
+                'increment': self.increment,
                 'min_length': self.min_length,
-                'max_length': self.max_length
+                'max_length': self.max_length,
+                'wordlist': self.wordlist,
+                'rules': self.rule_files,
+                'wordlist_offset': self.wordlist_offset
             }
             
             with open(self.progress_file, 'w') as f:
@@ -294,148 +2244,487 @@ class PDFBruteForcer:
             self.log(f"Warning: Could not load progress file: {e}")
             return None
     
+    def _apply_progress(self, progress):
+        """Seek to the keyspace index (or wordlist offset) stored in a progress file"""
+        if self.wordlist:
+            if progress.get('wordlist') != self.wordlist or (progress.get('rules') or []) != self.rule_files:
+                self.log("Warning: Progress file was saved with a different wordlist or rules, starting from the beginning")
+                return
+            self.wordlist_offset = progress.get('wordlist_offset') or 0
+            return
+        
+        if (progress.get('charset') != ''.join(self.character_set) or
+                progress.get('mask') != self.mask or
+                (progress.get('custom_charsets') or []) != list(self.custom_charsets) or
+                progress.get('min_length') != self.min_length or
+                progress.get('max_length') != self.max_length):
+            self.log("Warning: Progress file was saved with different settings, starting from the beginning")
+            return
+        
+        index = progress.get('keyspace_index')
+        if index is None and progress.get('current_password'):
+            # Progress files from older versions only stored the password
+            index = self._password_to_index(progress['current_password'])
+        if index:
+            self.start_index = index
+    
     def _generate_passwords(self):
-        """Generate all possible passwords of the specified lengths"""
-        # If we're resuming, find where to start
-        resume_from = self.start_from
-        resume_active = bool(resume_from)
-        
-        for length in range(self.min_length, self.max_length + 1):
-            for candidate in itertools.product(self.character_set, repeat=length):
-                password = ''.join(candidate)
-                
-                # If we're resuming and haven't reached our starting point yet
-                if resume_active:
-                    if password == resume_from:
-                        resume_active = False  # Found our starting point
-                    else:
-                        continue  # Skip until we find the starting point
-                
-                # Check if stopped during generation
-                if self.stopped:
-                    return
-                    
-                yield password
+        """Generate all passwords from the resume point to the end of the keyspace"""
+        return self._generate_range(self.start_index, self.keyspace_size)
     
     def _format_time(self, seconds):
         """Format time duration nicely"""
-        if seconds < 60:
-            return f"{seconds:.1f} seconds"
-        elif seconds < 3600:
-            minutes = seconds / 60
-            return f"{minutes:.1f} minutes"
+        return format_duration(seconds)
+    
+    def _length_breakdown(self):
+        """Per-length (size, done) from the segments and the untested ranges"""
+        sizes = {}
+        left = {}
+        ranges = sorted(self.ranges)
+        pos = 0
+        for positions, first_index, size in self.segments:
+            length = len(positions)
+            sizes[length] = sizes.get(length, 0) + size
+            end = first_index + size
+            # Ranges are sorted and segments are in index order, so one sweep suffices
+            while pos < len(ranges) and ranges[pos][1] <= first_index:
+                pos += 1
+            untested = 0
+            scan = pos
+            while scan < len(ranges) and ranges[scan][0] < end:
+                untested += min(end, ranges[scan][1]) - max(first_index, ranges[scan][0])
+                scan += 1
+            left[length] = left.get(length, 0) + untested
+        return tuple(LengthStats(length, sizes[length], sizes[length] - left[length]) for length in sorted(sizes))
+    
+    def _progress_stats(self):
+        """Build a ProgressStats snapshot from the telemetry and the remaining work"""
+        telemetry = self.telemetry
+        elapsed = time.time() - self.start_time if self.start_time else 0
+        rate = telemetry.rate
+        if self.wordlist:
+            keyspace_size = remaining = None
+            wordlist_size = max(1, os.path.getsize(self.wordlist))
+            percent_done = self.wordlist_offset * 100 / wordlist_size
+            # Wordlist runs are estimated from the bytes consumed this session
+            done = self.wordlist_offset - self._session_offset
+            eta = elapsed * (wordlist_size - self.wordlist_offset) / done if done > 0 else None
+            lengths = ()
         else:
-            hours = seconds / 3600
-            return f"{hours:.1f} hours"
-    
-    def _estimate_completion(self, passwords_tried, elapsed_time):
-        """Estimate completion time based on current progress"""
-        if passwords_tried == 0 or elapsed_time == 0:
-            return "unknown"
-        
-        total_combinations = self._calculate_combinations()
-        if self.start_from:
-            # Adjust for resumed progress - this is approximate
-            progress_pct = passwords_tried / total_combinations
-            total_combinations = (total_combinations * (1 - progress_pct)) + passwords_tried
-        
-        rate = passwords_tried / elapsed_time
-        remaining_combinations = total_combinations - passwords_tried
-        remaining_seconds = remaining_combinations / rate if rate > 0 else float('inf')
-        
-        if remaining_seconds > 365 * 24 * 3600:
-            years = remaining_seconds / (365 * 24 * 3600)
-            return f"~{years:.1f} years"
-        elif remaining_seconds > 30 * 24 * 3600:
-            months = remaining_seconds / (30 * 24 * 3600)
-            return f"~{months:.1f} months"
-        elif remaining_seconds > 24 * 3600:
-            days = remaining_seconds / (24 * 3600)
-            return f"~{days:.1f} days"
-        elif remaining_seconds > 3600:
-            hours = remaining_seconds / 3600
-            return f"~{hours:.1f} hours"
-        elif remaining_seconds > 60:
-            minutes = remaining_seconds / 60
-            return f"~{minutes:.1f} minutes"
+            keyspace_size = self.keyspace_size
+            remaining = sum(hi - lo for lo, hi in self.ranges)
+            percent_done = (keyspace_size - remaining) * 100 / keyspace_size if keyspace_size else 100.0
+            eta = remaining / rate if rate > 0 else None
+            lengths = self._length_breakdown()
+        return ProgressStats(
+            tried=self.passwords_tried, total_tried=self.previous_tried + self.passwords_tried,
+            current=self.current_password, elapsed=elapsed, workers=self.workers,
+            average_rate=telemetry.average_rate, instant_rate=telemetry.instant_rate,
+            window_rate=telemetry.window_rate, ewma_rate=rate,
+            keyspace_size=keyspace_size, remaining=remaining, percent_done=percent_done,
+            eta_seconds=eta, lengths=lengths)
+    
+    def _start_telemetry(self):
+        """Reset throughput tracking at the start of a run"""
+        self.telemetry.start(self.start_time)
+        self._session_offset = self.wordlist_offset
+    
+    def _log_progress(self):
+        """Update the telemetry and publish a progress line and stats snapshot"""
+        self.telemetry.update(self.passwords_tried)
+        self.stats = self._progress_stats()
+        self.log(str(self.stats))
+        if self.stats_function:
+            self.stats_function(self.stats)
+    
+    def _log_breakdown(self):
+        """Log the per-length breakdown, e.g. when a run stops"""
+        if self.start_time and not self.wordlist:
+            self.stats = self._progress_stats()
+            for line in self.stats.breakdown():
+                self.log(line)
+    
+    def _report_found(self):
+        """Log the found password(s) and save them to a file"""
+        elapsed = time.time() - self.start_time
+        
+        self.log(f"\n{'='*60}")
+        if self.target == 'user':
+            self.log(f"PASSWORD FOUND: '{self.found_password}'")
         else:
-            return f"~{remaining_seconds:.1f} seconds"
+            if self.found_password is not None:
+                self.log(f"USER PASSWORD FOUND: '{self.found_password}'")
+            if self.found_owner_password is not None:
+                self.log(f"OWNER PASSWORD FOUND: '{self.found_owner_password}'")
+        self.log(f"Attempts: {self.passwords_tried:,}")
+        self.log(f"Time elapsed: {self._format_time(elapsed)}")
+        self.log(f"Rate: {self.passwords_tried / elapsed:.1f} passwords/second" if elapsed > 0 else "Rate: n/a")
+        self.log(f"{'='*60}\n")
+        
+        # Save the found password to a file
+        try:
+            with open(f"{os.path.basename(self.pdf_file)}.password", 'w') as f:
+                if self.found_password is not None:
+                    f.write(f"Password: {self.found_password}\n")
+                if self.found_owner_password is not None:
+                    f.write(f"Owner password: {self.found_owner_password}\n")
+                f.write(f"Found after {self.passwords_tried:,} attempts\n")
+                f.write(f"Time taken: {self._format_time(elapsed)}\n")
+                f.write(f"Date: {datetime.now().isoformat()}\n")
+            self.log(f"Password saved to {os.path.basename(self.pdf_file)}.password")
+        except Exception as e:
+            self.log(f"Error saving password to file: {e}")
     
-    def run(self):
-        """Run the brute force attack"""
+    def _split_work(self, ranges, parts):
+        """Split a list of (start, end) index ranges into up to `parts` equal shares of work"""
+        total = sum(hi - lo for lo, hi in ranges)
+        parts = max(1, min(parts, total))
+        remaining = list(ranges)
+        assignments = []
+        for i in range(parts):
+            need = total * (i + 1) // parts - total * i // parts
+            assignment = []
+            while need > 0:
+                lo, hi = remaining[0]
+                take = min(need, hi - lo)
+                assignment.append((lo, lo + take))
+                need -= take
+                if lo + take == hi:
+                    remaining.pop(0)
+                else:
+                    remaining[0] = (lo + take, hi)
+            assignments.append(assignment)
+        return assignments
+    
+    @staticmethod
+    def _advance_ranges(ranges, count):
+        """Return what is left of a list of (start, end) ranges after testing `count` indices in order"""
+        left = []
+        for lo, hi in ranges:
+            if count >= hi - lo:
+                count -= hi - lo
+                continue
+            left.append((lo + count, hi))
+            count = 0
+        return left
+    
+    def _run_parallel(self):
+        """Run the attack across worker processes, one share of the remaining ranges each"""
         self.start_time = time.time()
         self.passwords_tried = 0
         last_save_time = time.time()
-        estimated_completion = "calculating..."
+        next_progress = self.show_progress_every
+        self._start_journal()
+        self._start_telemetry()
+        
+        # Callables (such as the GUI's log function) cannot be sent to other processes
+        worker_options = {k: v for k, v in self.options.items() if not callable(v)}
+        worker_options.update(library=self.library, save_progress=False, workers=1)
+        
+        ctx = multiprocessing.get_context()
+        stop_event = ctx.Event()
+        results = ctx.Queue()
+        assignments = self._split_work(self.ranges, self.workers)
+        processes = []
+        for worker_id, assignment in enumerate(assignments):
+            process = ctx.Process(target=_brute_force_worker,
+                                  args=(self.pdf_file, worker_options, worker_id, assignment, stop_event, results))
+            process.daemon = True
+            process.start()
+            processes.append(process)
+        self.log(f"Started {len(processes)} worker processes")
         
+        tried_by_worker = [0] * len(processes)
+        running = len(processes)
+        completed = failed = 0
+        done = False
         try:
-            for password in self._generate_passwords():
-                # Check if we should stop
+            while running and not done:
                 if self.stopped:
                     self.log("Process stopped by user.")
+                    break
+                try:
+                    message = results.get(timeout=0.5)
+                except queue.Empty:
+                    if not any(p.is_alive() for p in processes):
+                        break
+                    continue
+                
+                kind, worker_id = message[0], message[1]
+                if kind == 'progress':
+                    tried_by_worker[worker_id] = message[2]
+                    self.current_password = message[3]
+                elif kind == 'found':
+                    tried_by_worker[worker_id] = message[2]
+                    done = self._record_hit(message[3], message[4])
+                elif kind == 'done':
+                    tried_by_worker[worker_id] = message[2]
+                    running -= 1
+                    completed += 1
+                elif kind == 'error':
+                    self.log(f"Worker {worker_id} error: {message[2]}")
+                    running -= 1
+                    failed += 1
+                self.passwords_tried = sum(tried_by_worker)
+                # Each worker's untested ranges, so a resume never skips or repeats a share
+                self.ranges = sorted(r for assignment, tried in zip(assignments, tried_by_worker)
+                                     for r in self._advance_ranges(assignment, tried))
+                self.current_index = self.ranges[0][0] if self.ranges else self.keyspace_size
+                
+                # Show aggregated progress
+                if self.passwords_tried >= next_progress:
+                    next_progress = (self.passwords_tried // self.show_progress_every + 1) * self.show_progress_every
+                    self._log_progress()
+                
+                self._write_checkpoint()
+                if self.save_progress and time.time() - last_save_time > 60:
+                    self.save_current_progress()
+                    last_save_time = time.time()
+        except KeyboardInterrupt:
+            self.log("Brute force attack interrupted by user.")
+        finally:
+            # Stop every worker on the first hit, a user stop or completion
+            stop_event.set()
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+        
+        if done:
+            self._finish_journal(True)
+            self._report_found()
+            return True
+        # Only a run whose every worker finished its share may close the journal as finished
+        if self.stopped or completed < len(processes):
+            if failed:
+                self.log(f"Attack incomplete: {failed} worker(s) failed before testing their share. "
+                         f"Resume to test the remaining ranges.")
+            self._log_breakdown()
+            self._finish_journal(False)
+            self.save_current_progress()
+            return False
+        self._finish_journal(True)
+        self.log(f"Exhausted all combinations. Tried {self.passwords_tried} passwords.")
+        if self.found_password is not None or self.found_owner_password is not None:
+            self._report_found()
+        return False
+    
+    def _run_dictionary(self):
+        """Run a wordlist (+ rules) attack, streaming the wordlist in chunks.
+        
+        With several workers, chunks are handed to a process pool with a
+        bounded number in flight, so the wordlist is never loaded into memory.
+        Results are consumed in order, which keeps the saved wordlist offset safe
+        to resume from.
+        """
+        self.start_time = time.time()
+        self.passwords_tried = 0
+        last_save_time = time.time()
+        next_progress = self.show_progress_every
+        chunks = read_wordlist_chunks(self.wordlist, self.wordlist_offset, self.chunk_words)
+        self._start_journal()
+        self._start_telemetry()
+        
+        pool = None
+        if self.workers > 1:
+            worker_options = {k: v for k, v in self.options.items() if not callable(v)}
+            worker_options.update(library=self.library, save_progress=False, resume=False, workers=1)
+            pool = multiprocessing.get_context().Pool(self.workers, initializer=_dictionary_worker_init,
+                                                      initargs=(self.pdf_file, worker_options))
+            self.log(f"Started {self.workers} worker processes")
+        
+        pending = deque()
+        try:
+            while True:
+                if self.stopped:
+                    self.log("Process stopped by user.")
+                    self._finish_journal(False)
                     self.save_current_progress()
                     return False
-                    
-                self.current_password = password
-                self.passwords_tried += 1
                 
-                # Show progress
-                if self.passwords_tried % self.show_progress_every == 0:
-                    elapsed = time.time() - self.start_time
-                    rate = self.passwords_tried / elapsed if elapsed > 0 else 0
-                    
-                    # Update the estimated completion time
-                    estimated_completion = self._estimate_completion(self.passwords_tried, elapsed)
-                    
-                    self.log(f"Tried: {self.passwords_tried:,} | Current: {password} | " +
-                          f"Rate: {rate:.1f}/sec | Elapsed: {self._format_time(elapsed)} | " +
-                          f"Est. completion: {estimated_completion}")
+                # Keep a couple of chunks per worker queued
+                while len(pending) < (self.workers * 2 if pool else 1):
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    end_offset, words = chunk
+                    if pool:
+                        result = pool.apply_async(_dictionary_worker_chunk, (words,))
+                    else:
+                        result = self._try_words(words)
+                    pending.append((end_offset, words[-1], result))
+                if not pending:
+                    break
+                
+                end_offset, last_word, result = pending.popleft()
+                tried, hits = result.get() if pool else result
+                self.passwords_tried += tried
+                if any([self._record_hit(password, matched) for password, matched in hits]):
+                    self._finish_journal(True)
+                    self._report_found()
+                    return True
+                self.wordlist_offset = end_offset
+                self.current_password = _decode_candidate(last_word)
                 
                 # Save progress periodically
+                self._write_checkpoint()
                 if self.save_progress and time.time() - last_save_time > 60:
                     self.save_current_progress()
                     last_save_time = time.time()
                 
-                # Try the password
-                if self.try_password(password):
-                    self.found_password = password
-                    elapsed = time.time() - self.start_time
+                # Show progress
+                if self.passwords_tried >= next_progress:
+                    next_progress = (self.passwords_tried // self.show_progress_every + 1) * self.show_progress_every
+                    self._log_progress()
+            
+            self._finish_journal(True)
+            self.log(f"Exhausted the wordlist. Tried {self.passwords_tried} passwords.")
+            if self.found_password is not None or self.found_owner_password is not None:
+                self._report_found()
+            return False
+        
+        except KeyboardInterrupt:
+            self.log("Dictionary attack interrupted by user.")
+            self._finish_journal(False)
+            self.save_current_progress()
+            return False
+        except Exception as e:
+            self.log(f"Error during dictionary attack: {str(e)}")
+            self._finish_journal(False)
+            self.save_current_progress()
+            return False
+        finally:
+            if pool:
+                pool.terminate()
+                pool.join()
+    
+    def run(self):
+        """Run the brute force attack"""
+        if not self._pending_targets():
+            self.start_time = time.time()
+            self._report_found()
+            return True
+        if self.wordlist:
+            return self._run_dictionary()
+        if self.workers > 1:
+            return self._run_parallel()
+        
+        self.start_time = time.time()
+        self.passwords_tried = 0
+        last_save_time = time.time()
+        next_progress = self.show_progress_every
+        self._start_journal()
+        self._start_telemetry()
+        
+        try:
+            while self.ranges:
+                start, end = self.ranges[0]
+                # Stop, progress and save checks run once per block, not per candidate
+                for first_index, length, count, block in self._generate_blocks(start, end):
+                    if self.stopped:
+                        self.log("Process stopped by user.")
+                        self._log_breakdown()
+                        self._finish_journal(False)
+                        self.save_current_progress()
+                        return False
                     
-                    self.log(f"\n{'='*60}")
-                    self.log(f"PASSWORD FOUND: '{password}'")
-                    self.log(f"Attempts: {self.passwords_tried:,}")
-                    self.log(f"Time elapsed: {self._format_time(elapsed)}")
-                    self.log(f"Rate: {self.passwords_tried / elapsed:.1f} passwords/second")
-                    self.log(f"{'='*60}\n")
+                    self.current_index = first_index
+                    self.current_password = block[:length].decode('latin-1')
                     
-                    # Save the found password to a file
-                    try:
-                        with open(f"{os.path.basename(self.pdf_file)}.password", 'w') as f:
-                            f.write(f"Password: {password}\n")
-                            f.write(f"Found after {self.passwords_tried:,} attempts\n")
-                            f.write(f"Time taken: {self._format_time(elapsed)}\n")
-                            f.write(f"Date: {datetime.now().isoformat()}\n")
-                        self.log(f"Password saved to {os.path.basename(self.pdf_file)}.password")
-                    except Exception as e:
-                        self.log(f"Error saving password to file: {e}")
+                    # Save progress periodically
+                    self._write_checkpoint()
+                    if self.save_progress and time.time() - last_save_time > 60:
+                        self.save_current_progress()
+                        last_save_time = time.time()
                     
-                    return True
+                    # Try the whole block, confirming any native hit with a PDF library
+                    offset = self.try_block(block, length, count)
+                    while offset != -1:
+                        candidate = bytes(block[offset * length:(offset + 1) * length])
+                        password = candidate.decode('latin-1')
+                        if not self.verifier or self.confirm_password(password):
+                            if self._record_hit(password, self.match_candidate(candidate) if self.verifier else ('user',)):
+                                self.passwords_tried += offset + 1
+                                self._finish_journal(True)
+                                self._report_found()
+                                return True
+                        else:
+                            self.log(f"Warning: '{password}' matched the native verifier but was rejected by the PDF library")
+                        offset = self.try_block(block, length, count, offset + 1)
+                    self.passwords_tried += count
+                    self.ranges[0] = (first_index + count, end)
+                    
+                    # Show progress
+                    if self.passwords_tried >= next_progress:
+                        next_progress = (self.passwords_tried // self.show_progress_every + 1) * self.show_progress_every
+                        self._log_progress()
+                self.ranges.pop(0)
             
+            self._finish_journal(True)
             self.log(f"Exhausted all combinations. Tried {self.passwords_tried} passwords.")
+            if self.found_password is not None or self.found_owner_password is not None:
+                self._report_found()
             return False
             
         except KeyboardInterrupt:
             self.log("Brute force attack interrupted by user.")
+            self._log_breakdown()
+            self._finish_journal(False)
             self.save_current_progress()
             return False
         except Exception as e:
             self.log(f"Error during brute force: {str(e)}")
             try:
+                self._finish_journal(False)
                 self.save_current_progress()
             except:
                 pass
             return False
 
+def _brute_force_worker(pdf_file, options, worker_id, ranges, stop_event, results):
+    """Worker process: test the keyspace index ranges assigned to it with its own verifier"""
+    try:
+        options = dict(options, log_function=lambda message: None)
+        forcer = PDFBruteForcer(pdf_file, options)
+        tried = 0
+        for start, end in ranges:
+            for first_index, length, count, block in forcer._generate_blocks(start, end):
+                if stop_event.is_set():
+                    return
+                offset = forcer.try_block(block, length, count)
+                while offset != -1:
+                    candidate = bytes(block[offset * length:(offset + 1) * length])
+                    password = candidate.decode('latin-1')
+                    if not forcer.verifier or forcer.confirm_password(password):
+                        matched = forcer.match_candidate(candidate) if forcer.verifier else ('user',)
+                        results.put(('found', worker_id, tried + offset + 1, password, matched))
+                        if forcer._record_hit(password, matched):
+                            stop_event.set()
+                            return
+                    offset = forcer.try_block(block, length, count, offset + 1)
+                tried += count
+                results.put(('progress', worker_id, tried, block[(count - 1) * length:count * length].decode('latin-1')))
+        results.put(('done', worker_id, tried))
+    except KeyboardInterrupt:
+        # Ctrl+C reaches every process; the parent saves progress and reports
+        pass
+    except Exception as e:
+        results.put(('error', worker_id, str(e)))
+
+# Per-process state for dictionary workers, set up once by the pool initializer
+_dictionary_forcer = None
+
+def _dictionary_worker_init(pdf_file, options):
+    """Pool initializer: parse the PDF and compile the rules once per worker"""
+    global _dictionary_forcer
+    # Ctrl+C is handled by the parent, which terminates the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _dictionary_forcer = PDFBruteForcer(pdf_file, dict(options, log_function=lambda message: None))
+
+def _dictionary_worker_chunk(words):
+    """Pool task: try every rule against a chunk of words"""
+    return _dictionary_forcer._try_words(words)
+
 def main():
     # Create argument parser
     parser = argparse.ArgumentParser(description="PDF Password Brute Force Tool")
@@ -445,12 +2734,37 @@ def main():
     parser.add_argument("--charset", default="digits", 
                        help="Character set to use: digits, lowercase, uppercase, letters, alphanum, all, " +
                             "or any combination of d (digits), l (lowercase), u (uppercase), s (symbols)")
+    parser.add_argument("--mask", help="Hashcat-style mask (e.g. ?u?l?l?l?d?d) or .hcmask file, " +
+                            "looked up in masks/ if not found")
+    for number in range(1, 5):
+        parser.add_argument(f"-{number}", f"--custom-charset{number}", dest=f"custom_charset{number}",
+                           help=f"Custom charset ?{number} for masks: placeholders, literals or a .hcchr file")
+    parser.add_argument("--increment", action="store_true",
+                       help="With --mask, also try every prefix of the mask from --min-length characters")
+    parser.add_argument("--wordlist", help="Dictionary attack: try each word of this file instead of a keyspace")
+    parser.add_argument("-r", "--rules", action="append",
+                       help="Hashcat .rule file to apply to every word, looked up in rules/ if not found " +
+                            "(may be given more than once)")
     parser.add_argument("--start-from", default="", help="Resume from this password")
-    parser.add_argument("--library", default=AVAILABLE_LIBRARIES[0][0] if AVAILABLE_LIBRARIES else None,
-                       help=f"Library to use: {', '.join(lib for lib, _ in AVAILABLE_LIBRARIES)}")
+    parser.add_argument("--resume", action="store_true",
+                       help="Resume from the keyspace index stored in the progress file " +
+                            "(runs with a checkpoint journal resume automatically)")
+    parser.add_argument("--restart", action="store_true",
+                       help="Ignore the checkpoint journal and start from the beginning")
+    parser.add_argument("--target", choices=["user", "owner", "both"], default="user",
+                       help="Password to recover: user (open) password, owner password, or both (default: user)")
+    parser.add_argument("--library", default="auto",
+                       help="Library to use: auto (fastest correct one, calibrated per file), " +
+                            f"{', '.join(lib for lib, _ in PDF_LIBRARIES)} (default: auto)")
+    parser.add_argument("--recalibrate", action="store_true",
+                       help="With --library auto, time the backends again instead of using the cached choice")
+    parser.add_argument("--workers", type=int, default=1,
+                       help="Number of worker processes to split the keyspace across (default: 1)")
     parser.add_argument("--no-save-progress", action="store_true", help="Disable progress saving")
     parser.add_argument("--progress-file", help="Custom progress file name")
     parser.add_argument("--show-available-libraries", action="store_true", help="Show available libraries and exit")
+    parser.add_argument("--benchmark", action="store_true",
+                       help="Measure the speed of the native verifier and each installed library on this file and exit")
     parser.add_argument("--verbose", action="store_true", help="Show more detailed progress")
     
     args = parser.parse_args()
@@ -458,7 +2772,7 @@ def main():
     # Show available libraries if requested
     if args.show_available_libraries:
         print("\nAvailable PDF libraries:")
-        for lib, desc in AVAILABLE_LIBRARIES:
+        for lib, desc in available_libraries():
             print(f"  {lib}: {desc}")
         sys.exit(0)
     
@@ -467,10 +2781,14 @@ def main():
         print(f"Error: File not found: {args.pdf_file}")
         sys.exit(1)
     
+    if args.rules and not args.wordlist:
+        print("Error: --rules requires --wordlist")
+        sys.exit(1)
+    
     # Check if the library is valid
-    if args.library and args.library not in [lib for lib, _ in AVAILABLE_LIBRARIES]:
+    if args.library != "auto" and not library_available(args.library):
         print(f"Error: Invalid library '{args.library}'. Available libraries:")
-        for lib, desc in AVAILABLE_LIBRARIES:
+        for lib, desc in available_libraries():
             print(f"  {lib}: {desc}")
         sys.exit(1)
     
@@ -479,8 +2797,18 @@ def main():
         'min_length': args.min_length,
         'max_length': args.max_length,
         'charset': args.charset,
+        'mask': args.mask,
+        'custom_charsets': [getattr(args, f"custom_charset{n}") or '' for n in range(1, 5)],
+        'increment': args.increment,
+        'wordlist': args.wordlist,
+        'rules': args.rules or [],
         'start_from': args.start_from,
+        'resume': args.resume,
+        'restart': args.restart,
         'library': args.library,
+        'recalibrate': args.recalibrate,
+        'target': args.target,
+        'workers': args.workers,
         'save_progress': not args.no_save_progress,
         'show_progress_every': 100 if args.verbose else 1000
     }
@@ -488,10 +2816,23 @@ def main():
     if args.progress_file:
         options['progress_file'] = args.progress_file
     
+    # The benchmark times every backend itself, so skip the calibration
+    if args.benchmark and args.library == "auto":
+        options['library'] = "native"
+    
     # Create and run the brute forcer
-    brute_forcer = PDFBruteForcer(args.pdf_file, options)
+    try:
+        brute_forcer = PDFBruteForcer(args.pdf_file, options)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    if args.benchmark:
+        print("Benchmarking password checks on this file...")
+        brute_forcer.benchmark()
+        sys.exit(0)
     
-    print("\nStarting brute force attack...")
+    print("\nStarting dictionary attack..." if args.wordlist else "\nStarting brute force attack...")
     print("Press Ctrl+C to stop at any time (progress will be saved)")
     brute_forcer.run()
 
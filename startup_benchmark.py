@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Startup Time Benchmark
+
+Measures the cold-start cost of P4wnForge by timing fresh Python interpreters,
+so a new top-level import that slows down the GUI or every pdfbrute worker
+process shows up before it ships. It times:
+- import pdfbrute (paid by each worker process)
+- import p4wnforge (GUI startup, before any window is built)
+- pdfbrute.available_libraries() (first-use backend discovery)
+
+Results can be appended to a JSON Lines history file and compared with the
+previous run.
+
+Usage:
+    python startup_benchmark.py [--runs 5] [--top 10] [--history startup_history.jsonl]
+"""
+
+import sys
+import os
+import json
+import argparse
+import platform
+import subprocess
+import statistics
+import time
+from datetime import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (name, interpreter arguments); 'interpreter' is subtracted from the others
+TARGETS = [
+    ("interpreter", ["-c", "pass"]),
+    ("import pdfbrute", ["-c", "import pdfbrute"]),
+    ("import p4wnforge", ["-c", "import p4wnforge"]),
+    ("pdfbrute libraries", ["-c", "import pdfbrute; pdfbrute.available_libraries()"]),
+]
+
+def time_command(arguments, runs):
+    """Wall-clock seconds of each of `runs` fresh interpreter runs"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable] + arguments, cwd=SCRIPT_DIR,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        times.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            error = result.stderr.decode(errors='replace').strip().splitlines()
+            raise RuntimeError(error[-1] if error else f"exit status {result.returncode}")
+    return times
+
+def slowest_imports(module, count):
+    """The `count` slowest imports (cumulative microseconds) from python -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=SCRIPT_DIR,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    imports = []
+    for line in result.stderr.decode(errors='replace').splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            imports.append((int(cumulative), name.strip()))
+        except ValueError:
+            continue  # The header line
+    # The module itself includes everything else
+    return sorted((item for item in imports if item[1] != module), reverse=True)[:count]
+
+def load_last_record(history_file):
+    try:
+        with open(history_file, 'r', encoding='utf-8') as f:
+            lines = [line for line in f if line.strip()]
+        return json.loads(lines[-1]) if lines else None
+    except (OSError, ValueError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure P4wnForge cold-start time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target (default: 5)")
+    parser.add_argument("--top", type=int, default=0,
+                       help="Also list the N slowest imports of pdfbrute and p4wnforge")
+    parser.add_argument("--history", help="Append the results to this JSON Lines file and compare with its last entry")
+    parser.add_argument("--limit", type=float,
+                       help="Exit with status 1 if any target takes longer than this many seconds over the bare interpreter")
+    args = parser.parse_args()
+
+    runs = max(1, args.runs)
+    print(f"Cold-start times over {runs} run(s), Python {platform.python_version()}:")
+    results = {}
+    baseline = 0.0
+    for name, arguments in TARGETS:
+        try:
+            times = time_command(arguments, runs)
+        except RuntimeError as e:
+            print(f"  {name:<20} failed ({e})")
+            continue
+        median = statistics.median(times)
+        if name == "interpreter":
+            baseline = median
+            print(f"  {name:<20} {median * 1000:8.1f} ms (subtracted below)")
+            continue
+        results[name] = max(0.0, median - baseline)
+        print(f"  {name:<20} {results[name] * 1000:8.1f} ms  " +
+              f"(min {(min(times) - baseline) * 1000:.1f}, max {(max(times) - baseline) * 1000:.1f})")
+
+    if args.top > 0:
+        for module in ("pdfbrute", "p4wnforge"):
+            print(f"\nSlowest imports under {module}:")
+            for cumulative, name in slowest_imports(module, args.top):
+                print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    if args.history:
+        previous = load_last_record(args.history)
+        if previous:
+            print(f"\nCompared with {previous.get('timestamp', 'the previous run')}:")
+            for name, seconds in results.items():
+                before = previous.get('results', {}).get(name)
+                if before is not None:
+                    print(f"  {name:<20} {(seconds - before) * 1000:+8.1f} ms")
+        record = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'runs': runs,
+            'interpreter': baseline,
+            'results': results
+        }
+        with open(args.history, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+
+    if args.limit is not None:
+        slow = [name for name, seconds in results.items() if seconds > args.limit]
+        if slow:
+            print(f"\nOver the {args.limit:.2f}s limit: {', '.join(slow)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()